@@ -0,0 +1,156 @@
+import math
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict
+
+from backend.app.jobs import JOB_WORKERS
+
+
+# ===== CONFIG =====
+# tổng CPU-giây (time_limit x workers) của mọi job đang chạy / chờ cùng lúc
+CPU_BUDGET = float(os.environ.get("TFT_CPU_BUDGET", str(JOB_WORKERS * 60)))
+MAX_TIME_LIMIT = float(os.environ.get("TFT_MAX_TIME_LIMIT", "60"))
+MIN_TIME_LIMIT = 1.0         # giây, cấp ít hơn thì thà từ chối cho client thử lại
+MAX_CLIENT_JOBS = int(os.environ.get("TFT_CLIENT_JOBS", "2"))
+MAX_WORKERS = JOB_WORKERS    # workers của 1 job không vượt số process của pool
+
+
+class Rejected(Exception):
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason             # "client" | "busy"
+        self.retry_after = retry_after   # giây, cho header Retry-After
+
+
+# ===== TICKET =====
+@dataclass
+class Ticket:
+    """Phần CPU đã cấp cho 1 request (1 job hoặc cả 1 batch)"""
+    client: str
+    time_limit: float        # time_limit tối đa được cấp cho mỗi job
+    workers: int
+    jobs: int = 1
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    admitted: float = field(default_factory=time.time)
+
+    @property
+    def cost(self) -> float:
+        return self.time_limit * self.workers * self.jobs
+
+    def grant(self, time_limit: float, workers: int) -> dict:
+        """Giới hạn thực tế cho 1 job, trả về cho client trong stats.granted"""
+        granted = min(time_limit, self.time_limit)
+        granted_workers = max(1, min(workers, self.workers))
+        return {
+            "time_limit": granted,
+            "workers": granted_workers,
+            "requested_time_limit": time_limit,
+            "requested_workers": workers,
+            "degraded": granted < time_limit or granted_workers < workers,
+        }
+
+
+# ===== CONTROLLER =====
+class AdmissionController:
+    """
+    Cấp CPU cho request solve trước khi vào job pool:
+    - mỗi client tối đa max_client_jobs request đang chạy / chờ
+    - tổng CPU-giây đã cấp không vượt budget; server càng tải thì
+      time_limit được cấp càng nhỏ (phần còn lại, chia đều cho request
+      đang có + request mới), hết chỗ thì từ chối kèm Retry-After
+    Request trúng cache / index không đi qua đây nên luôn trả lời ngay.
+    """
+
+    def __init__(
+        self,
+        budget: float = CPU_BUDGET,
+        max_client_jobs: int = MAX_CLIENT_JOBS,
+        max_time_limit: float = MAX_TIME_LIMIT,
+        max_workers: int = MAX_WORKERS,
+    ):
+        self.budget = budget
+        self.max_client_jobs = max_client_jobs
+        self.max_time_limit = max_time_limit
+        self.max_workers = max_workers
+        self.tickets: Dict[str, Ticket] = {}
+        self._lock = threading.Lock()
+
+    def admit(
+        self,
+        client: str,
+        time_limit: float,
+        workers: int = 1,
+        jobs: int = 1,
+    ) -> Ticket:
+        # NaN lọt vào thì committed() thành NaN và mọi so sánh budget sau đó
+        # đều sai; <= 0 thì ticket có cost âm, nhả thêm budget cho người khác
+        if math.isnan(time_limit) or time_limit <= 0:
+            raise ValueError(f"time_limit must be a positive number, got {time_limit}")
+        workers = max(1, min(workers, self.max_workers))
+        jobs = max(1, jobs)
+        requested = min(time_limit, self.max_time_limit)    # inf => max_time_limit
+
+        with self._lock:
+            active = sum(1 for t in self.tickets.values() if t.client == client)
+            if active >= self.max_client_jobs:
+                raise Rejected("client", self._retry_after(client))
+
+            available = self.budget - self._committed()
+            share = self.budget / (len(self.tickets) + 1)
+            granted = min(requested, min(available, share) / (workers * jobs))
+            if granted < min(MIN_TIME_LIMIT, requested):
+                raise Rejected("busy", self._retry_after())
+
+            ticket = Ticket(client=client, time_limit=granted, workers=workers, jobs=jobs)
+            self.tickets[ticket.id] = ticket
+            return ticket
+
+    def release(self, ticket: Ticket):
+        with self._lock:
+            self.tickets.pop(ticket.id, None)
+
+    def release_after(self, ticket: Ticket, futures):
+        """
+        Trả ticket khi mọi future (job dùng chung ticket) đã xong: job còn
+        chạy thì CPU của nó vẫn phải được tính vào budget.
+        """
+        lock = threading.Lock()
+        left = [len(futures) + 1]    # +1 để không release khi còn đang gắn callback
+
+        def done(_=None):
+            with lock:
+                left[0] -= 1
+                last = left[0] == 0
+            if last:
+                self.release(ticket)
+
+        for future in futures:
+            future.add_done_callback(done)
+        done()
+
+    def committed(self) -> float:
+        with self._lock:
+            return self._committed()
+
+    def retry_after(self) -> int:
+        with self._lock:
+            return self._retry_after()
+
+    def _committed(self) -> float:
+        return sum(t.cost for t in self.tickets.values())
+
+    def _retry_after(self, client: str | None = None) -> int:
+        """Số giây tới khi ticket sớm nhất (của client, nếu có) hết time_limit"""
+        now = time.time()
+        ends = [
+            t.admitted + t.time_limit * t.jobs - now
+            for t in self.tickets.values()
+            if client is None or t.client == client
+        ]
+        return max(1, math.ceil(min(ends))) if ends else 1
+
+
+admission = AdmissionController()
@@ -1,10 +1,46 @@
-from fastapi import FastAPI
-from pydantic import BaseModel
-from typing import List, Dict
+import asyncio
 import json
-import os
+import time
 
-from backend.solver import bronze, ryze
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import (
+    JSONResponse,
+    PlainTextResponse,
+    RedirectResponse,
+    StreamingResponse,
+)
+from pydantic import BaseModel, Field
+from typing import List, Dict, Literal, Optional
+
+from backend.app.admission import Rejected, Ticket, admission
+from backend.app.cache import canonical_key, result_cache
+from backend.app.jobs import JOB_QUEUE_SIZE, QueueFull, job_manager
+from backend.app.metrics import (
+    Gauge,
+    admission_total,
+    cache_lookups,
+    observe_search,
+    registry,
+    solve_latency,
+)
+from backend.app.sessions import SESSION_DEPTH, session_store
+from backend.app.static import (
+    REVALIDATE,
+    asset_store,
+    constant_representation,
+    data_representation,
+    respond,
+)
+from backend.precompute.index import get_index
+from backend.solver.batch import incumbent_teams, plan_waves, variant_key
+from backend.solver.beam import BEAM_WIDTH, MAX_BEAM_WIDTH
+from backend.solver.catalog import get_catalog
+from backend.solver.checkpoint import InvalidCheckpoint
+from backend.solver.engine import TOP_K
+from backend.solver.registry import DEFAULT_BANNED, DEFAULT_FORCED, SOLVERS
+from backend.solver.transposition import MAX_TT_MB, TT_MEMORY_MB
 
 app = FastAPI()
 
@@ -12,10 +48,50 @@ app = FastAPI()
 # ===== MODEL =====
 class SolveRequest(BaseModel):
     max_team: int = 8
-    time_limit: float = 20
+    time_limit: float = Field(20, gt=0, allow_inf_nan=False)
     forced: List[str] = []
     banned: List[str] = []
     emblems: Dict[str, int] = {}
+    workers: int = 1
+    node_limit: Optional[int] = None
+    unique_signature: bool = False   # bỏ team kích trùng tập trait
+    diversity: int = 0               # số tướng tối thiểu phải khác nhau giữa 2 team
+    # beam: trả lời ngay; anneal: max_team lớn, chạy hết time_limit
+    # (cả 2 đều không chứng minh tối ưu); vector: như exact, chấm slot cuối
+    # bằng numpy (max_team nhỏ); pareto: best là Pareto front score / cost / tiers
+    mode: Literal["exact", "vector", "beam", "anneal", "pareto"] = "exact"
+    beam_width: int = Field(BEAM_WIDTH, ge=1, le=MAX_BEAM_WIDTH)
+    seed: Optional[int] = None       # seed cho anneal
+    # stats.checkpoint của lần chạy bị cắt giờ trước đó: duyệt tiếp thay vì làm lại
+    checkpoint: Optional[str] = None
+    # RAM (MB) cho transposition table của DFS, 0 = tắt (mặc định theo TFT_TT_MB)
+    tt_memory_mb: float = Field(TT_MEMORY_MB, ge=0, le=MAX_TT_MB)
+
+
+class JobRequest(SolveRequest):
+    solver: Literal["bronze", "ryze"] = "ryze"
+
+
+class SessionRequest(BaseModel):
+    solver: Literal["bronze", "ryze"] = "ryze"
+
+
+class BatchRequest(BaseModel):
+    solver: Literal["bronze", "ryze"] = "ryze"
+    variants: List[SolveRequest]
+
+
+@app.exception_handler(RequestValidationError)
+async def validation_error(request: Request, exc: RequestValidationError):
+    """
+    Như handler mặc định nhưng không trả lại input: NaN / Infinity trong body
+    không serialize được thành JSON, client sẽ nhận 500 thay vì 422
+    """
+    errors = [
+        {k: v for k, v in error.items() if k != "input"}
+        for error in exc.errors()
+    ]
+    return JSONResponse(status_code=422, content={"detail": jsonable_encoder(errors)})
 
 
 # ===== ROOT =====
@@ -25,47 +101,570 @@ def root():
 
 
 # ===== DEFAULT CONFIG (GIỐNG PYQT) =====
+DEFAULTS = constant_representation({
+    "forced": DEFAULT_FORCED,
+    "banned": DEFAULT_BANNED,
+})
+
+
 @app.get("/config/defaults")
-def get_defaults():
+def get_defaults(request: Request):
+    return respond(request, DEFAULTS, REVALIDATE)
+
+
+# ===== STATIC DATA =====
+# ETag / Last-Modified theo version của catalog, body nén sẵn mỗi version:
+# client gửi If-None-Match / If-Modified-Since thì được 304
+def champion_list(catalog):
+    return [
+        {
+            "name": c.name,
+            "cost": c.cost,
+            "traits": c.traits,
+            "roles": c.roles,
+            "locked": c.locked,
+        }
+        for c in catalog.champions
+    ]
+
+
+@app.get("/data/traits")
+def get_traits(request: Request):
+    rep = data_representation("traits", get_catalog(), lambda c: c.raw_traits)
+    return respond(request, rep, REVALIDATE)
+
+
+@app.get("/data/champions")
+def get_champions(request: Request):
+    rep = data_representation("champions", get_catalog(), champion_list)
+    return respond(request, rep, REVALIDATE)
+
+
+# ===== FRONTEND =====
+@app.get("/ui")
+def frontend_root():
+    return RedirectResponse("/ui/")
+
+
+@app.get("/ui/")
+def frontend_index(request: Request):
+    return frontend_asset(request, "index.html")
+
+
+@app.get("/ui/{name}")
+def frontend_asset(request: Request, name: str):
+    response = asset_store.respond(request, name)
+    if response is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    return response
+
+
+# ===== RESPONSE =====
+def solve_response(result, grant: dict | None = None) -> dict:
+    stats = result.stats()
+    if grant is not None:
+        stats["granted"] = grant
+    return {"best": result.best, "stats": stats}
+
+
+# ===== CACHE =====
+def cache_keys(mode: str, req: SolveRequest):
+    version = get_catalog().version
+    args = (mode, version, req.max_team, req.forced, req.banned, req.emblems)
+    options = {
+        "unique_signature": req.unique_signature,
+        "diversity": req.diversity,
+    }
+    if req.mode == "beam":
+        options["mode"] = req.mode
+        options["beam_width"] = req.beam_width
+    elif req.mode == "anneal":
+        # mỗi worker chạy 1 chuỗi seed + i => kết quả phụ thuộc số worker
+        options["mode"] = req.mode
+        options["seed"] = req.seed
+        options["workers"] = req.workers
+    elif req.mode == "pareto":
+        options["mode"] = req.mode
+    # vector duyệt hết cây thì cho đúng kết quả của exact, chỉ khác khi bị cắt giờ
+    # kết quả resume bị cắt giờ phụ thuộc cả phần cây đã duyệt trước đó
+    # bị cắt giờ thì số worker cũng đổi phần cây đã duyệt được
+    timed_options = dict(options, workers=req.workers)
+    if req.mode == "vector":
+        timed_options["mode"] = req.mode
+    if req.checkpoint:
+        timed_options["checkpoint"] = req.checkpoint
+    # TT không đổi kết quả khi duyệt hết cây, chỉ đổi phần cây duyệt được khi bị cắt
+    if req.tt_memory_mb:
+        timed_options["tt_memory_mb"] = req.tt_memory_mb
+    return (
+        version,
+        canonical_key(*args, options=options),
+        canonical_key(
+            *args,
+            options=timed_options,
+            time_limit=req.time_limit,
+            node_limit=req.node_limit,
+        ),
+    )
+
+
+def lookup_index(mode: str, req: SolveRequest):
+    """Setup hay gặp đã build sẵn offline (python -m backend.precompute)"""
+    if req.mode not in ("exact", "vector") or req.unique_signature or req.diversity > 1:
+        return None
+    catalog = get_catalog()
+    index = get_index(catalog)
+    if index is None:
+        return None
+    key = canonical_key(
+        mode, catalog.version, req.max_team, req.forced, req.banned, req.emblems
+    )
+    solutions = index.get(key)
+    if solutions is None:
+        return None
+
+    serialize_team = SOLVERS[mode].serialize_team
+    best = [
+        {
+            "score": score,
+            "total_cost": total_cost,
+            "team_size": len(names),
+            "team": serialize_team([catalog.by_name[n] for n in names]),
+        }
+        for score, total_cost, names in solutions
+    ]
     return {
-        "forced": ["Ryze", "Ahri"],
-        "banned": [
-            "Aatrox",
-            "Aphelios",
-            "Zoe",
-            "Leona",
-            "Diana",
-            "Aurelion Sol"
-        ]
+        "best": best,
+        "stats": {
+            "nodes": 0,
+            "elapsed": 0,
+            "completed": True,
+            "upper_bound": best[0]["score"] if best else None,
+            "gap": 0 if best else None,
+            "proven_optimal": True,
+            "indexed": True,
+        },
     }
 
 
-# ===== LOAD TRAITS =====
-@app.get("/data/traits")
-def get_traits():
-    path = os.path.join("backend", "data", "traits.json")
-    with open(path, encoding="utf-8") as f:
-        return json.load(f)
+def lookup_cache(mode: str, req: SolveRequest):
+    """
+    - kết quả đã duyệt hết cây dùng lại cho mọi time_limit
+    - kết quả bị cắt giờ chỉ dùng lại khi cùng time_limit
+    - index build sẵn được tra trước cả cache
+    Trả về response {"best", "stats"} hoặc None.
+    """
+    indexed = lookup_index(mode, req)
+    if indexed is not None:
+        cache_lookups.inc(result="index")
+        return indexed
+
+    _, full_key, timed_key = cache_keys(mode, req)
+    for key in (full_key, timed_key):
+        cached = result_cache.get(key)
+        if cached is not None:
+            cache_lookups.inc(result="hit")
+            return dict(cached, stats=dict(cached["stats"], cached=True))
+    cache_lookups.inc(result="miss")
+    return None
+
+
+def store_cache(mode: str, req: SolveRequest, result):
+    if result.cancelled:
+        return
+
+    version, full_key, timed_key = cache_keys(mode, req)
+    if result.completed:
+        result_cache.put(full_key, solve_response(result), version, persist=True)
+    else:
+        # gap = 0: team #1 đã tối ưu, kết quả đáng giữ qua restart
+        result_cache.put(
+            timed_key, solve_response(result), version,
+            persist=result.proven_optimal,
+        )
+
+
+# ===== ADMISSION =====
+def client_id(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+def too_busy(reason: str, retry_after: int) -> HTTPException:
+    admission_total.inc(result=f"rejected_{reason}")
+    detail = (
+        "Too many solves in flight for this client"
+        if reason == "client" else "Solver is saturated"
+    )
+    return HTTPException(
+        status_code=429,
+        detail=detail,
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+def admit(client: str, time_limit: float, workers: int = 1, jobs: int = 1) -> Ticket:
+    """Xin CPU cho request, hết chỗ => 429 + Retry-After"""
+    try:
+        return admission.admit(client, time_limit, workers, jobs)
+    except Rejected as e:
+        raise too_busy(e.reason, e.retry_after)
+
+
+# ===== JOBS =====
+def submit_job(
+    mode: str,
+    req: SolveRequest,
+    incumbents=None,
+    client: str = "unknown",
+    ticket: Ticket | None = None,
+    top_k: int = TOP_K,
+):
+    """
+    ticket = None: tự xin admission cho job này, trả lại khi job xong.
+    Có ticket (batch): dùng chung ticket, người gọi tự release.
+    Job chạy với time_limit / workers đã cấp (job.grant), cache cũng theo đó.
+    top_k khác TOP_K (session) thì kết quả không vào cache chung.
+    """
+    own = ticket is None
+    if own:
+        ticket = admit(client, req.time_limit, req.workers)
+    grant = ticket.grant(req.time_limit, req.workers)
+    admission_total.inc(result="degraded" if grant["degraded"] else "admitted")
+    req = req.model_copy(update={
+        "time_limit": grant["time_limit"],
+        "workers": grant["workers"],
+    })
+
+    params = {
+        "max_team": req.max_team,
+        "time_limit": req.time_limit,
+        "forced": req.forced,
+        "banned": req.banned,
+        "emblems": req.emblems,
+        "workers": req.workers,
+        "node_limit": req.node_limit,
+        "unique_signature": req.unique_signature,
+        "diversity": req.diversity,
+        "mode": req.mode,
+        "beam_width": req.beam_width,
+        "seed": req.seed,
+        "incumbents": incumbents,
+        "checkpoint": req.checkpoint,
+        "tt_memory_mb": req.tt_memory_mb,
+        "top_k": top_k,
+    }
+    try:
+        job = job_manager.submit(mode, params)
+    except QueueFull:
+        if own:
+            admission.release(ticket)
+        raise too_busy("busy", admission.retry_after())
+    job.grant = grant
+
+    def on_done(future):
+        if own:
+            admission.release(ticket)
+        if not future.cancelled() and future.exception() is None:
+            observe_search(mode, future.result())
+            if top_k == TOP_K:
+                store_cache(mode, req, future.result())
+
+    job.future.add_done_callback(on_done)
+    return job
+
+
+async def wait_job(job):
+    """Chờ job xong; checkpoint không khớp request => 400"""
+    try:
+        return await asyncio.wrap_future(job.future)
+    except InvalidCheckpoint as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/jobs")
+async def create_job(req: JobRequest, request: Request):
+    job = submit_job(req.solver, req, client=client_id(request))
+    return job.snapshot()
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.snapshot()
+
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    if not job_manager.cancel(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_manager.get(job_id).snapshot()
 
 
 # ===== SOLVER =====
+async def run_cached(mode: str, req: SolveRequest, client: str):
+    start = time.time()
+    try:
+        cached = lookup_cache(mode, req)
+        if cached is not None:
+            return cached
+
+        job = submit_job(mode, req, client=client)
+        result = await wait_job(job)
+        return solve_response(result, job.grant)
+    finally:
+        solve_latency.observe(time.time() - start, mode=mode)
+
+
 @app.post("/solve/bronze")
-def solve_bronze(req: SolveRequest):
-    return bronze.solve(
-        max_team=req.max_team,
-        time_limit=req.time_limit,
-        forced=req.forced,
-        banned=req.banned,
-        emblems=req.emblems
-    )
+async def solve_bronze(req: SolveRequest, request: Request):
+    return await run_cached("bronze", req, client_id(request))
 
 
 @app.post("/solve/ryze")
-def solve_ryze(req: SolveRequest):
-    return ryze.solve(
-        max_team=req.max_team,
-        time_limit=req.time_limit,
-        forced=req.forced,
-        banned=req.banned,
-        emblems=req.emblems
+async def solve_ryze(req: SolveRequest, request: Request):
+    return await run_cached("ryze", req, client_id(request))
+
+
+# ===== BATCH =====
+# cả đợt phải vào được hàng đợi job cùng lúc
+MAX_BATCH = JOB_QUEUE_SIZE
+
+
+@app.post("/solve/batch")
+async def solve_batch(req: BatchRequest, request: Request):
+    """
+    Nhiều variant của cùng 1 board trong 1 request. Variant trùng chỉ chạy
+    1 lần, chạy theo đợt tổng emblem tăng dần (xem plan_waves): mỗi đợt
+    song song trên job pool, team của đợt trước làm seed cho đợt sau.
+    Cả batch xin admission 1 lần (1 suất của client, CPU cho mọi variant).
+    """
+    if len(req.variants) > MAX_BATCH:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch is limited to {MAX_BATCH} variants",
+        )
+    start = time.time()
+    keys = [variant_key(v.model_dump()) for v in req.variants]
+    first = {}
+    for i, key in enumerate(keys):
+        first.setdefault(key, i)
+    unique = sorted(first.values())
+    done = {}
+
+    # token sai của 1 variant => 400 trước khi xếp job nào
+    for i in unique:
+        variant = req.variants[i]
+        if variant.checkpoint:
+            try:
+                SOLVERS[req.solver].check_checkpoint(
+                    variant.max_team,
+                    variant.forced,
+                    variant.banned,
+                    variant.emblems,
+                    variant.checkpoint,
+                    unique_signature=variant.unique_signature,
+                    diversity=variant.diversity,
+                    mode=variant.mode,
+                )
+            except InvalidCheckpoint as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+    ticket = admit(
+        client_id(request),
+        max(v.time_limit for v in req.variants),
+        max(v.workers for v in req.variants),
+        jobs=len(unique),
+    )
+    submitted = []
+    try:
+        for wave in plan_waves([req.variants[i].emblems for i in unique]):
+            incumbents = incumbent_teams([r["best"] for r in done.values()])
+            pending = {}
+            for w in wave:
+                i = unique[w]
+                cached = lookup_cache(req.solver, req.variants[i])
+                if cached is not None:
+                    done[i] = cached
+                else:
+                    job = submit_job(
+                        req.solver, req.variants[i], incumbents, ticket=ticket
+                    )
+                    submitted.append(job)
+                    pending[i] = (job, wait_job(job))
+            results = await asyncio.gather(*(f for _, f in pending.values()))
+            for (i, (job, _)), result in zip(pending.items(), results):
+                done[i] = solve_response(result, job.grant)
+    except BaseException:
+        # 1 variant lỗi / hết chỗ trong queue / client ngắt: hủy phần còn lại
+        for job in submitted:
+            if not job.future.done():
+                job_manager.cancel(job.id)
+        raise
+    finally:
+        # job đã xếp vẫn giữ CPU tới khi thực sự dừng
+        admission.release_after(ticket, [job.future for job in submitted])
+        solve_latency.observe(time.time() - start, mode="batch")
+
+    return {"results": [done[first[key]] for key in keys]}
+
+
+# ===== SESSIONS =====
+@app.post("/sessions")
+async def create_session(req: SessionRequest):
+    session = session_store.create(req.solver)
+    return {"id": session.id, "solver": session.solver}
+
+
+@app.post("/sessions/{session_id}/solve")
+async def solve_in_session(session_id: str, req: SolveRequest, request: Request):
+    """
+    Solve lại sau khi người dùng đổi 1 ràng buộc:
+    - chỉ thu hẹp (ban / force thêm...) và còn đủ team cũ hợp lệ => trả lời
+      ngay từ SESSION_DEPTH team giữ lại của lần trước (xem Session.narrowed)
+    - còn lại: search giữ SESSION_DEPTH team, top-k cũ (chấm lại) làm seed
+    Lần được trả lời ngay không đổi ràng buộc đã lưu (vẫn là tập rộng hơn).
+    stats.incremental = "reused" | "cached" | "seeded" | "cold"
+    """
+    session = session_store.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    start = time.time()
+    mode = session.solver
+    version = get_catalog().version
+    params = req.model_dump()
+    try:
+        response = session.narrowed(version, params)
+        how = "reused"
+        if response is None:
+            response = lookup_cache(mode, req)
+            depth = TOP_K
+            how = "cached"
+            if response is None:
+                incumbents = session.incumbents() if session.version == version else []
+                # token checkpoint gắn với top_k của lần chạy tạo ra nó
+                depth = TOP_K if req.checkpoint else SESSION_DEPTH
+                job = submit_job(
+                    mode, req, incumbents, client=client_id(request), top_k=depth
+                )
+                result = await wait_job(job)
+                response = solve_response(result, job.grant)
+                how = "seeded" if incumbents else "cold"
+            session.remember(version, params, response, depth)
+            response = dict(response, best=response["best"][:TOP_K])
+    finally:
+        solve_latency.observe(time.time() - start, mode=mode)
+
+    return dict(response, stats=dict(response["stats"], incremental=how))
+
+
+@app.delete("/sessions/{session_id}")
+async def delete_session(session_id: str):
+    if not session_store.delete(session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+    return {"id": session_id, "status": "deleted"}
+
+
+# ===== STREAMING =====
+STREAM_POLL = 0.1   # giây
+
+
+def ndjson(data: dict) -> str:
+    return json.dumps(data, ensure_ascii=False) + "\n"
+
+
+async def watch_job(mode, job):
+    start = time.time()
+    sent = 0
+    try:
+        while not job.future.done():
+            updates = job.progress.get("updates", 0)
+            if updates != sent:
+                sent = updates
+                yield ndjson(
+                    {"type": "progress", "best": job.progress.get("best", [])}
+                )
+            await asyncio.sleep(STREAM_POLL)
+
+        snap = job.snapshot()
+        yield ndjson(
+            {
+                "type": "result",
+                "status": snap["status"],
+                "best": snap["best"],
+                "completed": snap.get("completed", False),
+                "stats": snap.get("stats"),
+                "granted": snap.get("granted"),
+                "error": snap.get("error"),
+            }
+        )
+    finally:
+        if not job.future.done():
+            job_manager.cancel(job.id)
+        solve_latency.observe(time.time() - start, mode=mode)
+
+
+async def replay_cached(response):
+    yield ndjson(
+        {
+            "type": "result",
+            "status": "done",
+            "best": response["best"],
+            "completed": response["stats"]["completed"],
+            "stats": response["stats"],
+        }
+    )
+
+
+def stream_solve(mode: str, req: SolveRequest, client: str) -> StreamingResponse:
+    """
+    NDJSON: mỗi dòng {"type": "progress", "best": [...]} khi top-K tốt hơn,
+    dòng cuối {"type": "result", "status", "best", "completed", "stats"}.
+    Client ngắt kết nối => job bị hủy.
+    """
+    cached = lookup_cache(mode, req)
+    if cached is not None:
+        lines = replay_cached(cached)
+    else:
+        lines = watch_job(mode, submit_job(mode, req, client=client))
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
+@app.post("/solve/bronze/stream")
+async def solve_bronze_stream(req: SolveRequest, request: Request):
+    return stream_solve("bronze", req, client_id(request))
+
+
+@app.post("/solve/ryze/stream")
+async def solve_ryze_stream(req: SolveRequest, request: Request):
+    return stream_solve("ryze", req, client_id(request))
+
+
+# ===== METRICS =====
+registry.register(Gauge(
+    "tft_solves_in_flight",
+    "Số job solve đang chạy",
+    job_manager.running,
+))
+registry.register(Gauge(
+    "tft_solve_queue_depth",
+    "Số job solve đang chờ trong hàng đợi",
+    job_manager.queued,
+))
+
+
+registry.register(Gauge(
+    "tft_cpu_seconds_committed",
+    "Tổng CPU-giây đã cấp cho job đang chạy / chờ (admission)",
+    admission.committed,
+))
+
+
+@app.get("/metrics")
+def metrics():
+    return PlainTextResponse(
+        registry.render(),
+        media_type="text/plain; version=0.0.4",
     )
@@ -0,0 +1,115 @@
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List
+
+
+# ===== CONFIG =====
+CACHE_SIZE = int(os.environ.get("TFT_CACHE_SIZE", "256"))
+CACHE_DB = os.environ.get("TFT_CACHE_DB")   # vd: "cache.sqlite3", bỏ trống = chỉ RAM
+
+
+# ===== CANONICAL KEY =====
+def canonical_key(
+    mode: str,
+    version: str,
+    max_team: int,
+    forced: List[str],
+    banned: List[str],
+    emblems: Dict[str, int],
+    options: Dict | None = None,
+    time_limit: float | None = None,
+    node_limit: int | None = None,
+) -> str:
+    """
+    Key ổn định cho 1 request: forced/banned sort + bỏ trùng, emblem = 0 bị bỏ.
+    options: tùy chọn khác làm đổi kết quả (lọc top-k...)
+    time_limit = node_limit = None => key của kết quả đã duyệt hết cây
+    (dùng lại cho mọi giới hạn)
+    """
+    return json.dumps(
+        [
+            mode,
+            version,
+            max_team,
+            sorted(set(forced)),
+            sorted(set(banned)),
+            sorted((t, v) for t, v in emblems.items() if v),
+            sorted((options or {}).items()),
+            time_limit,
+            node_limit,
+        ],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+
+
+# ===== CACHE =====
+class ResultCache:
+    """
+    LRU trong RAM (tối đa max_entries) + SQLite tùy chọn để giữ qua restart.
+    Chỉ kết quả completed mới được lưu xuống đĩa.
+    """
+
+    def __init__(self, max_entries: int = CACHE_SIZE, path: str | None = CACHE_DB):
+        self.max_entries = max_entries
+        self._mem: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, version TEXT, value TEXT)"
+            )
+            self._db.commit()
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            value = self._mem.get(key)
+            if value is not None:
+                self._mem.move_to_end(key)
+                return value
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value = json.loads(row[0])
+                    self._remember(key, value)
+                    return value
+
+            return None
+
+    def put(self, key: str, value: dict, version: str, persist: bool = False):
+        with self._lock:
+            self._remember(key, value)
+
+            if persist and self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, version, value) "
+                    "VALUES (?, ?, ?)",
+                    (key, version, json.dumps(value, ensure_ascii=False)),
+                )
+                # data patch mới => kết quả của version cũ không còn dùng được
+                self._db.execute(
+                    "DELETE FROM results WHERE version != ?", (version,)
+                )
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._mem.clear()
+
+    def _remember(self, key, value):
+        self._mem[key] = value
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+
+
+result_cache = ResultCache()
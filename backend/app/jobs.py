@@ -0,0 +1,180 @@
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict
+
+from backend.solver.registry import SOLVERS
+
+
+# ===== CONFIG =====
+JOB_WORKERS = int(os.environ.get("TFT_JOB_WORKERS", str(os.cpu_count() or 1)))
+JOB_QUEUE_SIZE = int(os.environ.get("TFT_JOB_QUEUE", "32"))
+JOB_TTL = 600                # giây giữ job đã xong để client còn poll
+PROGRESS_INTERVAL = 0.2      # giây giữa 2 lần đẩy top-K tạm thời về server
+
+
+class QueueFull(Exception):
+    pass
+
+
+# ===== WORKER (chạy trong process con) =====
+def _run_job(mode, params, cancel, progress):
+    progress["status"] = "running"
+    last_push = 0.0
+    last_top = None
+
+    def on_improve(best):
+        # team #1 đổi thì đẩy ngay, còn lại gom theo PROGRESS_INTERVAL
+        nonlocal last_push, last_top
+        now = time.time()
+        top = (best[0]["score"], best[0]["total_cost"])
+        if top != last_top or now - last_push >= PROGRESS_INTERVAL:
+            progress["best"] = best
+            progress["updates"] = progress.get("updates", 0) + 1
+            last_push = now
+            last_top = top
+
+    result = SOLVERS[mode].run(
+        **params,
+        cancel=cancel,
+        on_improve=on_improve,
+    )
+    progress["best"] = result.best
+    return result
+
+
+# ===== JOB =====
+@dataclass
+class Job:
+    id: str
+    mode: str
+    params: dict
+    future: Future
+    cancel: object
+    progress: object
+    created: float = field(default_factory=time.time)
+    finished: float | None = None
+    grant: dict | None = None          # giới hạn admission thực tế đã cấp
+
+    @property
+    def status(self) -> str:
+        if self.future.cancelled():
+            return "cancelled"
+        if self.future.done():
+            if self.future.exception() is not None:
+                return "failed"
+            return "cancelled" if self.future.result().cancelled else "done"
+        return self.progress.get("status", "queued")
+
+    def snapshot(self) -> dict:
+        status = self.status
+        data = {
+            "id": self.id,
+            "mode": self.mode,
+            "status": status,
+            "best": self.progress.get("best", []),
+        }
+        if self.grant is not None:
+            data["granted"] = self.grant
+        if status in ("done", "cancelled") and not self.future.cancelled():
+            result = self.future.result()
+            data["best"] = result.best
+            data["completed"] = result.completed
+            data["stats"] = result.stats()
+        elif status == "failed":
+            data["error"] = str(self.future.exception())
+        return data
+
+
+# ===== MANAGER =====
+class JobManager:
+    """
+    Process pool cố định JOB_WORKERS process + hàng đợi tối đa JOB_QUEUE_SIZE job.
+    Trạng thái tạm thời (status, top-K hiện tại) và cờ cancel đi qua
+    multiprocessing.Manager để process con ghi / đọc được.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, queue_size: int = JOB_QUEUE_SIZE):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._manager = None
+
+    def _ensure_started(self):
+        if self._executor is None:
+            self._manager = multiprocessing.Manager()
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def pending(self) -> int:
+        return sum(1 for j in list(self.jobs.values()) if not j.future.done())
+
+    def running(self) -> int:
+        return sum(
+            1 for j in list(self.jobs.values())
+            if not j.future.done() and j.progress.get("status") == "running"
+        )
+
+    def queued(self) -> int:
+        return self.pending() - self.running()
+
+    def submit(self, mode: str, params: dict) -> Job:
+        with self._lock:
+            self._ensure_started()
+            self._purge()
+
+            if self.pending() >= self.workers + self.queue_size:
+                raise QueueFull()
+
+            cancel = self._manager.Event()
+            progress = self._manager.dict()
+            future = self._executor.submit(_run_job, mode, params, cancel, progress)
+
+            job = Job(
+                id=uuid.uuid4().hex,
+                mode=mode,
+                params=params,
+                future=future,
+                cancel=cancel,
+                progress=progress,
+            )
+            future.add_done_callback(lambda _: setattr(job, "finished", time.time()))
+            self.jobs[job.id] = job
+            return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.jobs.get(job_id)
+        if job is None:
+            return False
+        # job còn trong queue thì hủy luôn, đang chạy thì DFS tự dừng
+        if not job.future.cancel():
+            job.cancel.set()
+        return True
+
+    def _purge(self):
+        now = time.time()
+        expired = [
+            job_id
+            for job_id, job in self.jobs.items()
+            if job.finished is not None and now - job.finished > JOB_TTL
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._manager.shutdown()
+            self._executor = None
+            self._manager = None
+
+
+job_manager = JobManager()
@@ -0,0 +1,168 @@
+import threading
+from typing import Callable, Dict, List, Tuple
+
+
+# ===== PRIMITIVES =====
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_str(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labels)
+
+    def header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.help}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_label_str(self.labels, k)} {v}" for k, v in items
+        ]
+
+
+class Gauge(_Metric):
+    """Giá trị lấy từ callback lúc scrape (in-flight, queue depth...)"""
+    kind = "gauge"
+
+    def __init__(self, name, help, fn: Callable[[], float]):
+        super().__init__(name, help)
+        self.fn = fn
+
+    def render(self) -> List[str]:
+        return self.header() + [f"{self.name} {self.fn()}"]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, buckets: Tuple[float, ...], labels=()):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._data: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            data = self._data.get(key)
+            if data is None:
+                # [count theo bucket..., sum, count]
+                data = [0] * len(self.buckets) + [0.0, 0]
+                self._data[key] = data
+            for i, b in enumerate(self.buckets):
+                if value <= b:
+                    data[i] += 1
+            data[-2] += value
+            data[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._data.items())
+        for key, data in items:
+            names = self.labels + ("le",)
+            for b, cnt in zip(self.buckets, data):
+                lines.append(
+                    f"{self.name}_bucket{_label_str(names, key + (repr(float(b)),))} {cnt}"
+                )
+            lines.append(
+                f"{self.name}_bucket{_label_str(names, key + ('+Inf',))} {data[-1]}"
+            )
+            lines.append(f"{self.name}_sum{_label_str(self.labels, key)} {data[-2]}")
+            lines.append(f"{self.name}_count{_label_str(self.labels, key)} {data[-1]}")
+        return lines
+
+
+# ===== REGISTRY =====
+class Registry:
+    def __init__(self):
+        self.metrics: List[_Metric] = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for m in self.metrics:
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+RATE_BUCKETS = (1e3, 5e3, 1e4, 2.5e4, 5e4, 1e5, 2.5e5, 5e5, 1e6)
+
+solve_latency = registry.register(Histogram(
+    "tft_solve_request_seconds",
+    "Thời gian trả lời request solve (kể cả cache hit)",
+    LATENCY_BUCKETS,
+    labels=("mode",),
+))
+search_total = registry.register(Counter(
+    "tft_searches_total",
+    "Số lần search theo kết quả: completed / time / nodes / cancelled",
+    labels=("mode", "outcome"),
+))
+search_nodes = registry.register(Counter(
+    "tft_search_nodes_total",
+    "Tổng số node DFS đã duyệt",
+    labels=("mode",),
+))
+search_rate = registry.register(Histogram(
+    "tft_search_nodes_per_second",
+    "Tốc độ duyệt node của từng search",
+    RATE_BUCKETS,
+    labels=("mode",),
+))
+cache_lookups = registry.register(Counter(
+    "tft_cache_lookups_total",
+    "Tra cache kết quả: hit / miss / index (index build sẵn)",
+    labels=("result",),
+))
+
+admission_total = registry.register(Counter(
+    "tft_admission_total",
+    "Admission request solve: admitted / degraded / rejected_client / rejected_busy",
+    labels=("result",),
+))
+
+
+def observe_search(mode: str, result):
+    search_total.inc(mode=mode, outcome=result.stop_reason or "completed")
+    search_nodes.inc(result.nodes, mode=mode)
+    if result.elapsed > 0:
+        search_rate.observe(result.nodes / result.elapsed, mode=mode)
@@ -0,0 +1,155 @@
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from backend.solver.batch import incumbent_teams
+from backend.solver.engine import TOP_K
+
+
+# ===== CONFIG =====
+SESSION_TTL = 1800           # giây không dùng thì bỏ session
+MAX_SESSIONS = int(os.environ.get("TFT_MAX_SESSIONS", "256"))
+# session search giữ sẵn nhiều team hơn top-k: ban 1 tướng trong top-k vẫn
+# còn đủ TOP_K team cũ hợp lệ để trả lời ngay (~90% lần ban với data thật),
+# đổi lại lần search đầu chậm hơn ~20%
+SESSION_DEPTH = 4 * TOP_K
+
+# tham số làm đổi luật chấm điểm / lọc top-k: phải giữ nguyên mới dùng lại được
+SCORING_PARAMS = ("unique_signature", "diversity", "mode")
+
+
+def _emblems(params: dict) -> Dict[str, int]:
+    return {t: v for t, v in params.get("emblems", {}).items() if v}
+
+
+def narrows(old: dict, new: dict) -> bool:
+    """
+    new chỉ thu hẹp tập team hợp lệ của old (ban thêm, force thêm, max_team
+    nhỏ hơn) và giữ nguyên luật chấm điểm (emblem, tùy chọn lọc).
+    """
+    if _emblems(old) != _emblems(new):
+        return False
+    if any(old.get(p) != new.get(p) for p in SCORING_PARAMS):
+        return False
+    return (
+        set(new["banned"]) >= set(old["banned"])
+        and set(new["forced"]) >= set(old["forced"])
+        and new["max_team"] <= old["max_team"]
+    )
+
+
+def feasible(team: List[str], params: dict) -> bool:
+    names = set(team)
+    return (
+        len(names) <= params["max_team"]
+        and set(params["forced"]) <= names
+        and not names & set(params["banned"])
+    )
+
+
+# ===== SESSION =====
+@dataclass
+class Session:
+    """Ràng buộc + kết quả của lần solve gần nhất trong 1 phiên làm việc"""
+    id: str
+    solver: str
+    version: str | None = None
+    params: dict | None = None
+    response: dict | None = None        # {"best", "stats"} như /solve, best sâu tới depth
+    depth: int = TOP_K                  # top_k của lần search ra response
+    updated: float = field(default_factory=time.time)
+
+    def incumbents(self) -> List[List[str]]:
+        if self.response is None:
+            return []
+        return incumbent_teams([self.response["best"]])
+
+    def narrowed(self, version: str, params: dict) -> dict | None:
+        """
+        Lần trước đã duyệt hết cây và lần này chỉ thu hẹp tập team: các team
+        cũ còn hợp lệ vẫn giữ đúng thứ tự, team mới hợp lệ nào cũng đã hợp lệ
+        từ trước. Nên nếu còn ít nhất TOP_K team cũ hợp lệ (hoặc list cũ chưa
+        đầy depth, tức là đã gồm mọi team hợp lệ) thì TOP_K team đầu là top-k
+        chính xác, không cần search lại. Có bộ lọc top-k thì không áp dụng.
+        Trả về response {"best", "stats"} hoặc None.
+        """
+        if self.response is None or self.version != version:
+            return None
+        if not self.response["stats"].get("completed"):
+            return None
+        if params.get("unique_signature") or params.get("diversity", 0) > 1:
+            return None
+        if params.get("mode", "exact") not in ("exact", "vector"):
+            return None
+        if not narrows(self.params, params):
+            return None
+
+        best = self.response["best"]
+        kept = [
+            entry for entry in best
+            if feasible([c["name"] for c in entry["team"]], params)
+        ]
+        if len(kept) < TOP_K and len(best) >= self.depth:
+            return None
+        kept = kept[:TOP_K]
+        # cận trên cũ vẫn đúng nhưng lỏng, top-k mới đã chính xác
+        stats = dict(
+            self.response["stats"],
+            upper_bound=kept[0]["score"] if kept else None,
+            gap=0 if kept else None,
+            proven_optimal=True,
+        )
+        return {"best": kept, "stats": stats}
+
+    def remember(self, version: str, params: dict, response: dict, depth: int = TOP_K):
+        self.version = version
+        self.params = params
+        self.response = response
+        self.depth = depth
+        self.updated = time.time()
+
+
+# ===== STORE =====
+class SessionStore:
+    def __init__(self, max_sessions: int = MAX_SESSIONS, ttl: float = SESSION_TTL):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.sessions: Dict[str, Session] = {}
+        self._lock = threading.Lock()
+
+    def create(self, solver: str) -> Session:
+        with self._lock:
+            self._purge()
+            if len(self.sessions) >= self.max_sessions:
+                # bỏ session lâu không dùng nhất
+                oldest = min(self.sessions.values(), key=lambda s: s.updated)
+                del self.sessions[oldest.id]
+            session = Session(id=uuid.uuid4().hex, solver=solver)
+            self.sessions[session.id] = session
+            return session
+
+    def get(self, session_id: str) -> Session | None:
+        with self._lock:
+            self._purge()
+            session = self.sessions.get(session_id)
+            if session is not None:
+                session.updated = time.time()
+            return session
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self.sessions.pop(session_id, None) is not None
+
+    def _purge(self):
+        now = time.time()
+        expired = [
+            sid for sid, s in self.sessions.items() if now - s.updated > self.ttl
+        ]
+        for sid in expired:
+            del self.sessions[sid]
+
+
+session_store = SessionStore()
@@ -0,0 +1,261 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Callable, Dict, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from backend.solver.catalog import Catalog
+from backend.solver.utils import resource_path
+
+try:
+    import brotli
+except ImportError:          # brotli là tùy chọn, không có thì chỉ gzip
+    brotli = None
+
+
+# ===== CONFIG =====
+FRONTEND_DIR = os.environ.get(
+    "TFT_FRONTEND",
+    os.path.normpath(resource_path(os.path.join(os.pardir, "frontend"))),
+)
+
+IMMUTABLE = "public, max-age=31536000, immutable"   # asset có fingerprint
+REVALIDATE = "no-cache"                             # luôn hỏi lại, thường được 304
+
+MIN_COMPRESS = 256          # byte, nhỏ hơn thì nén không lợi
+GZIP_LEVEL = 9              # nén 1 lần rồi giữ trong RAM nên dùng mức cao nhất
+BROTLI_QUALITY = 11
+
+CONTENT_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".js": "application/javascript; charset=utf-8",
+    ".css": "text/css; charset=utf-8",
+    ".json": "application/json",
+}
+
+# chỉ phục vụ file nằm thẳng trong FRONTEND_DIR, không cho "../"
+ASSET_NAME = re.compile(r"^[\w-]+(\.[\w-]+)*$")
+# link tới asset trong index.html => gắn ?v=<hash nội dung>
+ASSET_LINK = re.compile(r'(src|href)="([\w.-]+\.(?:js|css))"')
+
+STARTED = time.time()
+
+
+# ===== REPRESENTATION =====
+@dataclass
+class Representation:
+    """Body đã nén sẵn (gzip / br) + validator, tạo 1 lần rồi dùng lại"""
+    body: bytes
+    media_type: str
+    tag: str                # ETag (chưa có ngoặc kép, chưa gắn encoding)
+    modified: float         # Last-Modified (epoch)
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, body: bytes, media_type: str, tag: str, modified: float):
+        encoded = {}
+        if len(body) >= MIN_COMPRESS:
+            if brotli is not None:
+                encoded["br"] = brotli.compress(body, quality=BROTLI_QUALITY)
+            encoded["gzip"] = gzip.compress(body, GZIP_LEVEL, mtime=0)
+        return cls(body, media_type, tag, modified, encoded)
+
+
+def content_tag(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()[:16]
+
+
+def json_body(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# ===== NEGOTIATION =====
+def choose_encoding(accept: str, available) -> str | None:
+    """Accept-Encoding -> "br" | "gzip" | None (ưu tiên br, bỏ q=0)"""
+    quality = {}
+    for part in accept.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        quality[coding.strip().lower()] = q
+
+    for coding in ("br", "gzip"):
+        if coding in available and quality.get(coding, quality.get("*", 0)) > 0:
+            return coding
+    return None
+
+
+def etag_matches(header: str, tag: str) -> bool:
+    """
+    So If-None-Match kiểu weak: bỏ W/, bỏ hậu tố encoding (-gzip / -br)
+    vì mọi bản nén của cùng 1 nội dung đều còn dùng được.
+    """
+    for value in header.split(","):
+        value = value.strip()
+        if value == "*":
+            return True
+        if value.startswith("W/"):
+            value = value[2:]
+        value = value.strip('"')
+        for suffix in ("-gzip", "-br"):
+            if value.endswith(suffix):
+                value = value[: -len(suffix)]
+        if value == tag:
+            return True
+    return False
+
+
+def not_modified(request: Request, rep: Representation) -> bool:
+    # có If-None-Match thì bỏ qua If-Modified-Since (RFC 9110)
+    match = request.headers.get("if-none-match")
+    if match is not None:
+        return etag_matches(match, rep.tag)
+
+    since = request.headers.get("if-modified-since")
+    if since:
+        try:
+            return int(rep.modified) <= parsedate_to_datetime(since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def respond(request: Request, rep: Representation, cache_control: str) -> Response:
+    """200 với body nén theo Accept-Encoding, hoặc 304 nếu client còn bản mới"""
+    coding = choose_encoding(request.headers.get("accept-encoding", ""), rep.encoded)
+    headers = {
+        "ETag": f'"{rep.tag}-{coding}"' if coding else f'"{rep.tag}"',
+        "Last-Modified": formatdate(rep.modified, usegmt=True),
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding",
+    }
+    if not_modified(request, rep):
+        return Response(status_code=304, headers=headers)
+
+    body = rep.body
+    if coding:
+        headers["Content-Encoding"] = coding
+        body = rep.encoded[coding]
+    return Response(body, media_type=rep.media_type, headers=headers)
+
+
+# ===== DATA =====
+_data_lock = threading.Lock()
+_data: Dict[str, Tuple[str, Representation]] = {}
+
+
+def data_representation(
+    name: str,
+    catalog: Catalog,
+    build: Callable[[Catalog], object],
+) -> Representation:
+    """
+    JSON dựng từ catalog: serialize + nén 1 lần mỗi version,
+    ETag / Last-Modified theo version của data.
+    """
+    with _data_lock:
+        cached = _data.get(name)
+        if cached is not None and cached[0] == catalog.version:
+            return cached[1]
+
+    rep = Representation.build(
+        json_body(build(catalog)),
+        CONTENT_TYPES[".json"],
+        f"{name}-{catalog.version}",
+        catalog.modified or STARTED,
+    )
+    with _data_lock:
+        _data[name] = (catalog.version, rep)
+    return rep
+
+
+def constant_representation(data) -> Representation:
+    """JSON cố định theo bản deploy (vd /config/defaults)"""
+    body = json_body(data)
+    return Representation.build(body, CONTENT_TYPES[".json"], content_tag(body), STARTED)
+
+
+# ===== FRONTEND =====
+class AssetStore:
+    """
+    File tĩnh trong frontend/, đọc + nén lại khi file đổi (so mtime/size).
+    index.html được viết lại để link tới asset kèm ?v=<hash nội dung>,
+    asset gọi đúng hash đó thì cache vĩnh viễn.
+    """
+
+    def __init__(self, root: str = FRONTEND_DIR):
+        self.root = root
+        self._assets: Dict[str, Tuple[tuple, Representation]] = {}
+        self._lock = threading.Lock()
+
+    def _stat(self, name: str):
+        st = os.stat(os.path.join(self.root, name))
+        return (name, st.st_mtime_ns, st.st_size)
+
+    def _stamp(self, name: str) -> tuple:
+        if name != "index.html":
+            return (self._stat(name),)
+        # index.html chứa hash của asset khác => đổi theo chúng
+        linked = sorted(
+            f for f in os.listdir(self.root) if f.endswith((".js", ".css"))
+        )
+        return tuple(self._stat(f) for f in ["index.html"] + linked)
+
+    def get(self, name: str) -> Representation | None:
+        if not ASSET_NAME.match(name):
+            return None
+        path = os.path.join(self.root, name)
+        if not os.path.isfile(path):
+            return None
+
+        stamp = self._stamp(name)
+        with self._lock:
+            cached = self._assets.get(name)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+
+        with open(path, "rb") as f:
+            body = f.read()
+        if name == "index.html":
+            body = self._fingerprint(body)
+
+        media_type = CONTENT_TYPES.get(
+            os.path.splitext(name)[1], "application/octet-stream"
+        )
+        modified = max(s[1] for s in stamp) / 1e9
+        rep = Representation.build(body, media_type, content_tag(body), modified)
+        with self._lock:
+            self._assets[name] = (stamp, rep)
+        return rep
+
+    def _fingerprint(self, html: bytes) -> bytes:
+        def link(m):
+            asset = self.get(m.group(2))
+            if asset is None:
+                return m.group(0)
+            return f'{m.group(1)}="{m.group(2)}?v={asset.tag}"'
+
+        return ASSET_LINK.sub(link, html.decode("utf-8")).encode("utf-8")
+
+    def respond(self, request: Request, name: str) -> Response | None:
+        rep = self.get(name)
+        if rep is None:
+            return None
+        fingerprinted = name != "index.html" and request.query_params.get("v") == rep.tag
+        return respond(request, rep, IMMUTABLE if fingerprinted else REVALIDATE)
+
+
+asset_store = AssetStore()
@@ -0,0 +1,42 @@
+"""
+Benchmark solver trên bộ scenario cố định.
+
+    python -m backend.bench --out bench.json
+    python -m backend.bench --baseline bench.json      # exit 1 nếu có regression
+    python -m backend.bench --only ryze-default --time-limit 5
+"""
+import argparse
+import sys
+
+from backend.bench.runner import compare, load, run_all, save
+from backend.bench.scenarios import default_scenarios
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.bench")
+    parser.add_argument("--time-limit", type=float, default=20)
+    parser.add_argument("--only", help="chỉ chạy scenario có tên chứa chuỗi này")
+    parser.add_argument("--out", help="ghi kết quả JSON")
+    parser.add_argument("--baseline", help="so sánh với file JSON đã lưu")
+    args = parser.parse_args(argv)
+
+    scenarios = default_scenarios()
+    if args.only:
+        scenarios = [sc for sc in scenarios if args.only in sc.name]
+
+    current = run_all(scenarios, args.time_limit)
+    if args.out:
+        save(current, args.out)
+
+    if args.baseline:
+        problems = compare(current, load(args.baseline))
+        for p in problems:
+            print("REGRESSION", p)
+        if problems:
+            return 1
+        print("Không có regression so với", args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+import json
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from typing import List
+
+from backend.bench.scenarios import Scenario
+from backend.bench.synthetic import synthetic_catalog
+from backend.solver.registry import SOLVERS
+
+try:
+    import resource
+except ImportError:     # Windows
+    resource = None
+
+
+# ngưỡng coi là regression so với baseline
+TOLERANCE = 0.25
+MIN_TIME_DELTA = 0.05   # giây, bỏ qua dao động nhỏ
+
+
+# ===== RUN =====
+def peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux trả về KB, macOS trả về byte
+    if sys.platform == "darwin":
+        return round(peak / 2 ** 20, 1)
+    return round(peak / 2 ** 10, 1)
+
+
+def run_scenario(scenario: Scenario, time_limit: float) -> dict:
+    catalog = synthetic_catalog() if scenario.synthetic else None
+
+    result = SOLVERS[scenario.mode].run(
+        max_team=scenario.max_team,
+        time_limit=time_limit,
+        forced=scenario.forced,
+        banned=scenario.banned,
+        emblems=scenario.emblems,
+        catalog=catalog,
+        mode=scenario.engine,
+        seed=scenario.seed,
+        tt_memory_mb=scenario.tt_memory_mb,
+    )
+    stats = result.stats()
+    top = result.best[0] if result.best else {}
+
+    return {
+        "name": scenario.name,
+        "mode": scenario.mode,
+        "engine": scenario.engine,
+        "max_team": scenario.max_team,
+        "score": top.get("score"),
+        "total_cost": top.get("total_cost"),
+        "completed": result.completed,
+        "gap": stats["gap"],
+        "time_to_best": stats["time_to_best"],
+        "elapsed": stats["elapsed"],
+        "nodes": stats["nodes"],
+        "nodes_per_sec": stats["nodes_per_sec"],
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_all(scenarios: List[Scenario], time_limit: float, log=print) -> dict:
+    """Mỗi scenario chạy trong process riêng để peak RSS không cộng dồn"""
+    results = []
+    for sc in scenarios:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            row = executor.submit(run_scenario, sc, time_limit).result()
+        results.append(row)
+        log(format_row(row))
+
+    return {
+        "meta": {
+            "time_limit": time_limit,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        "scenarios": [asdict(sc) for sc in scenarios],
+        "results": results,
+    }
+
+
+def format_row(row: dict) -> str:
+    return (
+        f"{row['name']:<28} score={row['score']!s:>4} "
+        f"{'done' if row['completed'] else 'timeout':<7} "
+        f"gap={row.get('gap')!s:>4} "
+        f"best@{row['time_to_best']!s:>8}s total={row['elapsed']:>8}s "
+        f"{row['nodes_per_sec']:>8} n/s  rss={row['peak_rss_mb']}MB"
+    )
+
+
+# ===== COMPARE =====
+def compare(current: dict, baseline: dict, tolerance: float = TOLERANCE) -> List[str]:
+    """Trả về danh sách regression (rỗng = ok)"""
+    base = {r["name"]: r for r in baseline["results"]}
+    problems = []
+
+    for row in current["results"]:
+        old = base.get(row["name"])
+        if old is None:
+            continue
+        name = row["name"]
+
+        if (row["score"] or 0) < (old["score"] or 0):
+            problems.append(f"{name}: score {old['score']} -> {row['score']}")
+
+        if old["completed"] and not row["completed"]:
+            problems.append(f"{name}: không còn duyệt hết cây trong time_limit")
+
+        if (
+            old["completed"]
+            and row["completed"]
+            and row["elapsed"] > old["elapsed"] * (1 + tolerance) + MIN_TIME_DELTA
+        ):
+            problems.append(
+                f"{name}: time to optimum {old['elapsed']}s -> {row['elapsed']}s"
+            )
+
+        if row["nodes_per_sec"] < old["nodes_per_sec"] * (1 - tolerance):
+            problems.append(
+                f"{name}: nodes/sec {old['nodes_per_sec']} -> {row['nodes_per_sec']}"
+            )
+
+        if (
+            row["peak_rss_mb"] is not None
+            and old["peak_rss_mb"] is not None
+            and row["peak_rss_mb"] > old["peak_rss_mb"] * (1 + tolerance)
+        ):
+            problems.append(
+                f"{name}: peak RSS {old['peak_rss_mb']}MB -> {row['peak_rss_mb']}MB"
+            )
+
+    return problems
+
+
+def load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save(data: dict, path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
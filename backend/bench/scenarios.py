@@ -0,0 +1,109 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from backend.solver.registry import DEFAULT_BANNED, DEFAULT_FORCED
+from backend.solver.transposition import TT_MEMORY_MB
+
+
+HEAVY_EMBLEMS = {
+    "Yordle": 2,
+    "Ionia": 2,
+    "Demacia": 1,
+    "Pháp Sư": 1,
+    "Vệ Quân": 1,
+}
+
+
+# ===== SCENARIO =====
+@dataclass
+class Scenario:
+    name: str
+    mode: str                       # "bronze" | "ryze"
+    max_team: int
+    forced: List[str] = field(default_factory=list)
+    banned: List[str] = field(default_factory=list)
+    emblems: Dict[str, int] = field(default_factory=dict)
+    synthetic: bool = False         # dùng synthetic_catalog() thay cho data thật
+    engine: str = "exact"           # "exact" | "vector" | "beam" | "anneal" | "pareto", xem run()
+    seed: int | None = None         # seed cho anneal
+    tt_memory_mb: float = TT_MEMORY_MB   # transposition table, 0 = tắt
+
+
+def default_scenarios() -> List[Scenario]:
+    scenarios = []
+    for mode in ("bronze", "ryze"):
+        for max_team in range(6, 11):
+            scenarios.append(Scenario(
+                name=f"{mode}-default-{max_team}",
+                mode=mode,
+                max_team=max_team,
+                forced=DEFAULT_FORCED,
+                banned=DEFAULT_BANNED,
+            ))
+
+        scenarios.append(Scenario(
+            name=f"{mode}-no-forced-8",
+            mode=mode,
+            max_team=8,
+            banned=DEFAULT_BANNED,
+        ))
+        scenarios.append(Scenario(
+            name=f"{mode}-heavy-emblems-8",
+            mode=mode,
+            max_team=8,
+            forced=DEFAULT_FORCED,
+            banned=DEFAULT_BANNED,
+            emblems=HEAVY_EMBLEMS,
+        ))
+        scenarios.append(Scenario(
+            name=f"{mode}-synthetic-200x40-8",
+            mode=mode,
+            max_team=8,
+            synthetic=True,
+        ))
+
+        # so với {mode}-default-8: TT có đáng bật mặc định không
+        scenarios.append(Scenario(
+            name=f"{mode}-tt-8",
+            mode=mode,
+            max_team=8,
+            forced=DEFAULT_FORCED,
+            banned=DEFAULT_BANNED,
+            tt_memory_mb=64,
+        ))
+
+        # team nhỏ: so sánh DFS với DFS + khối numpy (cùng kết quả)
+        for max_team in (6, 7):
+            scenarios.append(Scenario(
+                name=f"{mode}-vector-{max_team}",
+                mode=mode,
+                max_team=max_team,
+                forced=DEFAULT_FORCED,
+                banned=DEFAULT_BANNED,
+                engine="vector",
+            ))
+
+        # cả Pareto front score / cost / tiers trong 1 lần DFS
+        for max_team in (6, 7):
+            scenarios.append(Scenario(
+                name=f"{mode}-pareto-{max_team}",
+                mode=mode,
+                max_team=max_team,
+                forced=DEFAULT_FORCED,
+                banned=DEFAULT_BANNED,
+                engine="pareto",
+            ))
+
+        # team lớn: so sánh DFS (không xong) với annealing cùng time_limit
+        for max_team in (10, 12):
+            for engine in ("exact", "anneal"):
+                scenarios.append(Scenario(
+                    name=f"{mode}-{engine}-large-{max_team}",
+                    mode=mode,
+                    max_team=max_team,
+                    forced=DEFAULT_FORCED,
+                    banned=DEFAULT_BANNED,
+                    engine=engine,
+                    seed=0 if engine == "anneal" else None,
+                ))
+    return scenarios
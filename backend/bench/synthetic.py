@@ -0,0 +1,56 @@
+import random
+
+from backend.solver.catalog import Catalog, build_catalog
+
+
+# ===== SYNTHETIC CATALOG =====
+def synthetic_catalog(
+    n_champions: int = 200,
+    n_traits: int = 40,
+    seed: int = 0,
+) -> Catalog:
+    """
+    Catalog giả lớn hơn data thật (101 tướng / 26 tộc) để đo khả năng scale.
+    Cùng seed => cùng catalog, nên kết quả so được giữa các lần chạy.
+    """
+    rng = random.Random(seed)
+
+    n_origins = max(1, n_traits * 2 // 5)
+    raw_traits = {}
+    for i in range(n_traits):
+        if i < n_origins:
+            name = f"Origin{i:02d}"
+            first = rng.choice([2, 3, 3])
+            raw_traits[name] = {
+                "thresholds": [first, first + 2, first + 4],
+                "type": "origin",
+            }
+        else:
+            name = f"Class{i:02d}"
+            raw_traits[name] = {
+                "thresholds": rng.choice([[2, 4], [2, 4, 6], [2, 3, 4, 5]]),
+                "type": "class",
+            }
+
+    origins = [t for t, d in raw_traits.items() if d["type"] == "origin"]
+    classes = [t for t, d in raw_traits.items() if d["type"] == "class"]
+
+    raw_champions = []
+    for i in range(n_champions):
+        traits = [rng.choice(origins)]
+        traits += rng.sample(classes, rng.choice([1, 1, 2]))
+        raw_champions.append(
+            {
+                "name": f"Champ{i:03d}",
+                "cost": rng.choice([1, 2, 2, 3, 3, 4, 4, 5, 5, 7]),
+                "traits": traits,
+                "roles": ["tank"] if rng.random() < 0.35 else ["carry"],
+                "locked": False,
+            }
+        )
+
+    return build_catalog(
+        raw_champions,
+        raw_traits,
+        version=f"synthetic-{n_champions}-{n_traits}-{seed}",
+    )
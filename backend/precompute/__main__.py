@@ -0,0 +1,88 @@
+"""
+Build index top-k tối ưu cho các setup hay gặp (chạy offline, lâu).
+
+    python -m backend.precompute                       # ghi vào TFT_INDEX
+    python -m backend.precompute --max-team 6-8 --time-limit 120
+    python -m backend.precompute --out /tmp/solutions.idx --carries Ryze,Ahri
+
+Chỉ setup duyệt hết cây trong time-limit mới được ghi; data patch mới
+(version catalog đổi) thì index cũ bị bỏ qua, cần build lại.
+"""
+import argparse
+import sys
+import time
+
+from backend.app.cache import canonical_key
+from backend.precompute.index import INDEX_FILE, write_index
+from backend.precompute.setups import MAX_TEAMS, common_setups
+from backend.solver.catalog import get_catalog
+from backend.solver.registry import SOLVERS
+from backend.solver.utils import resource_path
+
+
+def parse_range(text: str):
+    lo, _, hi = text.partition("-")
+    return range(int(lo), int(hi or lo) + 1)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.precompute")
+    parser.add_argument("--out", default=resource_path(INDEX_FILE))
+    parser.add_argument("--time-limit", type=float, default=300)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--max-team",
+        type=parse_range,
+        default=MAX_TEAMS,
+        help="vd 6-10",
+    )
+    parser.add_argument("--carries", help="danh sách tướng force, cách nhau bởi dấu phẩy")
+    parser.add_argument("--mode", choices=sorted(SOLVERS), help="chỉ build 1 mode")
+    args = parser.parse_args(argv)
+
+    catalog = get_catalog()
+    carries = args.carries.split(",") if args.carries else None
+    setups = common_setups(catalog, args.max_team, carries)
+    if args.mode:
+        setups = [s for s in setups if s.mode == args.mode]
+
+    solutions = {}
+    skipped = 0
+    for n, setup in enumerate(setups, 1):
+        start = time.time()
+        result = SOLVERS[setup.mode].run(
+            max_team=setup.max_team,
+            time_limit=args.time_limit,
+            forced=setup.forced,
+            banned=setup.banned,
+            emblems=setup.emblems,
+            workers=args.workers,
+            catalog=catalog,
+        )
+        status = "ok" if result.completed else "timeout"
+        print(
+            f"[{n}/{len(setups)}] {setup.mode} max_team={setup.max_team} "
+            f"forced={setup.forced} banned={len(setup.banned)} "
+            f"{status} {time.time() - start:.1f}s",
+            flush=True,
+        )
+        if not result.completed:
+            skipped += 1
+            continue
+
+        key = canonical_key(
+            setup.mode, catalog.version, setup.max_team,
+            setup.forced, setup.banned, setup.emblems,
+        )
+        solutions[key] = [
+            (e["score"], e["total_cost"], [c["name"] for c in e["team"]])
+            for e in result.best
+        ]
+
+    write_index(args.out, catalog, solutions)
+    print(f"Ghi {len(solutions)} setup vào {args.out} ({skipped} setup hết giờ bị bỏ)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+import hashlib
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, List, Tuple
+
+from backend.solver.catalog import Catalog
+from backend.solver.utils import resource_path
+
+
+# ===== CONFIG =====
+INDEX_FILE = os.environ.get("TFT_INDEX", "data/solutions.idx")
+
+# ===== FORMAT =====
+# header: magic, version catalog (16 byte ascii), số record, offset bảng record
+# bảng record (sort theo hash): hash key 8 byte, offset payload, độ dài payload
+# payload: key (utf-8, để chống đụng hash), k, rồi từng entry:
+#          score, total_cost, số tướng, index tướng trong catalog.champions
+MAGIC = b"TFTIDX01"
+HEADER = struct.Struct("<8s16sII")
+RECORD = struct.Struct("<QII")
+ENTRY = struct.Struct("<HHB")
+CHAMP = struct.Struct("<H")
+KEY_LEN = struct.Struct("<H")
+COUNT = struct.Struct("<B")
+
+# (score, total_cost, tên tướng)
+Solution = Tuple[int, int, List[str]]
+
+
+def key_hash(key: str) -> int:
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+# ===== WRITE =====
+def write_index(path: str, catalog: Catalog, solutions: Dict[str, List[Solution]]):
+    """solutions: canonical_key -> top-k đã chứng minh tối ưu (completed)"""
+    ids = {c.name: i for i, c in enumerate(catalog.champions)}
+
+    payloads = []
+    for key, entries in solutions.items():
+        raw = key.encode("utf-8")
+        parts = [KEY_LEN.pack(len(raw)), raw, COUNT.pack(len(entries))]
+        for score, total_cost, names in entries:
+            parts.append(ENTRY.pack(score, total_cost, len(names)))
+            parts.extend(CHAMP.pack(ids[name]) for name in names)
+        payloads.append((key_hash(key), b"".join(parts)))
+    payloads.sort(key=lambda p: p[0])
+
+    table_offset = HEADER.size
+    offset = table_offset + RECORD.size * len(payloads)
+    table = []
+    for h, data in payloads:
+        table.append(RECORD.pack(h, offset, len(data)))
+        offset += len(data)
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, catalog.version.encode("ascii"), len(payloads), table_offset))
+        f.write(b"".join(table))
+        for _, data in payloads:
+            f.write(data)
+    # ghi file tạm rồi đổi tên để process đang mmap không đọc phải file dở
+    os.replace(tmp, path)
+
+
+# ===== READ =====
+class SolutionIndex:
+    """
+    Index chỉ đọc, mmap cả file: lookup = binary search trên bảng record
+    cố định kích thước, không parse trước, không tốn RAM theo số setup.
+    """
+
+    def __init__(self, path: str, catalog: Catalog):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count, self._table = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path}: không phải solution index")
+        self.version = version.decode("ascii").rstrip("\0")
+        self._names = [c.name for c in catalog.champions]
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def _record(self, i: int) -> Tuple[int, int, int]:
+        return RECORD.unpack_from(self._map, self._table + i * RECORD.size)
+
+    def get(self, key: str) -> List[Solution] | None:
+        h = key_hash(key)
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._record(mid)[0] < h:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        raw = key.encode("utf-8")
+        i = lo
+        while i < self.count:
+            rh, offset, _ = self._record(i)
+            if rh != h:
+                break
+            (n,) = KEY_LEN.unpack_from(self._map, offset)
+            offset += KEY_LEN.size
+            if self._map[offset:offset + n] == raw:
+                return self._decode(offset + n)
+            i += 1
+        return None
+
+    def _decode(self, offset: int) -> List[Solution]:
+        (k,) = COUNT.unpack_from(self._map, offset)
+        offset += COUNT.size
+        out = []
+        for _ in range(k):
+            score, total_cost, size = ENTRY.unpack_from(self._map, offset)
+            offset += ENTRY.size
+            ids = struct.unpack_from(f"<{size}H", self._map, offset)
+            offset += CHAMP.size * size
+            out.append((score, total_cost, [self._names[i] for i in ids]))
+        return out
+
+
+# ===== LOADER =====
+_lock = threading.Lock()
+_current: SolutionIndex | None = None
+_stamp = None
+
+
+def get_index(catalog: Catalog) -> SolutionIndex | None:
+    """
+    Index khớp version của catalog, None nếu chưa build / đã cũ
+    (data patch mới => phải build lại). Tự mở lại khi file index đổi.
+    """
+    global _current, _stamp
+    path = resource_path(INDEX_FILE)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+
+    stamp = (st.st_mtime_ns, st.st_size, catalog.version)
+    with _lock:
+        if stamp != _stamp:
+            if _current is not None:
+                _current.close()
+            _current = None
+            _stamp = stamp
+            try:
+                index = SolutionIndex(path, catalog)
+            except (OSError, ValueError, struct.error):
+                return None
+            if index.version == catalog.version:
+                _current = index
+            else:
+                index.close()
+        return _current
@@ -0,0 +1,55 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from backend.solver.catalog import Catalog
+from backend.solver.registry import DEFAULT_BANNED, DEFAULT_FORCED
+
+
+MAX_TEAMS = range(6, 11)
+
+
+# ===== SETUP =====
+@dataclass
+class Setup:
+    mode: str                       # "bronze" | "ryze"
+    max_team: int
+    forced: List[str] = field(default_factory=list)
+    banned: List[str] = field(default_factory=list)
+    emblems: Dict[str, int] = field(default_factory=dict)
+
+
+def popular_carries(catalog: Catalog, min_cost: int = 4) -> List[str]:
+    """Tướng carry đắt tiền: thường là tướng người chơi force để build quanh"""
+    return sorted(
+        c.name for c in catalog.champions
+        if "carry" in c.roles and c.cost >= min_cost
+    )
+
+
+def common_setups(
+    catalog: Catalog,
+    max_teams=MAX_TEAMS,
+    carries: List[str] | None = None,
+) -> List[Setup]:
+    """
+    Các setup hay gặp: 2 mode x team size x (không ban / ban mặc định) x
+    (không force / force mặc định / force 1 carry), không emblem.
+    """
+    if carries is None:
+        carries = popular_carries(catalog)
+
+    forced_sets = [[], DEFAULT_FORCED] + [[c] for c in carries]
+    setups = []
+    for mode in ("bronze", "ryze"):
+        for max_team in max_teams:
+            for banned in ([], DEFAULT_BANNED):
+                for forced in forced_sets:
+                    if set(forced) & set(banned):
+                        continue
+                    setups.append(Setup(
+                        mode=mode,
+                        max_team=max_team,
+                        forced=list(forced),
+                        banned=list(banned),
+                    ))
+    return setups
@@ -0,0 +1,272 @@
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List
+
+from backend.solver.compiled import CompiledPool
+from backend.solver.search import CHECK_EVERY, SearchResult, to_best
+from backend.solver.topk import Entry, TopK, merge
+
+
+# ===== CONFIG =====
+T_START = 2.0           # nhiệt độ đầu mỗi lượt (đơn vị: điểm trait)
+T_END = 0.05
+RESTART_ITERS = 20000   # số bước mỗi lượt, hết lượt thì restart
+ROLE_PENALTY = 2.0      # điểm phạt cho mỗi tank / carry còn thiếu
+
+
+# ===== SIMULATED ANNEALING =====
+def board_size(pool: CompiledPool, max_team: int) -> int:
+    """Số slot còn trống sau forced (không vượt số tướng còn lại)"""
+    return max(0, min(max_team - len(pool.forced), len(pool.remain)))
+
+
+def only_board(pool: CompiledPool, max_team: int) -> bool:
+    """Không còn slot hoặc phải lấy hết remain => chỉ có đúng 1 board"""
+    size = board_size(pool, max_team)
+    return size == 0 or size == len(pool.remain)
+
+
+def anneal(
+    pool: CompiledPool,
+    max_team: int,
+    time_limit: float,
+    top_k: int,
+    seed: int | None = None,
+    cancel=None,
+    on_improve: Callable[[List[Entry]], None] | None = None,
+    node_limit: int | None = None,
+    start: List[Entry] | None = None,
+) -> SearchResult:
+    """
+    Simulated annealing trên team đủ slot, dùng chung CompiledPool (cùng luật
+    tính điểm với DFS). Mỗi bước đổi 1 tướng trong team lấy 1 tướng ngoài,
+    cập nhật count trait / role bằng phép cộng trừ như DFS.
+
+    Team luôn đầy slot: thêm tướng không bao giờ làm giảm điểm mà còn tăng
+    cost, nên bước thêm / bớt tướng riêng lẻ không cần thiết.
+    Năng lượng = score + cost (thu nhỏ để không vượt 1 điểm) - phạt role thiếu.
+
+    Chạy tới time_limit / node_limit (1 node = 1 bước), không chứng minh
+    tối ưu nên completed = False, trừ khi chỉ có đúng 1 board (only_board):
+    khi đó chấm board đó và trả về completed = True.
+    - seed: seed cho random, cùng seed + node_limit => cùng kết quả
+    - start: các team khởi đầu (vd warm start), lượt đầu dùng team tốt nhất
+    """
+    need = pool.need
+    weight = pool.weight
+    champ_traits = pool.champ_traits
+    cost = pool.cost
+    tank = pool.tank
+    carry = pool.carry
+    min_tank = pool.min_tank
+    min_carry = pool.min_carry
+
+    rng = random.Random(seed)
+    n = len(pool.remain)
+    size = board_size(pool, max_team)
+    cost_scale = 1.0 / (sum(sorted(cost, reverse=True)[:size]) + 1)
+    store = TopK(top_k)
+
+    counts = list(pool.base_counts)
+    in_board = [False] * n
+    board: List[int] = []
+    score = pool.base_score
+    total_cost = pool.base_cost
+    tanks = pool.base_tank
+    carries = pool.base_carry
+
+    begin = time.time()
+    stop_reason = None
+    nodes = 0
+    found_at = None
+    top = None
+    if node_limit is None:
+        node_limit = float("inf")
+
+    def add(j):
+        nonlocal score, total_cost, tanks, carries
+        for t in champ_traits[j]:
+            counts[t] += 1
+            if counts[t] == need[t]:
+                score += weight[t]
+        in_board[j] = True
+        total_cost += cost[j]
+        tanks += tank[j]
+        carries += carry[j]
+
+    def remove(j):
+        nonlocal score, total_cost, tanks, carries
+        for t in champ_traits[j]:
+            if counts[t] == need[t]:
+                score -= weight[t]
+            counts[t] -= 1
+        in_board[j] = False
+        total_cost -= cost[j]
+        tanks -= tank[j]
+        carries -= carry[j]
+
+    def energy():
+        missing = max(0, min_tank - tanks) + max(0, min_carry - carries)
+        return score + total_cost * cost_scale - ROLE_PENALTY * missing
+
+    def reset(team):
+        """Dựng lại board từ team (bổ sung tướng ngẫu nhiên cho đủ slot)"""
+        for j in board:
+            remove(j)
+        board.clear()
+        for j in team:
+            add(j)
+            board.append(j)
+        while len(board) < size:
+            j = rng.randrange(n)
+            if not in_board[j]:
+                add(j)
+                board.append(j)
+
+    def save():
+        nonlocal found_at, top
+        if tanks < min_tank or carries < min_carry:
+            return
+        if not store.admits(score, total_cost):
+            return
+        team = tuple(sorted(board))
+        if not store.push(score, total_cost, team):
+            return
+        entry = (-score, -total_cost, team)
+        if top is None or entry < top:
+            top = entry
+            found_at = time.time()
+        if on_improve is not None:
+            on_improve(store.entries())
+
+    if only_board(pool, max_team):
+        reset(range(size))
+        save()
+        entries = store.entries()
+        return SearchResult(
+            best=to_best(pool, entries),
+            completed=True,
+            nodes=1,
+            entries=entries,
+            started=begin,
+            elapsed=time.time() - begin,
+            found_at=found_at,
+            upper_bound=-entries[0][0] if entries else None,
+        )
+
+    starts = sorted(start or [])
+    reset(starts[0][2] if starts else ())
+    save()
+
+    step = 0
+    current = energy()
+    while True:
+        if nodes >= node_limit:
+            stop_reason = "nodes"
+            break
+        if nodes % CHECK_EVERY == 0:
+            if time.time() - begin > time_limit:
+                stop_reason = "time"
+                break
+            if cancel is not None and cancel.is_set():
+                stop_reason = "cancelled"
+                break
+        nodes += 1
+
+        # ===== RESTART =====
+        if step >= RESTART_ITERS:
+            step = 0
+            # xen kẽ: làm lại từ team tốt nhất hoặc từ team ngẫu nhiên
+            if top is not None and rng.random() < 0.5:
+                reset(top[2])
+            else:
+                reset(())
+            current = energy()
+        temperature = T_START * (T_END / T_START) ** (step / RESTART_ITERS)
+        step += 1
+
+        # ===== SWAP =====
+        pos = rng.randrange(size)
+        out = board[pos]
+        j = rng.randrange(n)
+        if in_board[j]:
+            continue
+        remove(out)
+        add(j)
+        proposed = energy()
+        delta = proposed - current
+        if delta >= 0 or rng.random() < math.exp(delta / temperature):
+            board[pos] = j
+            current = proposed
+            save()
+        else:
+            remove(j)
+            add(out)
+
+    entries = store.entries()
+    return SearchResult(
+        best=to_best(pool, entries),
+        completed=False,
+        nodes=nodes,
+        entries=entries,
+        stop_reason=stop_reason,
+        started=begin,
+        elapsed=time.time() - begin,
+        found_at=found_at,
+    )
+
+
+# ===== PARALLEL =====
+def parallel_anneal(
+    pool: CompiledPool,
+    max_team: int,
+    time_limit: float,
+    top_k: int,
+    workers: int,
+    seed: int | None = None,
+    cancel=None,
+    node_limit: int | None = None,
+    start: List[Entry] | None = None,
+) -> SearchResult:
+    """
+    Mỗi worker chạy 1 chuỗi độc lập (seed + i), gộp top-k cuối cùng.
+    node_limit được chia đều cho các chuỗi.
+    """
+    if only_board(pool, max_team):
+        return anneal(pool, max_team, time_limit, top_k, seed=seed, start=start)
+
+    begin = time.time()
+    seeds = [None if seed is None else seed + i for i in range(workers)]
+    if node_limit is not None:
+        node_limit = -(-node_limit // workers)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                anneal, pool, max_team, time_limit, top_k,
+                seed=s, cancel=cancel, node_limit=node_limit, start=start,
+            )
+            for s in seeds
+        ]
+        parts = [f.result() for f in futures]
+
+    entries = merge(pool, [p.entries for p in parts], top_k)
+    reasons = {p.stop_reason for p in parts}
+    found = [
+        p.found_at for p in parts
+        if entries and p.entries and p.entries[0] == entries[0]
+    ]
+    return SearchResult(
+        best=to_best(pool, entries),
+        completed=False,
+        nodes=sum(p.nodes for p in parts),
+        entries=entries,
+        stop_reason=next(
+            (r for r in ("cancelled", "time", "nodes") if r in reasons), None
+        ),
+        started=begin,
+        elapsed=time.time() - begin,
+        found_at=found[0] if found else None,
+    )
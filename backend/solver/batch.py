@@ -0,0 +1,41 @@
+import json
+from typing import Dict, List
+
+
+# ===== PLAN =====
+def plan_waves(emblems: List[Dict[str, int]]) -> List[List[int]]:
+    """
+    Chia các variant thành từng đợt theo tổng emblem tăng dần. Variant trong
+    cùng đợt chạy song song; team của các đợt trước làm seed cho đợt sau.
+    Thêm emblem thường giữ / tăng điểm của team cũ (trừ trait mà riêng
+    emblem đã đủ ngưỡng: không được tính), nên team cũ chỉ dùng làm seed
+    sau khi chấm lại, không dùng thẳng làm kết quả.
+    """
+    waves: Dict[int, List[int]] = {}
+    for i, e in enumerate(emblems):
+        waves.setdefault(sum(v for v in e.values() if v > 0), []).append(i)
+    return [waves[k] for k in sorted(waves)]
+
+
+def incumbent_teams(results: List[List[dict]]) -> List[List[str]]:
+    """Tên tướng của mọi team đã tìm được (bỏ trùng), dạng result.best"""
+    seen = set()
+    teams = []
+    for best in results:
+        for entry in best:
+            names = tuple(sorted(c["name"] for c in entry["team"]))
+            if names not in seen:
+                seen.add(names)
+                teams.append(list(names))
+    return teams
+
+
+def variant_key(params: dict) -> str:
+    """Key để gộp variant trùng (emblem = 0 coi như không có)"""
+    emblems = {t: v for t, v in params.get("emblems", {}).items() if v}
+    params = dict(params, emblems=emblems)
+    for name in ("forced", "banned"):
+        if name in params:
+            params[name] = sorted(set(params[name]))
+    return json.dumps(params, sort_keys=True, ensure_ascii=False)
+
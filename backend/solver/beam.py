@@ -0,0 +1,177 @@
+import time
+from typing import List, Tuple
+
+from backend.solver.compiled import CompiledPool, team_entry
+from backend.solver.search import SearchResult, to_best
+from backend.solver.topk import Entry, TopK
+
+
+# ===== CONFIG =====
+BEAM_WIDTH = 16          # số team dở dang giữ lại mỗi tầng (mode=beam)
+MAX_BEAM_WIDTH = 256     # trần beam_width của request (~1s mỗi request với max_team 14)
+WARM_START_WIDTH = 8     # beam nhỏ chạy trước DFS để có điểm thứ k ngay từ đầu
+
+
+# ===== BEAM SEARCH =====
+def beam_search(
+    pool: CompiledPool,
+    max_team: int,
+    width: int,
+    top_k: int,
+    deadline: float | None = None,
+    cancel=None,
+) -> Tuple[List[Entry], str | None]:
+    """
+    Thêm dần từng tướng, mỗi tầng chỉ giữ `width` team dở dang tốt nhất theo
+    heuristic = score + tiến độ các trait chưa kích (weight / need mỗi tướng,
+    bỏ trait không còn đủ slot để kích).
+    remain đã sort theo champion_value nên hòa heuristic thì ưu tiên index nhỏ.
+    Mọi team hợp lệ gặp trên đường đi đều được đẩy vào top-k.
+    width = 1 là greedy.
+    deadline (time.time()) / cancel: kiểm tra giữa 2 tầng, dừng thì trả về
+    top-k tới tầng đó. Trả về (entries, stop_reason) như search().
+    """
+    need = pool.need
+    weight = pool.weight
+    champ_traits = pool.champ_traits
+    cost = pool.cost
+    tank = pool.tank
+    carry = pool.carry
+    min_tank = pool.min_tank
+    min_carry = pool.min_carry
+
+    n = len(pool.remain)
+    slots = max_team - len(pool.forced)
+    store = TopK(top_k)
+
+    def push(state):
+        _, score, total_cost, tanks, carries, _, chosen = state
+        if tanks >= min_tank and carries >= min_carry and store.admits(score, total_cost):
+            store.push(score, total_cost, tuple(sorted(chosen)))
+
+    # state = (heuristic, score, total_cost, tanks, carries, counts, chosen)
+    beam = [(0.0, pool.base_score, pool.base_cost, pool.base_tank, pool.base_carry,
+             tuple(pool.base_counts), ())]
+    push(beam[0])
+
+    stop_reason = None
+    for depth in range(max(slots, 0)):
+        if deadline is not None and time.time() > deadline:
+            stop_reason = "time"
+            break
+        if cancel is not None and cancel.is_set():
+            stop_reason = "cancelled"
+            break
+
+        left = slots - depth - 1        # slot còn lại sau khi thêm tướng này
+        seen = set()
+        children = []
+
+        for h, score, total_cost, tanks, carries, counts, chosen in beam:
+            taken = set(chosen)
+            for j in range(n):
+                if j in taken:
+                    continue
+                tk = tanks + tank[j]
+                cr = carries + carry[j]
+                if tk + left < min_tank or cr + left < min_carry:
+                    continue
+                key = frozenset(taken | {j})
+                if key in seen:
+                    continue
+                seen.add(key)
+
+                added = 0
+                progress = 0.0
+                for t in champ_traits[j]:
+                    c = counts[t] + 1
+                    if c == need[t]:
+                        added += weight[t]
+                    elif c < need[t] and need[t] - c <= left:
+                        progress += weight[t] / need[t]
+                children.append((
+                    h + added + progress,
+                    score + added,
+                    total_cost + cost[j],
+                    tk,
+                    cr,
+                    j,
+                    counts,
+                    chosen,
+                ))
+
+        if not children:
+            break
+        # heuristic cao hơn, rồi cost cao hơn, rồi index nhỏ hơn (champion_value)
+        children.sort(key=lambda s: (-s[0], -s[2], s[5]))
+
+        beam = []
+        for h, score, total_cost, tk, cr, j, counts, chosen in children[:width]:
+            new_counts = list(counts)
+            for t in champ_traits[j]:
+                new_counts[t] += 1
+            state = (h, score, total_cost, tk, cr, tuple(new_counts), chosen + (j,))
+            beam.append(state)
+            push(state)
+        # team chưa hợp lệ nhưng điểm cao ở tầng dưới vẫn có thể lọt top-k
+        for h, score, total_cost, tk, cr, j, counts, chosen in children[width:]:
+            if tk >= min_tank and cr >= min_carry and store.admits(score, total_cost):
+                store.push(score, total_cost, tuple(sorted(chosen + (j,))))
+
+    return store.entries(), stop_reason
+
+
+def greedy(pool: CompiledPool, max_team: int, top_k: int) -> List[Entry]:
+    return beam_search(pool, max_team, 1, top_k)[0]
+
+
+def warm_start(
+    pool: CompiledPool,
+    max_team: int,
+    top_k: int,
+    incumbents: List[List[str]] | None = None,
+) -> List[Entry]:
+    """
+    Greedy + beam nhỏ: top-k ban đầu cho DFS, vài chục ms.
+    incumbents: team (list tên) từ các lần solve trước với ràng buộc gần
+    giống, được chấm lại theo pool này; team không còn hợp lệ bị bỏ qua.
+    """
+    reused = [team_entry(pool, max_team, names) for names in incumbents or []]
+    store = TopK(top_k)
+    for entries in (
+        [e for e in reused if e is not None],
+        greedy(pool, max_team, top_k),
+        beam_search(pool, max_team, WARM_START_WIDTH, top_k)[0],
+    ):
+        for neg_score, neg_cost, chosen in entries:
+            store.push(-neg_score, -neg_cost, chosen)
+    return store.entries()
+
+
+# ===== MODE = BEAM =====
+def beam_result(
+    pool: CompiledPool,
+    max_team: int,
+    width: int,
+    top_k: int,
+    time_limit: float = float("inf"),
+    cancel=None,
+) -> SearchResult:
+    """
+    Chạy riêng beam search, trả về cùng dạng với search() (completed = False).
+    Hết time_limit / cancel thì dừng sau tầng đang duyệt.
+    """
+    start = time.time()
+    entries, stop_reason = beam_search(
+        pool, max_team, width, top_k, deadline=start + time_limit, cancel=cancel
+    )
+    return SearchResult(
+        best=to_best(pool, entries),
+        completed=False,
+        nodes=0,
+        entries=entries,
+        stop_reason=stop_reason,
+        started=start,
+        elapsed=time.time() - start,
+        found_at=time.time() if entries else None,
+    )
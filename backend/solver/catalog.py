@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple
+
+from backend.models.champion import Champion
+from backend.models.trait import Trait
+from backend.solver.utils import resource_path
+
+
+CHAMPIONS_FILE = "data/champions.json"
+TRAITS_FILE = "data/traits.json"
+
+
+# ===== CATALOG =====
+@dataclass
+class Catalog:
+    """
+    Dữ liệu tướng/tộc đã parse + index, dùng chung cho mọi request.
+    Không được sửa sau khi tạo: khi data đổi thì tạo Catalog mới rồi swap.
+    """
+    version: str
+    champions: List[Champion]
+    traits: Dict[str, Trait]
+    raw_traits: dict
+    modified: float = 0.0               # mtime mới nhất của file data (Last-Modified)
+
+    by_name: Dict[str, Champion] = field(default_factory=dict)
+    by_trait: Dict[str, List[Champion]] = field(default_factory=dict)
+
+    _rules: Dict[str, Tuple[dict, dict]] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        self.by_name = {c.name: c for c in self.champions}
+        self.by_trait = {t: [] for t in self.traits}
+        for c in self.champions:
+            for t in c.traits:
+                self.by_trait.setdefault(t, []).append(c)
+
+    def trait_rules(
+        self,
+        mode: str,
+        need_fn: Callable[[str, Trait], int | float],
+        weight_fn: Callable[[str, Trait], int],
+    ) -> Tuple[Dict[str, int | float], Dict[str, int]]:
+        """need / weight từng trait theo luật của solver, tính 1 lần mỗi mode"""
+        rules = self._rules.get(mode)
+        if rules is None:
+            rules = (
+                {name: need_fn(name, tr) for name, tr in self.traits.items()},
+                {name: weight_fn(name, tr) for name, tr in self.traits.items()},
+            )
+            self._rules[mode] = rules
+        return rules
+
+    def pool(self, banned: List[str]) -> List[Champion]:
+        banned = set(banned)
+        return [c for c in self.champions if c.name not in banned]
+
+
+def build_catalog(
+    raw_champions: list,
+    raw_traits: dict,
+    version: str,
+    modified: float = 0.0,
+) -> Catalog:
+    champions = [
+        Champion(
+            name=c["name"],
+            cost=c["cost"],
+            traits=c["traits"],
+            roles=c.get("roles", []),
+            locked=c.get("locked", False),
+        )
+        for c in raw_champions
+    ]
+    traits = {
+        name: Trait(name, data["thresholds"], data["type"])
+        for name, data in raw_traits.items()
+    }
+    return Catalog(
+        version=version,
+        champions=champions,
+        traits=traits,
+        raw_traits=raw_traits,
+        modified=modified,
+    )
+
+
+# ===== PROCESS-WIDE INSTANCE =====
+_lock = threading.Lock()
+_catalog: Catalog | None = None
+_stamp = None
+
+
+def _file_stamp(paths):
+    stamp = []
+    for p in paths:
+        st = os.stat(p)
+        stamp.append((st.st_mtime_ns, st.st_size))
+    return tuple(stamp)
+
+
+def load_catalog() -> Catalog:
+    champ_path = resource_path(CHAMPIONS_FILE)
+    trait_path = resource_path(TRAITS_FILE)
+
+    with open(champ_path, "rb") as f:
+        champ_bytes = f.read()
+    with open(trait_path, "rb") as f:
+        trait_bytes = f.read()
+
+    version = hashlib.sha256(champ_bytes + b"\0" + trait_bytes).hexdigest()[:16]
+    modified = max(os.stat(p).st_mtime for p in (champ_path, trait_path))
+    return build_catalog(
+        json.loads(champ_bytes.decode("utf-8")),
+        json.loads(trait_bytes.decode("utf-8")),
+        version,
+        modified,
+    )
+
+
+def get_catalog() -> Catalog:
+    """
+    Catalog hiện tại. Mỗi lần gọi chỉ stat 2 file JSON; nếu file đổi
+    (patch mới) thì parse lại và swap cả object, request đang chạy vẫn
+    giữ bản cũ.
+    """
+    global _catalog, _stamp
+
+    paths = (resource_path(CHAMPIONS_FILE), resource_path(TRAITS_FILE))
+    stamp = _file_stamp(paths)
+    current = _catalog
+    if current is not None and stamp == _stamp:
+        return current
+
+    with _lock:
+        if _catalog is not None and stamp == _stamp:
+            return _catalog
+
+        fresh = load_catalog()
+        if _catalog is None or fresh.version != _catalog.version:
+            _catalog = fresh
+        _stamp = stamp
+        return _catalog
@@ -0,0 +1,129 @@
+import base64
+import binascii
+import hashlib
+import json
+import zlib
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+from backend.solver.compiled import CompiledPool, team_entry
+from backend.solver.topk import Entry
+
+
+# ===== FORMAT =====
+# token = base64url(zlib(json)), json = {"v", "fp", "path", "teams", "nodes"}
+TOKEN_VERSION = 1
+# token do client gửi lên: giới hạn cả độ dài lẫn kích thước sau khi giải nén
+# (chống zip bomb làm tràn RAM của worker)
+MAX_TOKEN_CHARS = 64 * 1024
+MAX_TOKEN_BYTES = 1024 * 1024
+
+
+class InvalidCheckpoint(ValueError):
+    pass
+
+
+def pool_fingerprint(
+    pool: CompiledPool,
+    max_team: int,
+    top_k: int,
+    unique_signature: bool = False,
+    diversity: int = 0,
+) -> str:
+    """
+    Hash mọi thứ quyết định hình dạng cây DFS: token chỉ dùng lại được cho
+    đúng bài toán đó (cùng data, forced / banned / emblem, max_team, bộ lọc).
+    """
+    data = [
+        [c.name for c in pool.forced],
+        [c.name for c in pool.remain],
+        pool.need,
+        pool.weight,
+        pool.champ_traits,
+        pool.cost,
+        pool.tank,
+        pool.carry,
+        pool.base_counts,
+        pool.prev_equiv,
+        max_team,
+        top_k,
+        unique_signature,
+        diversity,
+    ]
+    raw = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+
+# ===== CHECKPOINT =====
+@dataclass
+class Checkpoint:
+    """
+    Điểm dừng của DFS (search không prefix):
+    - path[d]: quyết định ở node remain[d] đang mở trên stack
+      (1 = đang ở nhánh TAKE, nhánh SKIP còn chờ; 0 = đang ở nhánh SKIP),
+      node kế tiếp cần duyệt là remain[len(path)]
+    - teams: top-k đã tìm được (index trong remain), được chấm lại khi resume
+    - nodes: tổng node đã duyệt qua mọi lần chạy
+    """
+    fingerprint: str
+    path: List[int] = field(default_factory=list)
+    teams: List[Tuple[int, ...]] = field(default_factory=list)
+    nodes: int = 0
+
+    def token(self) -> str:
+        data = {
+            "v": TOKEN_VERSION,
+            "fp": self.fingerprint,
+            "path": "".join("1" if took else "0" for took in self.path),
+            "teams": [list(team) for team in self.teams],
+            "nodes": self.nodes,
+        }
+        raw = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(zlib.compress(raw, 9)).decode("ascii").rstrip("=")
+
+    @classmethod
+    def from_token(cls, token: str, fingerprint: str) -> "Checkpoint":
+        """Giải token, sai định dạng hoặc khác bài toán => InvalidCheckpoint"""
+        if len(token) > MAX_TOKEN_CHARS:
+            raise InvalidCheckpoint("Checkpoint token too large")
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            inflate = zlib.decompressobj()
+            raw = inflate.decompress(base64.urlsafe_b64decode(padded), MAX_TOKEN_BYTES)
+        except (binascii.Error, zlib.error, ValueError):
+            raise InvalidCheckpoint("Malformed checkpoint token")
+        if inflate.unconsumed_tail:
+            raise InvalidCheckpoint("Checkpoint token too large")
+        if not inflate.eof:
+            raise InvalidCheckpoint("Malformed checkpoint token")
+
+        try:
+            data = json.loads(raw)
+            version = data["v"]
+            fp = data["fp"]
+            path = [int(c) for c in data["path"]]
+            teams = [tuple(int(j) for j in team) for team in data["teams"]]
+            nodes = int(data["nodes"])
+        except (UnicodeDecodeError, ValueError, KeyError, TypeError):
+            raise InvalidCheckpoint("Malformed checkpoint token")
+
+        if version != TOKEN_VERSION:
+            raise InvalidCheckpoint("Unsupported checkpoint version")
+        if fp != fingerprint:
+            raise InvalidCheckpoint("Checkpoint does not match this request")
+        if any(took not in (0, 1) for took in path):
+            raise InvalidCheckpoint("Malformed checkpoint token")
+        return cls(fingerprint=fp, path=path, teams=teams, nodes=nodes)
+
+    def entries(self, pool: CompiledPool, max_team: int) -> List[Entry]:
+        """Chấm lại top-k trong token (không tin điểm do client gửi lên)"""
+        entries = []
+        for team in self.teams:
+            if any(not 0 <= j < len(pool.remain) for j in team):
+                raise InvalidCheckpoint("Checkpoint team out of range")
+            names = [c.name for c in pool.forced] + [pool.remain[j].name for j in team]
+            entry = team_entry(pool, max_team, names)
+            if entry is None:
+                raise InvalidCheckpoint("Checkpoint team is not valid")
+            entries.append(entry)
+        return entries
@@ -0,0 +1,153 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from backend.models.champion import Champion
+from backend.models.trait import Trait
+
+
+# ===== COMPILED POOL =====
+@dataclass
+class CompiledPool:
+    """
+    Dạng số nguyên của bài toán để DFS chỉ làm phép cộng/trừ:
+    - trait được intern thành index 0..T-1 (chỉ các trait có tính điểm)
+    - mỗi tướng thành tuple index trait + cờ tank/carry + cost
+    - trạng thái forced + emblem đã gộp sẵn vào base_*
+    - prev_equiv / classes / dropped: do reduce_pool điền, rỗng = chưa rút gọn
+    """
+    trait_names: List[str]
+    need: List[int]
+    weight: List[int]
+
+    forced: List[Champion]
+    remain: List[Champion]
+
+    champ_traits: List[Tuple[int, ...]]
+    cost: List[int]
+    tank: List[int]
+    carry: List[int]
+
+    base_counts: List[int]
+    base_score: int
+    base_cost: int
+    base_tank: int
+    base_carry: int
+
+    min_tank: int
+    min_carry: int
+
+    # prev_equiv[j] = tướng tương đương đứng trước j trong remain, -1 nếu không có
+    prev_equiv: List[int] = field(default_factory=list)
+    # các nhóm >= 2 tướng tương đương (index trong remain, tăng dần)
+    classes: List[Tuple[int, ...]] = field(default_factory=list)
+    # tướng bị loại vì không thể lọt top-k
+    dropped: List[Champion] = field(default_factory=list)
+
+
+def compile_pool(
+    champions: List[Champion],
+    traits: Dict[str, Trait],
+    forced: List[str],
+    emblems: Dict[str, int],
+    trait_need: Dict[str, int | float],
+    trait_weight: Dict[str, int],
+    min_cost: int,
+    min_tank: int,
+    min_carry: int,
+) -> CompiledPool:
+    """
+    champions phải được sort sẵn theo thứ tự duyệt mong muốn.
+    trait_need / trait_weight: luật của solver, xem Catalog.trait_rules
+    """
+    trait_names = []
+    need = []
+    weight = []
+    for name in traits:
+        n = trait_need[name]
+        w = trait_weight[name]
+        if n == float("inf") or w <= 0:
+            continue
+        trait_names.append(name)
+        need.append(int(n))
+        weight.append(w)
+
+    index = {name: i for i, name in enumerate(trait_names)}
+
+    def trait_ids(c: Champion) -> Tuple[int, ...]:
+        return tuple(index[t] for t in c.traits if t in index)
+
+    def is_tank(c: Champion) -> int:
+        return int(c.cost >= min_cost and "tank" in c.roles)
+
+    def is_carry(c: Champion) -> int:
+        return int(c.cost >= min_cost and "carry" in c.roles)
+
+    forced_champs = [c for c in champions if c.name in forced]
+    remain = [c for c in champions if c.name not in forced]
+
+    counts = [0] * len(trait_names)
+    for t, v in emblems.items():
+        if t in index:
+            counts[index[t]] += v
+
+    score = 0
+    for c in forced_champs:
+        for t in trait_ids(c):
+            counts[t] += 1
+            if counts[t] == need[t]:
+                score += weight[t]
+
+    return CompiledPool(
+        trait_names=trait_names,
+        need=need,
+        weight=weight,
+        forced=forced_champs,
+        remain=remain,
+        champ_traits=[trait_ids(c) for c in remain],
+        cost=[c.cost for c in remain],
+        tank=[is_tank(c) for c in remain],
+        carry=[is_carry(c) for c in remain],
+        base_counts=counts,
+        base_score=score,
+        base_cost=sum(c.cost for c in forced_champs),
+        base_tank=sum(is_tank(c) for c in forced_champs),
+        base_carry=sum(is_carry(c) for c in forced_champs),
+        min_tank=min_tank,
+        min_carry=min_carry,
+    )
+
+
+def team_entry(pool: CompiledPool, max_team: int, names: List[str]):
+    """
+    Chấm lại 1 team (list tên tướng) theo trạng thái của pool, dùng để tái
+    sử dụng kết quả cũ làm seed. Trả về entry (-score, -total_cost, chosen)
+    hoặc None nếu team không hợp lệ với pool này (thiếu forced, có tướng
+    bị ban / bị loại, quá max_team, thiếu role).
+    """
+    names = set(names)
+    forced = {c.name for c in pool.forced}
+    if not forced <= names or len(names) > max_team:
+        return None
+
+    index = {c.name: j for j, c in enumerate(pool.remain)}
+    chosen = []
+    for name in names - forced:
+        j = index.get(name)
+        if j is None:
+            return None
+        chosen.append(j)
+
+    counts = list(pool.base_counts)
+    score = pool.base_score
+    for j in chosen:
+        for t in pool.champ_traits[j]:
+            counts[t] += 1
+            if counts[t] == pool.need[t]:
+                score += pool.weight[t]
+    tanks = pool.base_tank + sum(pool.tank[j] for j in chosen)
+    carries = pool.base_carry + sum(pool.carry[j] for j in chosen)
+    if tanks < pool.min_tank or carries < pool.min_carry:
+        return None
+
+    total_cost = pool.base_cost + sum(pool.cost[j] for j in chosen)
+    return -score, -total_cost, tuple(sorted(chosen))
@@ -0,0 +1,332 @@
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Tuple
+
+from backend.models.champion import Champion
+from backend.models.trait import Trait
+from backend.solver.anneal import anneal, parallel_anneal
+from backend.solver.beam import BEAM_WIDTH, beam_result, warm_start
+from backend.solver.catalog import Catalog, get_catalog
+from backend.solver.checkpoint import Checkpoint, InvalidCheckpoint, pool_fingerprint
+from backend.solver.compiled import CompiledPool, compile_pool
+from backend.solver.parallel import parallel_search
+from backend.solver.pareto import higher_tiers, pareto_search, to_front
+from backend.solver.reduce import reduce_front_pool, reduce_pool, reduction_stats
+from backend.solver.search import SearchResult, search, to_best
+from backend.solver.transposition import TT_MEMORY_MB
+from backend.solver.vector import TailBlocks, tail_blocks
+
+
+# ===== CONFIG =====
+TOP_K = 5
+
+MIN_TANK = 2
+MIN_CARRY = 2
+MIN_COST = 4
+
+
+# ===== RULES =====
+@dataclass(frozen=True)
+class Rules:
+    """
+    Phần khác nhau giữa các solver (ryze, bronze...), mọi thứ còn lại
+    (compile, rút gọn, các mode search) dùng chung trong module này.
+    """
+    name: str                                                  # key cache của catalog.trait_rules
+    trait_need: Callable[[str, Trait], int | float]
+    trait_weight: Callable[[str, Trait], int]
+    champion_value: Callable[[Champion, Dict[str, Trait]], float]   # thứ tự duyệt
+    serialize_team: Callable[[List[Champion]], list]
+
+
+# ===== POOL =====
+def build_pool(
+    rules: Rules,
+    forced: List[str],
+    banned: List[str],
+    emblems: Dict[str, int],
+    catalog: Catalog | None = None,
+) -> CompiledPool:
+    if catalog is None:
+        catalog = get_catalog()
+    traits = catalog.traits
+    champions = catalog.pool(banned)
+    need, weight = catalog.trait_rules(rules.name, rules.trait_need, rules.trait_weight)
+
+    champions.sort(
+        key=lambda c: rules.champion_value(c, traits),
+        reverse=True,
+    )
+
+    return compile_pool(
+        champions,
+        traits,
+        forced=forced,
+        emblems=emblems,
+        trait_need=need,
+        trait_weight=weight,
+        min_cost=MIN_COST,
+        min_tank=MIN_TANK,
+        min_carry=MIN_CARRY,
+    )
+
+
+def prepare_pool(
+    rules: Rules,
+    max_team: int,
+    forced: List[str],
+    banned: List[str],
+    emblems: Dict[str, int],
+    catalog: Catalog | None = None,
+    unique_signature: bool = False,
+    diversity: int = 0,
+    mode: str = "exact",
+    top_k: int = TOP_K,
+) -> Tuple[CompiledPool, TailBlocks | None]:
+    """Pool đúng như mode đó sẽ duyệt (đã rút gọn) + TailBlocks của mode vector"""
+    pool = build_pool(rules, forced, banned, emblems, catalog)
+    # rút gọn chỉ giữ đúng top-k mặc định, các bộ lọc thì duyệt đủ
+    tails = None
+    if mode == "pareto":
+        pool = reduce_front_pool(pool, max_team)
+    elif not unique_signature and diversity <= 1:
+        pool = reduce_pool(pool, max_team, top_k)
+        if mode == "vector":
+            pool, tails = tail_blocks(pool)
+    return pool, tails
+
+
+def load_checkpoint(
+    pool: CompiledPool,
+    max_team: int,
+    checkpoint: str,
+    mode: str = "exact",
+    unique_signature: bool = False,
+    diversity: int = 0,
+    top_k: int = TOP_K,
+) -> Tuple[Checkpoint, list]:
+    """(Checkpoint, top-k đã chấm lại) của token, token sai => InvalidCheckpoint"""
+    if mode not in ("exact", "vector"):
+        raise InvalidCheckpoint("Checkpoint only applies to mode=exact/vector")
+    fingerprint = pool_fingerprint(pool, max_team, top_k, unique_signature, diversity)
+    resume = Checkpoint.from_token(checkpoint, fingerprint)
+    return resume, resume.entries(pool, max_team)
+
+
+def check_checkpoint(
+    rules: Rules,
+    max_team: int,
+    forced: List[str],
+    banned: List[str],
+    emblems: Dict[str, int],
+    checkpoint: str,
+    catalog: Catalog | None = None,
+    unique_signature: bool = False,
+    diversity: int = 0,
+    mode: str = "exact",
+    top_k: int = TOP_K,
+):
+    """
+    Kiểm tra token như run() nhưng không search, vd trước khi xếp cả 1 batch
+    vào job pool. Token sai => InvalidCheckpoint.
+    """
+    pool, _ = prepare_pool(
+        rules, max_team, forced, banned, emblems, catalog,
+        unique_signature, diversity, mode, top_k,
+    )
+    load_checkpoint(
+        pool, max_team, checkpoint, mode, unique_signature, diversity, top_k
+    )
+
+
+# ===== SERIALIZE =====
+def serialized(rules: Rules, pool: CompiledPool, on_improve):
+    """Bọc on_improve để nhận top-K đã serialize thay vì entry dạng index"""
+    if on_improve is None:
+        return None
+
+    def notify(entries):
+        on_improve([
+            dict(entry, team=rules.serialize_team(entry["team"]))
+            for entry in to_best(pool, entries)
+        ])
+    return notify
+
+
+def serialized_front(rules: Rules, pool: CompiledPool, on_improve):
+    """Như serialized() cho các điểm của ParetoFront"""
+    if on_improve is None:
+        return None
+
+    def notify(points):
+        on_improve([
+            dict(entry, team=rules.serialize_team(entry["team"]))
+            for entry in to_front(pool, points)
+        ])
+    return notify
+
+
+# ===== SOLVER =====
+def run(
+    rules: Rules,
+    max_team: int,
+    time_limit: float,
+    forced: List[str],
+    banned: List[str],
+    emblems: Dict[str, int],
+    workers: int = 1,
+    cancel=None,
+    on_improve: Callable[[List[dict]], None] | None = None,
+    node_limit: int | None = None,
+    catalog: Catalog | None = None,
+    unique_signature: bool = False,
+    diversity: int = 0,
+    mode: str = "exact",
+    beam_width: int = BEAM_WIDTH,
+    seed: int | None = None,
+    incumbents: List[List[str]] | None = None,
+    on_progress: Callable[[int, float], None] | None = None,
+    checkpoint: str | None = None,
+    tt_memory_mb: float = TT_MEMORY_MB,
+    top_k: int = TOP_K,
+) -> SearchResult:
+    """
+    Như solve() nhưng trả về cả trạng thái search (completed, nodes...).
+    on_improve nhận top-K đã serialize mỗi khi có team tốt hơn (chỉ khi workers = 1).
+    on_progress(nodes, elapsed): tiến trình DFS (mode exact / vector, workers = 1).
+    unique_signature / diversity: lọc các team gần giống nhau, xem TopK.
+    mode: "exact" = DFS (có warm start bằng greedy + beam),
+          "vector" = như exact nhưng vài slot cuối chấm theo khối bằng numpy
+                     (cùng kết quả, nhanh hơn với max_team nhỏ; cần numpy,
+                     không có thì chạy như exact, bộ lọc top-k cũng vậy)
+          "beam" = chỉ beam search rộng beam_width, trả lời ngay
+                   (dừng giữa 2 tầng khi hết time_limit / cancel)
+          "anneal" = simulated annealing tới hết time_limit (max_team lớn),
+                     seed cố định để lặp lại được
+          "pareto" = Pareto front (score cao / total_cost thấp / tiers cao) của
+                     các board đủ max_team thay cho top-K, luôn 1 worker,
+                     bỏ qua bộ lọc top-k, xem pareto_search
+    incumbents: team (list tên) của các lần solve trước, chấm lại làm seed
+    checkpoint: token result.stats()["checkpoint"] của lần chạy bị cắt giờ
+                trước đó (cùng request), duyệt tiếp phần cây còn lại
+                (mode exact / vector, luôn chạy 1 worker); token sai => InvalidCheckpoint
+    tt_memory_mb: RAM cho transposition table của DFS (exact / vector), 0 = tắt
+    top_k: số team giữ lại (mode pareto bỏ qua), vd session giữ sâu hơn để
+           solve lại sau khi thu hẹp ràng buộc mà không cần search
+    """
+    if catalog is None:
+        catalog = get_catalog()
+    pool, tails = prepare_pool(
+        rules, max_team, forced, banned, emblems, catalog,
+        unique_signature, diversity, mode, top_k,
+    )
+
+    start = None
+    if mode not in ("beam", "pareto"):
+        start = warm_start(pool, max_team, top_k, incumbents)
+
+    resume = None
+    if checkpoint is not None:
+        resume, seen = load_checkpoint(
+            pool, max_team, checkpoint, mode, unique_signature, diversity, top_k
+        )
+        start = start + seen
+
+    if mode == "pareto":
+        result = pareto_search(
+            pool,
+            max_team,
+            time_limit,
+            higher_tiers(pool, catalog.traits),
+            cancel=cancel,
+            on_improve=serialized_front(rules, pool, on_improve),
+            node_limit=node_limit,
+        )
+    elif mode == "beam":
+        result = beam_result(
+            pool, max_team, beam_width, top_k, time_limit, cancel=cancel
+        )
+    elif mode == "anneal" and workers > 1:
+        result = parallel_anneal(
+            pool,
+            max_team,
+            time_limit,
+            top_k,
+            workers,
+            seed=seed,
+            cancel=cancel,
+            node_limit=node_limit,
+            start=start,
+        )
+    elif mode == "anneal":
+        result = anneal(
+            pool,
+            max_team,
+            time_limit,
+            top_k,
+            seed=seed,
+            cancel=cancel,
+            on_improve=serialized(rules, pool, on_improve),
+            node_limit=node_limit,
+            start=start,
+        )
+    elif workers > 1 and resume is None:
+        result = parallel_search(
+            pool,
+            max_team,
+            time_limit,
+            top_k,
+            workers,
+            cancel=cancel,
+            node_limit=node_limit,
+            unique_signature=unique_signature,
+            diversity=diversity,
+            seed=start,
+            tails=tails,
+            tt_memory_mb=tt_memory_mb,
+        )
+    else:
+        result = search(
+            pool,
+            max_team,
+            time_limit,
+            top_k,
+            cancel=cancel,
+            on_improve=serialized(rules, pool, on_improve),
+            node_limit=node_limit,
+            unique_signature=unique_signature,
+            diversity=diversity,
+            seed=start,
+            on_progress=on_progress,
+            resume=resume,
+            tails=tails,
+            tt_memory_mb=tt_memory_mb,
+        )
+
+    result.best = [
+        dict(entry, team=rules.serialize_team(entry["team"]))
+        for entry in result.best
+    ]
+    result.reduction = reduction_stats(pool)
+    return result
+
+
+def solve(
+    rules: Rules,
+    max_team: int,
+    time_limit: float,
+    forced: List[str],
+    banned: List[str],
+    emblems: Dict[str, int],
+    workers: int = 1,
+    node_limit: int | None = None,
+):
+    return run(
+        rules,
+        max_team,
+        time_limit,
+        forced,
+        banned,
+        emblems,
+        workers,
+        node_limit=node_limit,
+    ).best
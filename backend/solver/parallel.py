@@ -0,0 +1,180 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
+from backend.solver.compiled import CompiledPool
+from backend.solver.search import SearchResult, search, to_best
+from backend.solver.topk import merge
+from backend.solver.transposition import TT_MEMORY_MB
+
+
+# số subproblem mỗi worker, đủ để cân tải khi các cây con lệch nhau
+TASKS_PER_WORKER = 8
+
+_shared = None
+
+
+def _init_worker(shared):
+    global _shared
+    _shared = shared
+
+
+def _run_task(
+    pool, max_team, deadline, top_k, prefix, start_index, cancel, node_limit,
+    unique_signature, diversity, seed, tails, tt_memory_mb,
+):
+    return search(
+        pool,
+        max_team,
+        max(0.0, deadline - time.time()),
+        top_k,
+        prefix=prefix,
+        start_index=start_index,
+        shared=_shared,
+        cancel=cancel,
+        node_limit=node_limit,
+        unique_signature=unique_signature,
+        diversity=diversity,
+        seed=seed,
+        tails=tails,
+        tt_memory_mb=tt_memory_mb,
+    )
+
+
+# ===== SPLIT =====
+def split_prefixes(pool: CompiledPool, max_team: int, workers: int) -> Tuple[List[tuple], int]:
+    """
+    Chia cây theo các quyết định take/skip đầu tiên trên remain.
+    Trả về (danh sách prefix, depth) với prefix là tuple index đã TAKE
+    trong remain[:depth].
+    Prefix lấy tướng tương đương sai thứ tự (xem prev_equiv) bị bỏ.
+    """
+    slots = max_team - len(pool.forced)
+    depth = 0
+    while (
+        depth < len(pool.remain)
+        and 2 ** depth < workers * TASKS_PER_WORKER
+    ):
+        depth += 1
+
+    prev_equiv = pool.prev_equiv or [-1] * len(pool.remain)
+    prefixes = [()]
+    for i in range(depth):
+        prev = prev_equiv[i]
+        prefixes = [
+            p + (i,) for p in prefixes
+            if len(p) < slots and (prev < 0 or prev in p)
+        ] + prefixes
+    return prefixes, depth
+
+
+# ===== PARALLEL SEARCH =====
+def parallel_search(
+    pool: CompiledPool,
+    max_team: int,
+    time_limit: float,
+    top_k: int,
+    workers: int,
+    cancel=None,
+    node_limit: int | None = None,
+    unique_signature: bool = False,
+    diversity: int = 0,
+    seed=None,
+    tails=None,
+    tt_memory_mb: float = TT_MEMORY_MB,
+) -> SearchResult:
+    """
+    Chạy các cây con trên process pool, dùng chung điểm thứ k tốt nhất để
+    mọi worker prune theo bound toàn cục. Khi chạy hết cây, kết quả
+    giống hệt search() tuần tự.
+    node_limit được chia đều cho các cây con.
+    seed (warm start) và tails (mode vector) được đưa cho mọi cây con,
+    mỗi cây con có transposition table riêng tt_memory_mb.
+    """
+    start = time.time()
+    deadline = start + time_limit
+    prefixes, depth = split_prefixes(pool, max_team, workers)
+    task_limit = None
+    if node_limit is not None:
+        task_limit = -(-node_limit // len(prefixes))
+    shared = multiprocessing.Value("i", 0, lock=False)
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(shared,),
+    ) as executor:
+        futures = [
+            executor.submit(
+                _run_task,
+                pool,
+                max_team,
+                deadline,
+                top_k,
+                prefix,
+                depth,
+                cancel,
+                task_limit,
+                unique_signature,
+                diversity,
+                seed,
+                tails,
+                tt_memory_mb,
+            )
+            for prefix in prefixes
+        ]
+        parts = [f.result() for f in futures]
+
+    entries = merge(
+        pool,
+        [p.entries for p in parts],
+        top_k,
+        unique_signature=unique_signature,
+        diversity=diversity,
+    )
+    pruned = {}
+    tt = {}
+    vector = {}
+    for p in parts:
+        for reason, cnt in p.pruned.items():
+            pruned[reason] = pruned.get(reason, 0) + cnt
+        # mỗi cây con có bảng riêng, cộng dồn thống kê
+        for name, cnt in p.tt.items():
+            tt[name] = tt.get(name, 0) + cnt
+        for name, cnt in p.vector.items():
+            vector[name] = vector.get(name, 0) + cnt
+
+    # lý do dừng: ưu tiên hủy > hết giờ > hết node
+    reasons = {p.stop_reason for p in parts}
+    stop_reason = next(
+        (r for r in ("cancelled", "time", "nodes") if r in reasons), None
+    )
+    found_at = None
+    if entries:
+        found_at = next(
+            (p.found_at for p in parts if p.entries and p.entries[0] == entries[0]),
+            None,
+        )
+
+    # cận trên toàn cục = max cận của từng cây con (cây con đã xong thì
+    # cận = team #1 của nó <= team #1 chung)
+    bounds = [p.upper_bound for p in parts if p.upper_bound is not None]
+    if entries:
+        bounds.append(-entries[0][0])
+
+    return SearchResult(
+        best=to_best(pool, entries),
+        completed=all(p.completed for p in parts),
+        nodes=sum(p.nodes for p in parts),
+        pruned=pruned,
+        entries=entries,
+        stop_reason=stop_reason,
+        max_depth=max(p.max_depth for p in parts),
+        started=start,
+        elapsed=time.time() - start,
+        found_at=found_at,
+        tt=tt,
+        upper_bound=max(bounds) if bounds else None,
+        vector=vector,
+    )
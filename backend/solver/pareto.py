@@ -0,0 +1,325 @@
+import heapq
+import time
+from typing import Callable, Dict, List, Tuple
+
+from backend.models.trait import Trait
+from backend.solver.compiled import CompiledPool
+from backend.solver.search import CHECK_EVERY, EPS, SearchResult
+
+
+# ===== OBJECTIVES =====
+def higher_tiers(pool: CompiledPool, traits: Dict[str, Trait]) -> List[Tuple[int, ...]]:
+    """
+    Các mốc cao hơn mốc tính điểm (need) của từng trait trong pool,
+    vd Đấu Sĩ [2, 4, 6] với need 2 => (4, 6).
+    """
+    return [
+        tuple(sorted(th for th in traits[name].thresholds if th > need))
+        for name, need in zip(pool.trait_names, pool.need)
+    ]
+
+
+# (score, total_cost, tiers, chosen)
+Point = Tuple[int, int, int, Tuple[int, ...]]
+
+
+class ParetoFront:
+    """
+    Các team không bị trội theo 3 mục tiêu: score cao, total_cost thấp,
+    tiers cao. Mỗi vector mục tiêu chỉ giữ 1 team (team tìm thấy trước).
+    """
+
+    def __init__(self):
+        self.points: List[Point] = []
+
+    def __len__(self):
+        return len(self.points)
+
+    def covers(self, score: int, total_cost: int, tiers: int) -> bool:
+        """Có điểm nào không kém (score, total_cost, tiers) ở cả 3 mục tiêu"""
+        for s, c, t, _ in self.points:
+            if s >= score and c <= total_cost and t >= tiers:
+                return True
+        return False
+
+    def add(self, score: int, total_cost: int, tiers: int, chosen: Tuple[int, ...]) -> bool:
+        """Trả về True nếu front thay đổi"""
+        if self.covers(score, total_cost, tiers):
+            return False
+        self.points = [
+            p for p in self.points
+            if not (score >= p[0] and total_cost <= p[1] and tiers >= p[2])
+        ]
+        self.points.append((score, total_cost, tiers, chosen))
+        return True
+
+    def entries(self) -> List[Point]:
+        """score giảm dần, cùng score thì rẻ hơn trước"""
+        return sorted(self.points, key=lambda p: (-p[0], p[1], -p[2], p[3]))
+
+
+def to_front(pool: CompiledPool, points: List[Point]) -> List[dict]:
+    return [
+        {
+            "score": score,
+            "total_cost": total_cost,
+            "tiers": tiers,
+            "team_size": len(pool.forced) + len(chosen),
+            "team": pool.forced + [pool.remain[j] for j in chosen],
+        }
+        for score, total_cost, tiers, chosen in points
+    ]
+
+
+# ===== PARETO SEARCH =====
+def pareto_search(
+    pool: CompiledPool,
+    max_team: int,
+    time_limit: float,
+    tiers_of: List[Tuple[int, ...]],
+    cancel=None,
+    on_improve: Callable[[List[Point]], None] | None = None,
+    node_limit: int | None = None,
+) -> SearchResult:
+    """
+    1 lần DFS take/skip cho cả Pareto front của các board đủ max_team tướng
+    (thiếu tướng thì luôn rẻ hơn nên front sẽ toàn board thiếu) theo:
+    - score: như search() (mốc đầu, trọng số của solver)
+    - total_cost: càng thấp càng tốt
+    - tiers: mỗi mốc cao hơn need đạt được cộng weight của trait (higher_tiers)
+
+    Prune cây con khi điểm lý tưởng của nó (score cao nhất, cost thấp nhất,
+    tiers cao nhất có thể) đã bị 1 điểm trên front phủ: mọi board trong cây
+    con đều bị trội (hoặc trùng vector) => front vẫn chính xác.
+    Pool rút gọn bằng reduce_front_pool, không phải reduce_pool (dominance ở
+    đó chỉ đúng cho top-k); nhóm tương đương giữ nguyên mọi mục tiêu nên
+    duyệt như search() (chỉ lấy c tướng đầu nhóm).
+    """
+    need = pool.need
+    weight = pool.weight
+    champ_traits = pool.champ_traits
+    cost = pool.cost
+    tank = pool.tank
+    carry = pool.carry
+    prev_equiv = pool.prev_equiv or [-1] * len(pool.remain)
+    min_tank = pool.min_tank
+    min_carry = pool.min_carry
+
+    n = len(pool.remain)
+    trait_ids = range(len(need))
+    counts = list(pool.base_counts)
+    slots = max(0, min(max_team - len(pool.forced), n))
+
+    # tier_at[t][c] = số mốc cao của trait t đạt được khi count = c
+    most = max(pool.base_counts, default=0) + slots
+    tier_at = [
+        [sum(1 for th in tiers_of[t] if th <= c) for c in range(most + 1)]
+        for t in trait_ids
+    ]
+
+    # supply[i][t] = số tướng có trait t trong remain[i:]
+    supply = [[0] * len(need) for _ in range(n + 1)]
+    for i in range(n - 1, -1, -1):
+        row = list(supply[i + 1])
+        for t in champ_traits[i]:
+            row[t] += 1
+        supply[i] = row
+
+    # tank_left[i] / carry_left[i] = số tướng tank / carry trong remain[i:]
+    tank_left = [0] * (n + 1)
+    carry_left = [0] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        tank_left[i] = tank_left[i + 1] + tank[i]
+        carry_left[i] = carry_left[i + 1] + carry[i]
+
+    # min_cost[i][r] = tổng cost của r tướng rẻ nhất trong remain[i:],
+    # role_cost[i][r] = như vậy nhưng chỉ xét tướng có role (tank / carry)
+    def cheapest(costs, size):
+        costs = sorted(costs)
+        row = [0]
+        for r in range(size):
+            row.append(row[-1] + (costs[r] if r < len(costs) else 0))
+        return row
+
+    roles = max(min_tank, min_carry)
+    min_cost = [cheapest(cost[i:], slots) for i in range(n + 1)]
+    role_cost = [
+        cheapest([cost[j] for j in range(i, n) if tank[j] or carry[j]], roles)
+        for i in range(n + 1)
+    ]
+
+    gain = [0.0] * len(need)
+    pruned = {"size": 0, "role": 0, "dominated": 0}
+    front = ParetoFront()
+    chosen: List[int] = []
+    in_team = [False] * n
+
+    start = time.time()
+    stop_reason = None
+    nodes = 0
+    max_depth = 0
+    found_at = None
+    dirty = False
+    if node_limit is None:
+        node_limit = float("inf")
+
+    def score_bound(i, remain_slot):
+        """Như upper_bound + knapsack_bound của search()"""
+        left = supply[i]
+        ub = 0
+        for t in trait_ids:
+            missing = need[t] - counts[t]
+            if 0 < missing <= remain_slot and left[t] >= missing:
+                ub += weight[t]
+                gain[t] = weight[t] / missing
+            else:
+                gain[t] = 0.0
+        values = []
+        for j in range(i, n):
+            v = 0.0
+            for t in champ_traits[j]:
+                v += gain[t]
+            if v:
+                values.append(v)
+        if len(values) > remain_slot:
+            values = heapq.nlargest(remain_slot, values)
+        return min(ub, int(sum(values) + EPS))
+
+    def cost_bound(i, remain_slot):
+        """
+        Cost thấp nhất của remain_slot tướng còn lại: còn thiếu k tank / carry
+        thì >= k tướng có role (thường đắt hơn) + remain_slot - k tướng bất kỳ
+        """
+        k = min(max(min_tank - tanks, min_carry - carries, 0), remain_slot)
+        return role_cost[i][k] + min_cost[i][remain_slot - k]
+
+    def tier_bound(i, remain_slot):
+        """Mốc cao còn đạt thêm được nếu mọi slot còn lại dồn vào từng trait"""
+        left = supply[i]
+        ub = 0
+        for t in trait_ids:
+            if tiers_of[t]:
+                c = counts[t]
+                ub += weight[t] * (tier_at[t][c + min(remain_slot, left[t])] - tier_at[t][c])
+        return ub
+
+    def notify():
+        nonlocal dirty
+        if dirty and on_improve is not None:
+            on_improve(front.entries())
+        dirty = False
+
+    # ===== DFS (STACK) =====
+    # frame: [i, score, total_cost, tiers, tanks, carries, took]
+    stack: List[list] = []
+    i = 0
+    score = pool.base_score
+    total_cost = pool.base_cost
+    tiers = sum(weight[t] * tier_at[t][counts[t]] for t in trait_ids)
+    tanks = pool.base_tank
+    carries = pool.base_carry
+
+    descend = True
+    while True:
+        if descend:
+            if nodes >= node_limit:
+                stop_reason = "nodes"
+                break
+            if nodes % CHECK_EVERY == 0:
+                if time.time() - start > time_limit:
+                    stop_reason = "time"
+                    break
+                if cancel is not None and cancel.is_set():
+                    stop_reason = "cancelled"
+                    break
+                notify()
+            nodes += 1
+            if i > max_depth:
+                max_depth = i
+
+            remain_slot = slots - len(chosen)
+            if remain_slot == 0:
+                if tanks >= min_tank and carries >= min_carry:
+                    if front.add(score, total_cost, tiers, tuple(chosen)):
+                        dirty = True
+                        found_at = time.time()
+                descend = False
+                continue
+
+            if n - i < remain_slot:
+                pruned["size"] += 1
+                descend = False
+                continue
+            if (
+                tanks + min(remain_slot, tank_left[i]) < min_tank
+                or carries + min(remain_slot, carry_left[i]) < min_carry
+            ):
+                pruned["role"] += 1
+                descend = False
+                continue
+            if front.covers(
+                score + score_bound(i, remain_slot),
+                total_cost + cost_bound(i, remain_slot),
+                tiers + tier_bound(i, remain_slot),
+            ):
+                pruned["dominated"] += 1
+                descend = False
+                continue
+
+            # ===== TAKE =====
+            # tướng tương đương chỉ được lấy khi tướng đứng trước nó đã được lấy
+            prev = prev_equiv[i]
+            took = prev < 0 or in_team[prev]
+            stack.append([i, score, total_cost, tiers, tanks, carries, took])
+            if not took:
+                i += 1
+                continue
+            for t in champ_traits[i]:
+                c = counts[t] + 1
+                counts[t] = c
+                if c == need[t]:
+                    score += weight[t]
+                if c < len(tier_at[t]):
+                    tiers += weight[t] * (tier_at[t][c] - tier_at[t][c - 1])
+            chosen.append(i)
+            in_team[i] = True
+            total_cost += cost[i]
+            tanks += tank[i]
+            carries += carry[i]
+            i += 1
+            continue
+
+        # ===== RETURN =====
+        if not stack:
+            break
+        frame = stack[-1]
+        if frame[6]:
+            # ===== ROLLBACK + SKIP =====
+            i, score, total_cost, tiers, tanks, carries, _ = frame
+            for t in champ_traits[i]:
+                counts[t] -= 1
+            chosen.pop()
+            in_team[i] = False
+            frame[6] = False
+            i += 1
+            descend = True
+            continue
+        stack.pop()
+
+    notify()
+    points = front.entries()
+    completed = stop_reason is None
+    return SearchResult(
+        best=to_front(pool, points),
+        completed=completed,
+        nodes=nodes,
+        pruned=pruned,
+        entries=[(-s, -c, chosen) for s, c, _, chosen in points],
+        stop_reason=stop_reason,
+        max_depth=max_depth,
+        started=start,
+        elapsed=time.time() - start,
+        found_at=found_at,
+        # xong cả cây thì điểm cao nhất trên front là tối ưu theo score
+        upper_bound=points[0][0] if completed and points else None,
+    )
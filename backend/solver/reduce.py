@@ -0,0 +1,133 @@
+from dataclasses import replace
+from typing import Dict, List
+
+from backend.solver.compiled import CompiledPool
+
+
+# ===== DOMINANCE =====
+def dominated(pool: CompiledPool, max_team: int, top_k: int) -> List[int]:
+    """
+    Tướng u bị trội bởi v nếu v có đủ trait của u (trait tính điểm), role
+    không kém và cost cao hơn hẳn: thay u bằng v thì điểm không giảm, cost
+    tăng => team mới xếp trên hẳn.
+
+    Team chứa u có tối đa slots - 1 tướng khác, nên nếu u bị trội bởi
+    >= top_k + slots - 1 tướng thì luôn có >= top_k team tốt hơn hẳn
+    => u không bao giờ lọt top-k, bỏ đi vẫn giữ kết quả chính xác.
+    """
+    slots = max_team - len(pool.forced)
+    enough = top_k + slots - 1
+    traits = [frozenset(t) for t in pool.champ_traits]
+    cost, tank, carry = pool.cost, pool.tank, pool.carry
+
+    out = []
+    for u in range(len(pool.remain)):
+        count = 0
+        for v in range(len(pool.remain)):
+            if (
+                cost[v] > cost[u]
+                and tank[v] >= tank[u]
+                and carry[v] >= carry[u]
+                and traits[u] <= traits[v]
+            ):
+                count += 1
+                if count >= enough:
+                    out.append(u)
+                    break
+    return out
+
+
+def front_dominated(pool: CompiledPool, max_team: int) -> List[int]:
+    """
+    Như dominated() cho Pareto front (score / cost / tiers): v trội u nếu v
+    có đủ trait của u, role không kém, cost không cao hơn và không tương
+    đương u. Thay u bằng v không làm mục tiêu nào tệ đi (tiers chỉ tăng theo
+    count), v trội u thì mọi tướng trội v cũng trội u.
+
+    Team chứa u có slots - 1 tướng khác, nên nếu u bị trội bởi >= slots tướng
+    thì luôn đổi được u lấy 1 tướng trội ngoài team, lặp tới khi team không
+    còn tướng bị bỏ => front giữ nguyên các vector mục tiêu.
+    """
+    slots = max_team - len(pool.forced)
+    keys = [equivalence_key(pool, j) for j in range(len(pool.remain))]
+    traits = [frozenset(t) for t in pool.champ_traits]
+    cost, tank, carry = pool.cost, pool.tank, pool.carry
+
+    out = []
+    for u in range(len(pool.remain)):
+        count = 0
+        for v in range(len(pool.remain)):
+            if (
+                keys[v] != keys[u]
+                and cost[v] <= cost[u]
+                and tank[v] >= tank[u]
+                and carry[v] >= carry[u]
+                and traits[u] <= traits[v]
+            ):
+                count += 1
+                if count >= slots:
+                    out.append(u)
+                    break
+    return out
+
+
+# ===== SYMMETRY =====
+def equivalence_key(pool: CompiledPool, j: int) -> tuple:
+    """2 tướng cùng key thì đổi chỗ cho nhau không làm đổi score / cost / role"""
+    return (
+        tuple(sorted(pool.champ_traits[j])),
+        pool.tank[j],
+        pool.carry[j],
+        pool.cost[j],
+    )
+
+
+def reduce_pool(pool: CompiledPool, max_team: int, top_k: int) -> CompiledPool:
+    """
+    Rút gọn remain trước khi DFS:
+    - bỏ tướng bị trội (xem dominated)
+    - gom tướng tương đương thành nhóm: DFS chỉ được lấy c tướng ĐẦU của
+      nhóm (prev_equiv), tức là rẽ nhánh theo "lấy bao nhiêu tướng trong
+      nhóm"; các cách chọn khác được sinh lại lúc lưu kết quả
+    Thứ tự duyệt giữ nguyên. Chỉ dùng với top-k mặc định (không lọc).
+    """
+    return drop_and_group(pool, dominated(pool, max_team, top_k))
+
+
+def reduce_front_pool(pool: CompiledPool, max_team: int) -> CompiledPool:
+    """Như reduce_pool cho mode pareto (bỏ tướng theo front_dominated)"""
+    return drop_and_group(pool, front_dominated(pool, max_team))
+
+
+def drop_and_group(pool: CompiledPool, dropped: List[int]) -> CompiledPool:
+    drop = set(dropped)
+    keep = [j for j in range(len(pool.remain)) if j not in drop]
+
+    reduced = replace(
+        pool,
+        remain=[pool.remain[j] for j in keep],
+        champ_traits=[pool.champ_traits[j] for j in keep],
+        cost=[pool.cost[j] for j in keep],
+        tank=[pool.tank[j] for j in keep],
+        carry=[pool.carry[j] for j in keep],
+        dropped=pool.dropped + [pool.remain[j] for j in sorted(drop)],
+    )
+
+    groups: Dict[tuple, List[int]] = {}
+    prev_equiv = []
+    for j in range(len(reduced.remain)):
+        members = groups.setdefault(equivalence_key(reduced, j), [])
+        prev_equiv.append(members[-1] if members else -1)
+        members.append(j)
+
+    reduced.prev_equiv = prev_equiv
+    reduced.classes = [tuple(m) for m in groups.values() if len(m) > 1]
+    return reduced
+
+
+def reduction_stats(pool: CompiledPool) -> Dict[str, int]:
+    return {
+        "dropped": len(pool.dropped),
+        "classes": len(pool.classes),
+        "remain": len(pool.remain),
+    }
@@ -0,0 +1,15 @@
+from backend.solver import bronze, ryze
+
+
+# ===== SOLVERS =====
+# mode của API / job / bench / precompute -> module solver (run, serialize_team...)
+SOLVERS = {
+    "bronze": bronze,
+    "ryze": ryze,
+}
+
+
+# ===== DEFAULT BOARD =====
+# board mặc định của app desktop, /config/defaults, bench và index build sẵn
+DEFAULT_FORCED = ["Ryze", "Ahri"]
+DEFAULT_BANNED = ["Aatrox", "Aphelios", "Zoe", "Leona", "Diana", "Aurelion Sol"]
@@ -1,19 +1,16 @@
 import json
-import time
 from typing import List, Dict
 
 from backend.models.champion import Champion
 from backend.models.trait import Trait
+from backend.solver import engine
+from backend.solver.catalog import Catalog
+from backend.solver.compiled import CompiledPool
+from backend.solver.search import SearchResult
 from backend.solver.utils import resource_path
 
 
 # ================= CONFIG =================
-TOP_K = 5
-
-MIN_TANK = 2
-MIN_CARRY = 2
-MIN_COST = 4
-
 TARGON_TRAIT = "Targon"
 IGNORED_TRAITS = {"Darkin"}
 
@@ -22,30 +19,6 @@ CLASS_WEIGHT = 1
 
 
 # ================= LOAD DATA =================
-def load_champions(banned: List[str], path: str | None = None) -> List[Champion]:
-    if path is None:
-        path = resource_path("data/champions.json")
-
-    with open(path, encoding="utf-8") as f:
-        raw = json.load(f)
-
-    champions = []
-    for c in raw:
-        if c["name"] in banned:
-            continue
-
-        champions.append(
-            Champion(
-                name=c["name"],
-                cost=c["cost"],
-                traits=c["traits"],
-                roles=c.get("roles", []),
-                locked=c.get("locked", False),
-            )
-        )
-    return champions
-
-
 def load_traits(path: str | None = None) -> Dict[str, Trait]:
     if path is None:
         path = resource_path("data/traits.json")
@@ -68,6 +41,12 @@ def trait_need(trait_name: str, trait: Trait) -> int | float:
     return min(trait.thresholds)
 
 
+def trait_weight(trait_name: str, trait: Trait) -> int:
+    if trait_name in IGNORED_TRAITS:
+        return 0
+    return ORIGIN_WEIGHT if trait.type == "origin" else CLASS_WEIGHT
+
+
 # ================= HEURISTICS =================
 def champion_value(champ: Champion, traits: Dict[str, Trait]) -> float:
     score = 0.0
@@ -81,35 +60,6 @@ def champion_value(champ: Champion, traits: Dict[str, Trait]) -> float:
     return score
 
 
-def upper_bound(trait_counts, traits, remain):
-    score = 0
-    for t, tr in traits.items():
-        if t in IGNORED_TRAITS:
-            continue
-
-        cur = trait_counts.get(t, 0)
-        need = trait_need(t, tr)
-
-        if cur < need and need - cur <= remain:
-            score += ORIGIN_WEIGHT if tr.type == "origin" else CLASS_WEIGHT
-    return score
-
-
-# ================= ROLE CHECK =================
-def count_roles(team: List[Champion]):
-    tank = carry = 0
-    for c in team:
-        if c.cost >= MIN_COST:
-            tank += "tank" in c.roles
-            carry += "carry" in c.roles
-    return tank, carry
-
-
-def valid_team(team: List[Champion]) -> bool:
-    tank, carry = count_roles(team)
-    return tank >= MIN_TANK and carry >= MIN_CARRY
-
-
 # ================= SERIALIZE =================
 def serialize_team(team: List[Champion]):
     return [
@@ -125,120 +75,43 @@ def serialize_team(team: List[Champion]):
 
 
 # ================= SOLVER =================
+RULES = engine.Rules(
+    name="ryze",
+    trait_need=trait_need,
+    trait_weight=trait_weight,
+    champion_value=champion_value,
+    serialize_team=serialize_team,
+)
+
+
+def build_pool(
+    forced: List[str],
+    banned: List[str],
+    emblems: Dict[str, int],
+    catalog: Catalog | None = None,
+) -> CompiledPool:
+    return engine.build_pool(RULES, forced, banned, emblems, catalog)
+
+
+def run(*args, **kwargs) -> SearchResult:
+    """engine.run với luật ryze, xem engine.run"""
+    return engine.run(RULES, *args, **kwargs)
+
+
+def check_checkpoint(*args, **kwargs):
+    """engine.check_checkpoint với luật ryze"""
+    engine.check_checkpoint(RULES, *args, **kwargs)
+
+
 def solve(
     max_team: int,
     time_limit: float,
     forced: List[str],
     banned: List[str],
     emblems: Dict[str, int],
+    workers: int = 1,
+    node_limit: int | None = None,
 ):
-    traits = load_traits()
-    champions = load_champions(banned)
-
-    champions.sort(
-        key=lambda c: champion_value(c, traits),
-        reverse=True,
+    return engine.solve(
+        RULES, max_team, time_limit, forced, banned, emblems, workers, node_limit
     )
-
-    forced_champs = [c for c in champions if c.name in forced]
-    remain = [c for c in champions if c.name not in forced]
-
-    trait_counts = dict(emblems)
-    team: List[Champion] = []
-    active_score = 0
-    best = []
-
-    start = time.time()
-
-    # ===== INIT FORCED =====
-    for c in forced_champs:
-        team.append(c)
-        for t in c.traits:
-            if t in IGNORED_TRAITS:
-                continue
-
-            before = trait_counts.get(t, 0)
-            trait_counts[t] = before + 1
-            need = trait_need(t, traits[t])
-
-            if before < need <= trait_counts[t]:
-                active_score += (
-                    ORIGIN_WEIGHT if traits[t].type == "origin" else CLASS_WEIGHT
-                )
-
-    # ===== SAVE =====
-    def save():
-        best.append(
-            {
-                "score": active_score,
-                "total_cost": sum(c.cost for c in team),
-                "team_size": len(team),
-                "team": serialize_team(team),
-            }
-        )
-        best.sort(
-            key=lambda x: (x["score"], x["total_cost"]),
-            reverse=True,
-        )
-        del best[TOP_K:]
-
-    # ===== DFS =====
-    def dfs(i):
-        nonlocal active_score
-
-        if time.time() - start > time_limit:
-            return
-
-        remain_slot = max_team - len(team)
-        best_score = best[0]["score"] if best else 0
-
-        if active_score + upper_bound(trait_counts, traits, remain_slot) < best_score:
-            return
-
-        tank, carry = count_roles(team)
-        if tank + remain_slot < MIN_TANK or carry + remain_slot < MIN_CARRY:
-            return
-
-        if valid_team(team):
-            save()
-
-        if i >= len(remain) or remain_slot == 0:
-            return
-
-        c = remain[i]
-
-        # ===== TAKE =====
-        team.append(c)
-        added = 0
-        updated = []
-
-        for t in c.traits:
-            if t in IGNORED_TRAITS:
-                continue
-
-            before = trait_counts.get(t, 0)
-            trait_counts[t] = before + 1
-            need = trait_need(t, traits[t])
-
-            if before < need <= trait_counts[t]:
-                added += (
-                    ORIGIN_WEIGHT if traits[t].type == "origin" else CLASS_WEIGHT
-                )
-            updated.append(t)
-
-        active_score += added
-        dfs(i + 1)
-
-        # ===== ROLLBACK =====
-        active_score -= added
-        for t in updated:
-            trait_counts[t] -= 1
-            if trait_counts[t] == 0:
-                del trait_counts[t]
-        team.pop()
-
-        # ===== SKIP =====
-        dfs(i + 1)
-
-    dfs(0)
-    return best
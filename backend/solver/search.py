@@ -0,0 +1,629 @@
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Sequence
+
+from backend.solver.checkpoint import Checkpoint, InvalidCheckpoint, pool_fingerprint
+from backend.solver.compiled import CompiledPool
+from backend.solver.topk import Entry, TopK, activation_signature
+from backend.solver.transposition import TT_MEMORY_MB, TT_MIN_NODES, TranspositionTable, Zobrist
+
+
+# ===== RESULT =====
+@dataclass
+class SearchResult:
+    best: List[dict]      # {"score", "total_cost", "team_size", "team": List[Champion]}
+    completed: bool       # False nếu bị cắt bởi time_limit / node_limit / hủy
+    nodes: int
+    pruned: Dict[str, int] = field(default_factory=dict)
+    entries: List[tuple] = field(default_factory=list)
+
+    stop_reason: str | None = None   # "time" | "nodes" | "cancelled"
+    max_depth: int = 0               # index sâu nhất trong remain đã duyệt
+    started: float = 0.0
+    elapsed: float = 0.0
+    found_at: float | None = None    # thời điểm team #1 đổi lần cuối
+    reduction: Dict[str, int] = field(default_factory=dict)   # xem reduce_pool
+    tt: Dict[str, int] = field(default_factory=dict)          # xem TranspositionTable
+    # cận trên đã chứng minh của điểm team #1 (kể cả phần cây chưa duyệt)
+    upper_bound: int | None = None
+    checkpoint: Checkpoint | None = None   # điểm dừng để resume, None nếu xong
+    resumed_nodes: int = 0                 # node đã duyệt ở các lần chạy trước
+    vector: Dict[str, int] = field(default_factory=dict)      # xem TailBlocks
+
+    @property
+    def cancelled(self) -> bool:
+        return self.stop_reason == "cancelled"
+
+    @property
+    def gap(self) -> int | None:
+        """Số điểm team #1 có thể còn thiếu so với tối ưu, None nếu chưa có team"""
+        if not self.entries or self.upper_bound is None:
+            return None
+        return max(0, self.upper_bound + self.entries[0][0])
+
+    @property
+    def proven_optimal(self) -> bool:
+        """Điểm team #1 là tối ưu (top-k phía sau chỉ chính xác khi completed)"""
+        return self.completed or self.gap == 0
+
+    def stats(self) -> dict:
+        return {
+            "nodes": self.nodes,
+            "nodes_per_sec": round(self.nodes / self.elapsed) if self.elapsed else 0,
+            "pruned": dict(self.pruned),
+            "max_depth": self.max_depth,
+            "elapsed": round(self.elapsed, 4),
+            "time_to_best": (
+                round(self.found_at - self.started, 4)
+                if self.found_at is not None else None
+            ),
+            "completed": self.completed,
+            "stop_reason": self.stop_reason,
+            "upper_bound": self.upper_bound,
+            "gap": self.gap,
+            "proven_optimal": self.proven_optimal,
+            "reduction": dict(self.reduction),
+            "tt": dict(self.tt),
+            "resumed_nodes": self.resumed_nodes,
+            "vector": dict(self.vector),
+            "checkpoint": self.checkpoint.token() if self.checkpoint else None,
+        }
+
+
+# sai số khi so sánh bound dạng phân số
+EPS = 1e-9
+
+# time.time() / cancel.is_set() (có thể là IPC) chỉ kiểm tra mỗi N node
+CHECK_EVERY = 256
+
+# số cách chọn tướng tương đương tối đa sinh lại cho 1 team
+EXPAND_LIMIT = 64
+
+
+def to_best(pool: CompiledPool, entries: List[Entry]) -> List[dict]:
+    return [
+        {
+            "score": -neg_score,
+            "total_cost": -neg_cost,
+            "team_size": len(pool.forced) + len(chosen),
+            "team": pool.forced + [pool.remain[j] for j in chosen],
+        }
+        for neg_score, neg_cost, chosen in entries
+    ]
+
+
+# ===== DFS ENGINE =====
+def search(
+    pool: CompiledPool,
+    max_team: int,
+    time_limit: float,
+    top_k: int,
+    prefix: Sequence[int] = (),
+    start_index: int = 0,
+    shared=None,
+    cancel=None,
+    on_improve: Callable[[List[Entry]], None] | None = None,
+    node_limit: int | None = None,
+    unique_signature: bool = False,
+    diversity: int = 0,
+    tt_memory_mb: float = TT_MEMORY_MB,
+    seed: List[Entry] | None = None,
+    on_progress: Callable[[int, float], None] | None = None,
+    resume: Checkpoint | None = None,
+    tails=None,
+) -> SearchResult:
+    """
+    DFS take/skip trên CompiledPool (stack tường minh, xem explore).
+    Trạng thái chỉ gồm mảng đếm trait + vài số nguyên, rollback bằng phép trừ.
+
+    Kết quả là top_k chính xác theo (score, total_cost): chỉ prune khi bound
+    < điểm của entry thứ k, nên mọi cách chia cây con đều cho cùng kết quả.
+    - prefix / start_index: chỉ duyệt cây con đã chọn sẵn prefix
+      trong remain[:start_index] (dùng cho parallel search)
+    - shared: giá trị dùng chung (multiprocessing.Value) giữ điểm thứ k
+      tốt nhất mà các worker khác đã tìm được
+    - cancel: object có is_set() (threading/multiprocessing Event), dừng sớm
+    - on_improve(entries): gọi mỗi khi top_k thay đổi
+    - on_progress(nodes, elapsed): gọi mỗi CHECK_EVERY node (thanh tiến trình)
+    - node_limit: dừng sau đúng node_limit node => kết quả lặp lại được,
+      không phụ thuộc tải máy
+    - unique_signature / diversity: lọc top_k, xem TopK
+    - pool đã qua reduce_pool: tướng tương đương chỉ được lấy theo thứ tự
+      (prev_equiv), các cách chọn khác sinh lại trong save()
+    - tt_memory_mb: RAM cho transposition table, 0 = tắt
+    - seed: các team tìm sẵn (warm start), đẩy vào top_k trước khi DFS để
+      prune mạnh ngay từ đầu; kết quả vẫn chính xác vì seed là team thật
+    - resume: checkpoint của lần chạy trước (chỉ search không prefix), duyệt
+      tiếp đúng phần cây còn lại; top-k của checkpoint phải được caller
+      chấm lại và đưa vào seed (Checkpoint.entries)
+    - tails: TailBlocks (backend.solver.vector), chấm vài slot cuối theo khối
+      thay vì từng node; pool không được có nhóm tương đương, không dùng bộ lọc
+    Dừng sớm (không prefix) thì result.checkpoint giữ điểm dừng.
+    """
+    need = pool.need
+    weight = pool.weight
+    champ_traits = pool.champ_traits
+    cost = pool.cost
+    tank = pool.tank
+    carry = pool.carry
+    min_tank = pool.min_tank
+    min_carry = pool.min_carry
+
+    n = len(pool.remain)
+    trait_ids = range(len(need))
+    counts = list(pool.base_counts)
+    slots = max_team - len(pool.forced)
+
+    # supply[i][t] = số tướng có trait t trong remain[i:]
+    supply = [[0] * len(need) for _ in range(n + 1)]
+    for i in range(n - 1, -1, -1):
+        row = list(supply[i + 1])
+        for t in champ_traits[i]:
+            row[t] += 1
+        supply[i] = row
+
+    # max_cost[i][r] = tổng cost của r tướng đắt nhất trong remain[i:]
+    max_cost = []
+    for i in range(n + 1):
+        top = sorted(cost[i:], reverse=True)
+        row = [0]
+        for r in range(max(slots, 0)):
+            row.append(row[-1] + (top[r] if r < len(top) else 0))
+        max_cost.append(row)
+
+    gain = [0.0] * len(need)
+    pruned = {"trait": 0, "memo": 0, "knapsack": 0, "role": 0}
+
+    # transposition table: cùng (i, slot còn lại, count đã cap ở need,
+    # tank / carry đã cap) thì cây con giống nhau
+    tt = TranspositionTable(tt_memory_mb)
+    zobrist = Zobrist(need, n, slots, min_tank, min_carry)
+    zcounts = zobrist.counts
+    zhash = 0
+
+    # cận trên lớn nhất của các cây con chưa duyệt khi dừng sớm
+    frontier = -1
+
+    chosen: List[int] = []
+    in_team = [False] * n
+    prev_equiv = pool.prev_equiv or [-1] * n
+    class_of = [-1] * n
+    for c, members in enumerate(pool.classes):
+        for j in members:
+            class_of[j] = c
+    store = TopK(top_k, unique_signature=unique_signature, diversity=diversity)
+
+    start = time.time()
+    stop_reason = None
+    nodes = 0
+    resumed_nodes = resume.nodes if resume is not None else 0
+    max_depth = 0
+    found_at = None
+    top = None
+    if node_limit is None:
+        node_limit = float("inf")
+
+    def upper_bound(i, remain_slot):
+        """
+        Ước lượng điểm trait tối đa còn có thể kích.
+        Trait chỉ được tính nếu còn đủ slot và đủ tướng phía sau để kích.
+        Đồng thời ghi gain[t] = weight / missing cho knapsack_bound.
+        """
+        left = supply[i]
+        ub = 0
+        for t in trait_ids:
+            missing = need[t] - counts[t]
+            if 0 < missing <= remain_slot and left[t] >= missing:
+                ub += weight[t]
+                gain[t] = weight[t] / missing
+            else:
+                gain[t] = 0.0
+        return ub
+
+    def knapsack_bound(i, remain_slot):
+        """
+        Bound có tính slot dùng chung: kích trait t cần thêm missing tướng,
+        nên chia đều weight[t] cho mỗi tướng góp vào t. Tổng điểm của team
+        <= tổng giá trị remain_slot tướng tốt nhất từ i trở đi.
+        Phải gọi ngay sau upper_bound(i, remain_slot).
+        """
+        values = []
+        for j in range(i, n):
+            v = 0.0
+            for t in champ_traits[j]:
+                v += gain[t]
+            if v:
+                values.append(v)
+        if len(values) > remain_slot:
+            values = heapq.nlargest(remain_slot, values)
+        return sum(values)
+
+    def alternatives():
+        """
+        DFS chỉ lấy c tướng đầu của mỗi nhóm tương đương, sinh lại mọi
+        cách chọn c tướng trong nhóm (cùng score / cost / role).
+        """
+        touched = {class_of[j] for j in chosen if class_of[j] >= 0}
+        if not touched:
+            return [tuple(chosen)]
+        rest = [j for j in chosen if class_of[j] < 0]
+        picks = []
+        for c in sorted(touched):
+            members = pool.classes[c]
+            taken = sum(1 for j in members if in_team[j])
+            picks.append(itertools.combinations(members, taken))
+        return [
+            tuple(sorted(itertools.chain(rest, *combo)))
+            for combo in itertools.islice(itertools.product(*picks), EXPAND_LIMIT)
+        ]
+
+    # ===== SAVE RESULT =====
+    def save(score, total_cost, teams=None):
+        """teams: mặc định là team hiện tại (chosen + các cách chọn tương đương)"""
+        nonlocal found_at, top
+
+        # kiểm tra rẻ trước, chỉ tạo tuple / signature khi có thể lọt top-k
+        if not store.admits(score, total_cost):
+            return
+        signature = None
+        if unique_signature:
+            signature = frozenset(
+                t for t in trait_ids if counts[t] >= need[t]
+            )
+        changed = False
+        for team in teams if teams is not None else alternatives():
+            if not store.push(score, total_cost, team, signature):
+                continue
+            changed = True
+            entry = (-score, -total_cost, team)
+            if top is None or entry < top:
+                top = entry
+                found_at = time.time()
+        if not changed:
+            return
+
+        if shared is not None and store.full:
+            kth = store.floor()[0]
+            if kth > shared.value:
+                shared.value = kth
+
+        if on_improve is not None:
+            on_improve(store.entries())
+
+    # ===== DFS SEARCH =====
+    def current_floor():
+        floor = store.floor()[0] if store.full else 0
+        if shared is not None and shared.value > floor:
+            floor = shared.value
+        return floor
+
+    def leave_open(i, score):
+        """
+        Cây con bị bỏ dở vì dừng sớm: ghi cận trên của nó vào frontier.
+        Mọi cây con chưa duyệt đều đi qua đây đúng 1 lần khi DFS unwind.
+        """
+        nonlocal frontier
+        remain_slot = slots - len(chosen)
+        ub = upper_bound(i, remain_slot)
+        ub = min(ub, int(knapsack_bound(i, remain_slot) + EPS))
+        if score + ub > frontier:
+            frontier = score + ub
+        return -1
+
+    def take(i):
+        """Thêm remain[i] vào team, trả về điểm trait vừa kích thêm"""
+        nonlocal zhash
+        added = 0
+        for t in champ_traits[i]:
+            c = counts[t]
+            if c < need[t]:
+                zhash ^= zcounts[t][c] ^ zcounts[t][c + 1]
+            counts[t] = c + 1
+            if c + 1 == need[t]:
+                added += weight[t]
+        if class_of[i] >= 0:
+            zhash ^= zobrist.member[i]
+        chosen.append(i)
+        in_team[i] = True
+        return added
+
+    def untake(i):
+        nonlocal zhash
+        in_team[i] = False
+        chosen.pop()
+        if class_of[i] >= 0:
+            zhash ^= zobrist.member[i]
+        for t in champ_traits[i]:
+            c = counts[t] - 1
+            counts[t] = c
+            if c < need[t]:
+                zhash ^= zcounts[t][c] ^ zcounts[t][c + 1]
+
+    # frame của node đang mở trên stack:
+    # [i, score, total_cost, tanks, carries, key, first_node, found, took]
+    # found: điểm cao nhất của team hợp lệ đã gặp trong cây con (-1 nếu chưa có)
+    # took: True = đang ở nhánh TAKE (nhánh SKIP còn chờ), False = đang ở SKIP
+    stack: List[list] = []
+
+    def explore(i, score, total_cost, tanks, carries, taken):
+        """
+        DFS bằng stack tường minh (không đệ quy, không giới hạn độ sâu).
+        (i, score, ...) là node kế tiếp cần duyệt, stack có thể có sẵn các
+        frame (resume). Phải dừng giữa chừng thì trả về node đang chờ, stack
+        giữ nguyên các node đang mở; duyệt hết cây thì trả về None.
+        """
+        nonlocal nodes, stop_reason, max_depth, zhash
+
+        descend = True
+        found = -1
+        while True:
+            if descend:
+                if nodes >= node_limit:
+                    stop_reason = "nodes"
+                    return i, score, total_cost, tanks, carries, taken
+                if nodes % CHECK_EVERY == 0:
+                    elapsed = time.time() - start
+                    if elapsed > time_limit:
+                        stop_reason = "time"
+                        return i, score, total_cost, tanks, carries, taken
+                    if on_progress is not None:
+                        on_progress(nodes, elapsed)
+                    if cancel is not None and cancel.is_set():
+                        stop_reason = "cancelled"
+                        return i, score, total_cost, tanks, carries, taken
+                nodes += 1
+                if i > max_depth:
+                    max_depth = i
+
+                remain_slot = slots - len(chosen)
+                floor = 0
+                floor_cost = None
+                if store.full:
+                    floor, floor_cost = store.floor()
+                if shared is not None and shared.value > floor:
+                    floor = shared.value
+                    floor_cost = None
+
+                key = None
+                if tt.enabled:
+                    key = (
+                        zhash
+                        ^ zobrist.index[i]
+                        ^ zobrist.slot[remain_slot]
+                        ^ zobrist.tank[min(tanks, min_tank)]
+                        ^ zobrist.carry[min(carries, min_carry)]
+                    )
+
+                # prune theo trait
+                target = floor - score
+                # cost không thể vượt entry thứ k => phải hơn hẳn về điểm
+                if (
+                    floor_cost is not None
+                    and total_cost + max_cost[i][max(remain_slot, 0)] < floor_cost
+                ):
+                    target += 1
+                if target > 0:
+                    if upper_bound(i, remain_slot) < target:
+                        pruned["trait"] += 1
+                        found = -1
+                        descend = False
+                        continue
+                    if key is not None:
+                        memo = tt.get(key)
+                        if memo is not None and memo < target:
+                            tt.cuts += 1
+                            pruned["memo"] += 1
+                            found = -1
+                            descend = False
+                            continue
+                    if knapsack_bound(i, remain_slot) < target - EPS:
+                        pruned["knapsack"] += 1
+                        found = -1
+                        descend = False
+                        continue
+
+                # prune theo role
+                if tanks + remain_slot < min_tank or carries + remain_slot < min_carry:
+                    pruned["role"] += 1
+                    found = -1
+                    descend = False
+                    continue
+
+                valid = tanks >= min_tank and carries >= min_carry
+                found = score if valid else -1
+                # chỉ lưu khi team vừa thay đổi (nhánh SKIP giữ nguyên team)
+                if taken and valid:
+                    save(score, total_cost)
+
+                if i >= n or remain_slot == 0:
+                    descend = False
+                    continue
+
+                # ===== TAIL BLOCK =====
+                # vài slot cuối: chấm cả cây con 1 lần bằng numpy
+                if tails is not None and remain_slot <= tails.depth:
+                    best, teams = tails.evaluate(
+                        i, remain_slot, counts, score, total_cost, tanks, carries,
+                        floor, floor_cost, top_k,
+                    )
+                    base = tuple(chosen)
+                    for team_score, team_cost, tail in teams:
+                        save(team_score, team_cost, [base + tail])
+                    if best > found:
+                        found = best
+                    descend = False
+                    continue
+
+                # ===== TAKE =====
+                # tướng tương đương chỉ được lấy khi tướng đứng trước nó đã được lấy
+                prev = prev_equiv[i]
+                took = prev < 0 or in_team[prev]
+                stack.append(
+                    [i, score, total_cost, tanks, carries, key, nodes, found, took]
+                )
+                if took:
+                    # take(i), viết thẳng vì đây là vòng lặp nóng
+                    for t in champ_traits[i]:
+                        c = counts[t]
+                        if c < need[t]:
+                            zhash ^= zcounts[t][c] ^ zcounts[t][c + 1]
+                        counts[t] = c + 1
+                        if c + 1 == need[t]:
+                            score += weight[t]
+                    if class_of[i] >= 0:
+                        zhash ^= zobrist.member[i]
+                    chosen.append(i)
+                    in_team[i] = True
+                    total_cost += cost[i]
+                    tanks += tank[i]
+                    carries += carry[i]
+                i += 1
+                taken = took
+                continue
+
+            # ===== RETURN =====
+            if not stack:
+                return None
+            frame = stack[-1]
+            if found > frame[7]:
+                frame[7] = found
+
+            if frame[8]:
+                # ===== ROLLBACK + SKIP =====
+                i, score, total_cost, tanks, carries = frame[:5]
+                in_team[i] = False
+                chosen.pop()
+                if class_of[i] >= 0:
+                    zhash ^= zobrist.member[i]
+                for t in champ_traits[i]:
+                    c = counts[t] - 1
+                    counts[t] = c
+                    if c < need[t]:
+                        zhash ^= zcounts[t][c] ^ zcounts[t][c + 1]
+                frame[8] = False
+                i += 1
+                taken = False
+                descend = True
+                continue
+
+            stack.pop()
+            _, score, _, _, _, key, first_node, found, _ = frame
+            # ===== MEMO =====
+            # team bị prune trong cây con có điểm <= floor lúc prune <= floor hiện tại
+            # => max(found, floor) - score là cận trên điểm còn cộng thêm được
+            if key is not None and nodes - first_node >= TT_MIN_NODES:
+                tt.put(key, max(found, current_floor()) - score, nodes - first_node)
+
+    def replay(path, i, score, total_cost, tanks, carries):
+        """
+        Resume: dựng lại stack theo các quyết định take/skip trong checkpoint.
+        Frame dựng lại không biết phần cây đã duyệt trước đó nên không ghi memo.
+        """
+        for took in path:
+            remain_slot = slots - len(chosen)
+            prev = prev_equiv[i] if i < n else -1
+            if (
+                i >= n
+                or remain_slot <= 0
+                or (took and not (prev < 0 or in_team[prev]))
+            ):
+                raise InvalidCheckpoint("Checkpoint path does not fit this search")
+            stack.append([i, score, total_cost, tanks, carries, None, 0, -1, bool(took)])
+            if took:
+                score += take(i)
+                total_cost += cost[i]
+                tanks += tank[i]
+                carries += carry[i]
+            i += 1
+        return i, score, total_cost, tanks, carries
+
+    def close_open(pending):
+        """
+        Dừng sớm: ghi cận trên của mọi cây con chưa duyệt vào frontier
+        (node đang chờ + nhánh SKIP của các frame còn ở TAKE) rồi rollback.
+        """
+        i, score = pending[0], pending[1]
+        leave_open(i, score)
+        while stack:
+            frame = stack.pop()
+            if frame[8]:
+                untake(frame[0])
+                leave_open(frame[0] + 1, frame[1])
+
+    # ===== PREFIX =====
+    score = pool.base_score
+    total_cost = pool.base_cost
+    tanks = pool.base_tank
+    carries = pool.base_carry
+    zhash = zobrist.counts_hash(counts, need)
+    for j in prefix:
+        score += take(j)
+        total_cost += cost[j]
+        tanks += tank[j]
+        carries += carry[j]
+
+    # ===== WARM START =====
+    if seed:
+        for neg_score, neg_cost, team in seed:
+            signature = None
+            if unique_signature:
+                signature = activation_signature(pool, team)
+            store.push(-neg_score, -neg_cost, team, signature)
+        top = store.entries()[0]
+        found_at = time.time()
+        if shared is not None and store.full and store.floor()[0] > shared.value:
+            shared.value = store.floor()[0]
+        if on_improve is not None:
+            on_improve(store.entries())
+
+    # ===== DFS =====
+    i = start_index
+    taken = True
+    if resume is not None:
+        if prefix or start_index:
+            raise InvalidCheckpoint("Checkpoint only applies to a full search")
+        i, score, total_cost, tanks, carries = replay(
+            resume.path, i, score, total_cost, tanks, carries
+        )
+        taken = bool(resume.path[-1]) if resume.path else True
+
+    pending = explore(i, score, total_cost, tanks, carries, taken)
+    best = store.entries()
+
+    checkpoint = None
+    if pending is not None:
+        if not prefix and not start_index:
+            checkpoint = Checkpoint(
+                fingerprint=pool_fingerprint(
+                    pool, max_team, top_k, unique_signature, diversity
+                ),
+                path=[int(frame[8]) for frame in stack],
+                teams=[team for _, _, team in best],
+                nodes=resumed_nodes + nodes,
+            )
+        close_open(pending)
+
+    # team bị prune có điểm <= điểm thứ k <= team #1, nên chỉ còn phần
+    # cây chưa duyệt (frontier) là có thể hơn team #1
+    upper = -best[0][0] if best else None
+    if stop_reason is not None and frontier >= 0:
+        upper = frontier if upper is None else max(upper, frontier)
+    return SearchResult(
+        best=to_best(pool, best),
+        completed=stop_reason is None,
+        nodes=nodes,
+        pruned=pruned,
+        entries=best,
+        stop_reason=stop_reason,
+        max_depth=max_depth,
+        started=start,
+        elapsed=time.time() - start,
+        found_at=found_at,
+        tt=tt.stats(),
+        upper_bound=upper,
+        checkpoint=checkpoint,
+        resumed_nodes=resumed_nodes,
+        vector=tails.stats() if tails is not None else {},
+    )
@@ -0,0 +1,141 @@
+import heapq
+from typing import Dict, Hashable, List, Tuple
+
+from backend.solver.compiled import CompiledPool
+
+
+# entry = (-score, -total_cost, chosen): sort tăng dần là đúng thứ hạng
+Entry = Tuple[int, int, Tuple[int, ...]]
+
+
+class _Desc:
+    """Đảo thứ tự so sánh của chosen: tuple lớn hơn = kém hơn khi hòa điểm"""
+    __slots__ = ("chosen",)
+
+    def __init__(self, chosen):
+        self.chosen = chosen
+
+    def __lt__(self, other):
+        return self.chosen > other.chosen
+
+    def __eq__(self, other):
+        return self.chosen == other.chosen
+
+
+# ===== TOP-K STORE =====
+class TopK:
+    """
+    Min-heap k phần tử theo (score, total_cost), đỉnh heap là team kém nhất.
+    - admits(): kiểm tra rẻ trước khi caller tạo tuple / signature
+    - team trùng tập tướng không bao giờ vào 2 lần
+    - unique_signature: 2 team kích cùng tập trait chỉ giữ team tốt hơn
+    - diversity: 2 team trong top-k phải khác nhau ít nhất `diversity` tướng
+
+    Chỉ mặc định (không unique_signature, diversity <= 1) mới cho top-k chính
+    xác tuyệt đối; 2 tùy chọn còn lại là lọc tham lam theo thứ tự tìm thấy.
+    """
+
+    def __init__(self, k: int, unique_signature: bool = False, diversity: int = 0):
+        self.k = k
+        self.unique_signature = unique_signature
+        self.diversity = diversity
+        self._heap: List[tuple] = []                 # (score, cost, _Desc(chosen))
+        self._members: Dict[Tuple[int, ...], Hashable] = {}   # chosen -> signature
+
+    def __len__(self):
+        return len(self._heap)
+
+    @property
+    def full(self) -> bool:
+        return len(self._heap) >= self.k
+
+    def floor(self) -> Tuple[int, int] | None:
+        """(score, total_cost) của team thứ k, None nếu chưa đủ k"""
+        if not self.full:
+            return None
+        score, cost, _ = self._heap[0]
+        return score, cost
+
+    def admits(self, score: int, total_cost: int) -> bool:
+        if not self.full:
+            return True
+        worst_score, worst_cost, _ = self._heap[0]
+        return (score, total_cost) >= (worst_score, worst_cost)
+
+    def push(
+        self,
+        score: int,
+        total_cost: int,
+        chosen: Tuple[int, ...],
+        signature: Hashable = None,
+    ) -> bool:
+        """Trả về True nếu top-k thay đổi"""
+        if chosen in self._members:
+            return False
+
+        item = (score, total_cost, _Desc(chosen))
+        needs_filter = self.unique_signature or self.diversity > 1
+
+        if needs_filter:
+            rivals = [
+                other for other in self._heap
+                if self._conflicts(chosen, signature, other[2].chosen)
+            ]
+            if any(not (other < item) for other in rivals):
+                return False
+            for other in rivals:
+                self._remove(other)
+
+        if self.full:
+            if not (self._heap[0] < item):
+                return False
+            dropped = heapq.heapreplace(self._heap, item)
+            del self._members[dropped[2].chosen]
+        else:
+            heapq.heappush(self._heap, item)
+        self._members[chosen] = signature
+        return True
+
+    def entries(self) -> List[Entry]:
+        return sorted(
+            (-score, -cost, desc.chosen) for score, cost, desc in self._heap
+        )
+
+    def _conflicts(self, chosen, signature, other_chosen) -> bool:
+        if self.unique_signature and signature == self._members[other_chosen]:
+            return True
+        if self.diversity > 1:
+            a, b = set(chosen), set(other_chosen)
+            if max(len(a - b), len(b - a)) < self.diversity:
+                return True
+        return False
+
+    def _remove(self, item):
+        self._heap.remove(item)
+        heapq.heapify(self._heap)
+        del self._members[item[2].chosen]
+
+
+# ===== SIGNATURE =====
+def activation_signature(pool: CompiledPool, chosen: Tuple[int, ...]) -> frozenset:
+    """Tập trait đạt ngưỡng của team (forced + emblem + chosen)"""
+    counts = list(pool.base_counts)
+    for j in chosen:
+        for t in pool.champ_traits[j]:
+            counts[t] += 1
+    return frozenset(t for t, c in enumerate(counts) if c >= pool.need[t])
+
+
+def merge(
+    pool: CompiledPool,
+    parts: List[List[Entry]],
+    top_k: int,
+    unique_signature: bool = False,
+    diversity: int = 0,
+) -> List[Entry]:
+    """Gộp top-k của nhiều cây con, đẩy theo thứ hạng tốt -> kém"""
+    store = TopK(top_k, unique_signature=unique_signature, diversity=diversity)
+    for neg_score, neg_cost, chosen in sorted(e for part in parts for e in part):
+        signature = activation_signature(pool, chosen) if unique_signature else None
+        store.push(-neg_score, -neg_cost, chosen, signature)
+    return store.entries()
@@ -0,0 +1,106 @@
+import os
+import random
+from typing import Dict, List
+
+
+# ===== CONFIG =====
+# mặc định tắt: data thật ít trạng thái trùng (hit ~5%), bật bằng TFT_TT_MB
+TT_MEMORY_MB = float(os.environ.get("TFT_TT_MB", "0"))
+# trần tt_memory_mb của 1 request API (mỗi process worker có bảng riêng)
+MAX_TT_MB = 256
+# ước lượng RAM cho 1 slot: 3 list Python (key, value, work) + int 64 bit
+ENTRY_BYTES = 96
+# cây con nhỏ hơn N node thì duyệt lại còn rẻ hơn lưu vào bảng
+TT_MIN_NODES = 32
+
+
+# ===== ZOBRIST =====
+class Zobrist:
+    """
+    Số ngẫu nhiên 64 bit cho từng (trait, count đã cap ở need), index,
+    số slot còn lại, tank / carry đã cap, tướng thuộc nhóm tương đương.
+    Seed cố định để hash giống nhau giữa các process.
+    """
+
+    def __init__(self, need: List[int], n: int, slots: int, min_tank: int, min_carry: int):
+        rng = random.Random(0x7F7)
+
+        def bits():
+            return rng.getrandbits(64)
+
+        self.counts = [[bits() for _ in range(v + 1)] for v in need]
+        self.index = [bits() for _ in range(n + 1)]
+        self.slot = [bits() for _ in range(max(slots, 0) + 1)]
+        self.tank = [bits() for _ in range(min_tank + 1)]
+        self.carry = [bits() for _ in range(min_carry + 1)]
+        self.member = [bits() for _ in range(n)]
+
+    def counts_hash(self, counts: List[int], need: List[int]) -> int:
+        h = 0
+        for t, c in enumerate(counts):
+            h ^= self.counts[t][min(c, need[t])]
+        return h
+
+
+# ===== TABLE =====
+class TranspositionTable:
+    """
+    Bảng băm kích thước cố định theo memory_mb, slot = key % size.
+    Value là cận trên số điểm còn có thể cộng thêm từ trạng thái đó.
+    Đụng slot: giữ entry có cây con lớn hơn (work = số node đã duyệt),
+    vì cắt được cây con lớn mới đáng.
+    """
+
+    def __init__(self, memory_mb: float = TT_MEMORY_MB):
+        self.size = max(0, int(memory_mb * 1024 * 1024 // ENTRY_BYTES))
+        self._keys: List[int | None] = [None] * self.size
+        self._values = [0] * self.size
+        self._work = [0] * self.size
+
+        self.probes = 0
+        self.hits = 0
+        self.cuts = 0
+        self.stores = 0
+        self.evictions = 0
+        self.used = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    def get(self, key: int) -> int | None:
+        self.probes += 1
+        slot = key % self.size
+        if self._keys[slot] == key:
+            self.hits += 1
+            return self._values[slot]
+        return None
+
+    def put(self, key: int, value: int, work: int):
+        slot = key % self.size
+        old = self._keys[slot]
+        if old is None:
+            self.used += 1
+        elif old == key:
+            # cùng trạng thái: giữ cận chặt hơn
+            value = min(value, self._values[slot])
+            work = max(work, self._work[slot])
+        elif work < self._work[slot]:
+            return
+        else:
+            self.evictions += 1
+        self._keys[slot] = key
+        self._values[slot] = value
+        self._work[slot] = work
+        self.stores += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": self.size,
+            "used": self.used,
+            "probes": self.probes,
+            "hits": self.hits,
+            "cuts": self.cuts,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,149 @@
+import itertools
+from dataclasses import replace
+from typing import Dict, List, Tuple
+
+from backend.solver.compiled import CompiledPool
+
+try:
+    import numpy as np
+except ImportError:          # numpy là tùy chọn, không có thì mode vector chạy DFS thường
+    np = None
+
+
+# ===== CONFIG =====
+VECTOR_DEPTH = 2             # số slot cuối được chấm theo khối thay vì từng node
+CHUNK_ROWS = 1 << 15         # số team mỗi chunk, giới hạn RAM tạm của 1 khối
+UNREACHABLE = 1 << 14        # ngưỡng giả cho trait đã kích / không còn tính điểm
+
+
+def available() -> bool:
+    return np is not None
+
+
+# ===== TAIL BLOCKS =====
+class TailBlocks:
+    """
+    Chấm các slot cuối của DFS theo khối bằng numpy.
+
+    Dựng sẵn 1 lần cho mỗi pool:
+    - ma trận incidence tướng x trait (n x T)
+    - với mỗi s <= depth: mọi tổ hợp s tướng của remain theo thứ tự từ điển,
+      kèm tổng incidence (= ma trận membership x incidence), cost, tank, carry
+
+    Tổ hợp chỉ gồm tướng >= i là 1 đoạn đuôi liên tục của bảng (start[i]).
+    Node DFS ở remain[i] còn <= depth slot thì mọi team trong cây con của
+    nó là node đó + 1 tổ hợp trong đoạn đuôi: kích trait, trọng số
+    origin / class, điều kiện tank / carry đều là mask trên cả chunk, chỉ vài
+    team tốt nhất mỗi chunk mới về Python để vào top-k (top-k stream qua
+    các chunk, RAM tạm không vượt CHUNK_ROWS team).
+
+    Duyệt mọi tổ hợp (không theo prev_equiv) nên pool không được có nhóm
+    tướng tương đương; không hỗ trợ bộ lọc top-k (unique_signature / diversity).
+    """
+
+    def __init__(self, pool: CompiledPool, depth: int = VECTOR_DEPTH):
+        n = len(pool.remain)
+        incidence = np.zeros((n, len(pool.need)), dtype=np.int16)
+        for j, traits in enumerate(pool.champ_traits):
+            for t in traits:
+                incidence[j, t] += 1
+
+        self.depth = depth
+        self.need = np.array(pool.need, dtype=np.int16)
+        self.weight = np.array(pool.weight, dtype=np.int32)
+        self.min_tank = pool.min_tank
+        self.min_carry = pool.min_carry
+        cost = np.array(pool.cost, dtype=np.int32)
+        tank = np.array(pool.tank, dtype=np.int16)
+        carry = np.array(pool.carry, dtype=np.int16)
+
+        self.blocks = []
+        for s in range(1, depth + 1):
+            combos = np.array(
+                list(itertools.combinations(range(n), s)), dtype=np.int32
+            ).reshape(-1, s)
+            self.blocks.append((
+                combos,
+                incidence[combos].sum(axis=1, dtype=np.int16),
+                cost[combos].sum(axis=1),
+                tank[combos].sum(axis=1, dtype=np.int16),
+                carry[combos].sum(axis=1, dtype=np.int16),
+                np.searchsorted(combos[:, 0], np.arange(n + 1)),
+            ))
+
+        self.calls = 0
+        self.teams = 0
+
+    def evaluate(
+        self,
+        i: int,
+        remain_slot: int,
+        counts: List[int],
+        score: int,
+        total_cost: int,
+        tanks: int,
+        carries: int,
+        floor: int,
+        floor_cost: int | None,
+        top_k: int,
+    ) -> Tuple[int, List[Tuple[int, int, Tuple[int, ...]]]]:
+        """
+        Mọi team = trạng thái hiện tại + 1 tổ hợp 1..remain_slot tướng từ
+        remain[i:]. Trả về (điểm cao nhất của team hợp lệ, -1 nếu không có;
+        các team có thể lọt top-k: (score, total_cost, tổ hợp)).
+        """
+        self.calls += 1
+        counts = np.array(counts, dtype=np.int16)
+        # trait chỉ được cộng điểm khi count vượt need đúng lúc thêm tướng
+        # (emblem đã đủ ngưỡng từ trước thì không tính), xem compile_pool
+        reach = np.where(counts < self.need, self.need - counts, UNREACHABLE)
+        need_tank = self.min_tank - tanks
+        need_carry = self.min_carry - carries
+
+        best = -1
+        out = []
+        for s in range(1, min(remain_slot, self.depth) + 1):
+            combos, sums, cost, tank, carry, start = self.blocks[s - 1]
+            for lo in range(int(start[i]), len(combos), CHUNK_ROWS):
+                hi = min(lo + CHUNK_ROWS, len(combos))
+                self.teams += hi - lo
+
+                valid = (tank[lo:hi] >= need_tank) & (carry[lo:hi] >= need_carry)
+                if not valid.any():
+                    continue
+                scores = score + (sums[lo:hi] >= reach) @ self.weight
+                best = max(best, int(scores[valid].max()))
+
+                costs = total_cost + cost[lo:hi]
+                if floor_cost is None:
+                    keep = valid & (scores >= floor)
+                else:
+                    keep = valid & (
+                        (scores > floor) | ((scores == floor) & (costs >= floor_cost))
+                    )
+                rows = np.flatnonzero(keep)
+                if len(rows) > top_k:
+                    # lexsort ổn định: hòa điểm thì giữ thứ tự từ điển như TopK
+                    rows = rows[np.lexsort((-costs[rows], -scores[rows]))[:top_k]]
+                for r in rows:
+                    out.append((
+                        int(scores[r]),
+                        int(costs[r]),
+                        tuple(int(j) for j in combos[lo + r]),
+                    ))
+        return best, out
+
+    def stats(self) -> Dict[str, int]:
+        return {"blocks": self.calls, "teams": self.teams}
+
+
+def tail_blocks(pool: CompiledPool, depth: int = VECTOR_DEPTH):
+    """
+    (pool, TailBlocks) cho mode vector: bỏ nhóm tương đương của reduce_pool
+    (giữ phần bỏ tướng bị trội) vì khối duyệt mọi tổ hợp.
+    Không có numpy => (pool, None), search chạy DFS thường, cùng kết quả.
+    """
+    if not available():
+        return pool, None
+    pool = replace(pool, prev_equiv=[], classes=[])
+    return pool, TailBlocks(pool, depth)
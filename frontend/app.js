@@ -1,4 +1,5 @@
-const API = "http://127.0.0.1:8000"
+// frontend được backend phục vụ (/ui/) => gọi API cùng origin
+const API = ""
 
 let forced = []
 let banned = []
@@ -8,6 +9,7 @@ const forcedList = document.getElementById("forcedList")
 const bannedList = document.getElementById("bannedList")
 const emblemsDiv = document.getElementById("emblems")
 const resultBody = document.getElementById("result")
+const championNames = document.getElementById("championNames")
 
 // ===== DEFAULT =====
 fetch(API + "/config/defaults")
@@ -23,7 +25,7 @@ fetch(API + "/config/defaults")
 fetch(API + "/data/traits")
   .then(r => r.json())
   .then(traits => {
-    traits.forEach(trait => {
+    Object.keys(traits).sort().forEach(trait => {
       const row = document.createElement("div")
       row.className = "emblem-row"
 
@@ -48,6 +50,17 @@ fetch(API + "/data/traits")
     })
   })
 
+// ===== CHAMPIONS =====
+fetch(API + "/data/champions")
+  .then(r => r.json())
+  .then(champions => {
+    champions.forEach(c => {
+      const option = document.createElement("option")
+      option.value = c.name
+      championNames.appendChild(option)
+    })
+  })
+
 // ===== FORCED / BANNED =====
 function addForced() {
   const v = forcedInput.value.trim()
@@ -89,21 +102,107 @@ function renderBanned() {
   })
 }
 
-// ===== SOLVE =====
-function runSolver() {
-  fetch(`${API}/solve/${solver.value}`, {
-    method: "POST",
-    headers: { "Content-Type": "application/json" },
-    body: JSON.stringify({
-      max_team: +maxTeam.value,
-      time_limit: +timeLimit.value,
-      forced,
-      banned,
-      emblems
+// ===== SOLVE (STREAM) =====
+let controller = null
+let checkpoint = null   // điểm dừng của lần chạy hết giờ, để "Tiếp tục"
+
+async function runSolver(resume = false) {
+  stopSolver()
+  controller = new AbortController()
+  setStatus("Đang tìm...")
+  const from = resume ? checkpoint : null
+  setCheckpoint(null)
+
+  try {
+    const res = await fetch(`${API}/solve/${solver.value}/stream`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({
+        max_team: +maxTeam.value,
+        time_limit: +timeLimit.value,
+        forced,
+        banned,
+        emblems,
+        checkpoint: from
+      }),
+      signal: controller.signal
     })
-  })
-    .then(r => r.json())
-    .then(showResult)
+
+    if (res.status === 429) {
+      setStatus(`Server đang bận, thử lại sau ${res.headers.get("Retry-After") || "?"} giây`)
+      return
+    }
+    if (!res.ok) {
+      // 400 / 422 / 500: body là {"detail": ...}, không phải stream NDJSON
+      setStatus("Lỗi: " + await errorDetail(res))
+      return
+    }
+
+    const reader = res.body.getReader()
+    const decoder = new TextDecoder()
+    let buf = ""
+
+    while (true) {
+      const { value, done } = await reader.read()
+      if (done) break
+
+      buf += decoder.decode(value, { stream: true })
+      const lines = buf.split("\n")
+      buf = lines.pop()
+
+      lines.filter(l => l.trim()).forEach(l => {
+        const msg = JSON.parse(l)
+        if (msg.best) showResult(msg.best)
+        if (msg.type === "result" && msg.status === "failed") {
+          setStatus("Lỗi: " + msg.error)
+        } else if (msg.type === "result") {
+          setCheckpoint(msg.stats && msg.stats.checkpoint)
+          const nodes = msg.stats ? ` - ${msg.stats.nodes} nodes` : ""
+          const gap = msg.stats && !msg.completed && msg.stats.gap !== null
+            ? (msg.stats.proven_optimal ? " - đã tối ưu" : ` - có thể thiếu ${msg.stats.gap} điểm`)
+            : ""
+          const granted = msg.granted && msg.granted.degraded
+            ? ` - server chỉ cấp ${msg.granted.time_limit.toFixed(1)}s`
+            : ""
+          setStatus((msg.completed ? "Xong (đã duyệt hết)" : "Hết thời gian") + nodes + gap + granted)
+        }
+      })
+    }
+  } catch (e) {
+    if (e.name !== "AbortError") setStatus("Lỗi: " + e.message)
+  } finally {
+    controller = null
+  }
+}
+
+// detail của HTTPException là chuỗi, của lỗi validate (422) là list {loc, msg}
+async function errorDetail(res) {
+  try {
+    const { detail } = await res.json()
+    if (Array.isArray(detail)) {
+      return detail.map(d => `${(d.loc || []).slice(1).join(".")}: ${d.msg}`).join("; ")
+    }
+    return detail || `${res.status} ${res.statusText}`
+  } catch (e) {
+    return `${res.status} ${res.statusText}`
+  }
+}
+
+function stopSolver() {
+  if (controller) {
+    controller.abort()
+    controller = null
+    setStatus("Đã dừng")
+  }
+}
+
+function setStatus(text) {
+  solveStatus.textContent = text
+}
+
+function setCheckpoint(token) {
+  checkpoint = token || null
+  resumeButton.disabled = !checkpoint
 }
 
 // ===== RESULT =====
@@ -112,7 +211,7 @@ function showResult(data) {
   data.forEach(t => {
     const tr = document.createElement("tr")
     tr.innerHTML = `
-      <td>${t.team.join(", ")}</td>
+      <td>${t.team.map(c => c.name).join(", ")}</td>
       <td>${t.score}</td>
       <td>${t.team.length}</td>
     `
@@ -1,30 +1,59 @@
 import sys
 import json
-from utils import resource_path
+import threading
+import time
+from backend.solver.utils import resource_path
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QLineEdit, QPushButton,
     QListWidget, QVBoxLayout, QHBoxLayout, QCompleter,
     QSpinBox, QGroupBox, QScrollArea,
-    QTableWidget, QTableWidgetItem
+    QTableWidget, QTableWidgetItem, QProgressBar
 )
-from PyQt5.QtCore import Qt
-from ryze import solve
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from backend.solver import ryze
+from backend.solver.registry import DEFAULT_BANNED, DEFAULT_FORCED
 from PyQt5.QtWidgets import QHeaderView
-DEFAULT_BANNED_CHAMPIONS = [
-    "Aatrox",
-    "Aphelios",
-    "Zoe",
-    "Leona",
-    "Diana",
-    "Aurelion Sol"
-]
-DEFAULT_FORCED_CHAMPIONS = [
-    "Ryze",
-    "Ahri"
-]
 
 AUTO_IGNORE_TRAITS = {"Targon"}  # luôn ignore
 
+PROGRESS_INTERVAL = 0.1   # giây giữa 2 lần cập nhật thanh tiến trình
+
+
+# ===== SOLVER WORKER =====
+class SolverWorker(QThread):
+    """
+    Chạy solver ngoài GUI thread để cửa sổ không bị treo.
+    Kết quả tạm thời / tiến trình đi qua signal (Qt tự chuyển về GUI thread).
+    """
+    improved = pyqtSignal(list)          # top-K mới (đã serialize)
+    progress = pyqtSignal(int, float)    # nodes, elapsed
+    done = pyqtSignal(object)            # SearchResult
+    failed = pyqtSignal(str)
+
+    def __init__(self, params):
+        super().__init__()
+        self.params = params
+        self.cancel = threading.Event()
+        self._last_progress = 0.0
+
+    def on_progress(self, nodes, elapsed):
+        now = time.time()
+        if now - self._last_progress >= PROGRESS_INTERVAL:
+            self._last_progress = now
+            self.progress.emit(nodes, elapsed)
+
+    def run(self):
+        try:
+            result = ryze.run(
+                **self.params,
+                cancel=self.cancel,
+                on_improve=self.improved.emit,
+                on_progress=self.on_progress,
+            )
+            self.done.emit(result)
+        except Exception as e:
+            self.failed.emit(str(e))
+
 
 class TFTTool(QWidget):
     def __init__(self):
@@ -34,6 +63,9 @@ class TFTTool(QWidget):
 
         self.champion_names = self.load_champions()
         self.traits = self.load_traits()
+        self.trait_rules = ryze.load_traits()
+        self.worker = None
+        self.current_emblems = {}
 
         self.init_ui()
         self.load_default_forced()
@@ -42,14 +74,14 @@ class TFTTool(QWidget):
     def load_default_banned(self):
         banned_list = self.list_banned["list"]
 
-        for name in DEFAULT_BANNED_CHAMPIONS:
+        for name in DEFAULT_BANNED:
             if name in self.champion_names:
                 banned_list.addItem(name)
 
     def load_default_forced(self):
         forced_list = self.list_forced["list"]
 
-        for name in DEFAULT_FORCED_CHAMPIONS:
+        for name in DEFAULT_FORCED:
             if name in self.champion_names:
                 forced_list.addItem(name)
 
@@ -138,27 +170,40 @@ class TFTTool(QWidget):
         # ===== RIGHT: RESULT TABLE =====
         right_layout = QVBoxLayout()
 
-        btn_run = QPushButton("Run Solver")
-        btn_run.clicked.connect(self.run_solver_real)
+        buttons = QHBoxLayout()
+        self.btn_run = QPushButton("Run Solver")
+        self.btn_run.clicked.connect(self.run_solver_real)
+        self.btn_cancel = QPushButton("Cancel")
+        self.btn_cancel.setEnabled(False)
+        self.btn_cancel.clicked.connect(self.cancel_solver)
+        buttons.addWidget(self.btn_run)
+        buttons.addWidget(self.btn_cancel)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        self.progress_bar.setTextVisible(False)
+        self.status_label = QLabel("")
 
         self.table = QTableWidget(0, 4)
         self.table.setHorizontalHeaderLabels([
             "Team",
             "Traits",
-            "Team Size",
-            "Time Limit"
+            "Score",
+            "Team Size"
         ])
         # ---- CẤU HÌNH HIỂN THỊ BẢNG (QUAN TRỌNG) ----
         self.table.setWordWrap(True)
         self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
-        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
         self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeToContents)
         self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeToContents)
         self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
         self.table.setEditTriggers(QTableWidget.NoEditTriggers)
         self.table.setSelectionBehavior(QTableWidget.SelectRows)
 
-        right_layout.addWidget(btn_run)
+        right_layout.addLayout(buttons)
+        right_layout.addWidget(self.progress_bar)
+        right_layout.addWidget(self.status_label)
         right_layout.addWidget(self.table)
 
         # ===== MERGE =====
@@ -206,54 +251,122 @@ class TFTTool(QWidget):
     def get_items(self, list_widget):
         return [list_widget.item(i).text() for i in range(list_widget.count())]
 
-    # ===== MOCK RESULT =====
+    def active_traits(self, team, emblems):
+        """Trait đạt ngưỡng đầu của team (tính cả emblem), dạng "Tên count/need" """
+        counts = dict(emblems)
+        for c in team:
+            for t in c["traits"]:
+                counts[t] = counts.get(t, 0) + 1
+
+        active = []
+        for name, count in counts.items():
+            trait = self.trait_rules.get(name)
+            if trait is None:
+                continue
+            need = ryze.trait_need(name, trait)
+            if need != float("inf") and count >= need:
+                active.append((count, name, need))
+        active.sort(key=lambda x: (-x[0], x[1]))
+        return ", ".join(f"{name} {count}/{need}" for count, name, need in active)
+
+    # ===== SOLVER =====
     def run_solver_real(self):
-        try:
-            # Xóa bảng cũ
-            self.table.setRowCount(0)
-
-            # Lấy dữ liệu từ GUI
-            forced = self.get_items(self.list_forced["list"])
-            banned = self.get_items(self.list_banned["list"])
-            emblems = {t: spin.value() for t, spin in self.emblem_spinboxes.items() if spin.value() > 0}
-
-            print("=== GUI INPUT ===")
-            print("Forced:", forced)
-            print("Banned:", banned)
-            print("Emblems:", emblems)
-            print("Max team size:", self.spin_max_size.value())
-            print("Time limit:", self.spin_time_limit.value())
-
-            # Gọi solver
-            result = solve(
-                max_team=self.spin_max_size.value(),
-                time_limit=self.spin_time_limit.value(),
-                forced=forced,
-                banned=banned,
-                emblems=emblems
-            )
-
-            print("=== SOLVER RESULT ===")
-            for idx, team_info in enumerate(result):
-                # Kiểm tra team_info có key 'team' không
-                team = team_info.get("team", [])
-                # Lọc các object hợp lệ có attribute name
-                team_names = [c.name for c in team if hasattr(c, "name")]
-
-                print(f"Team {idx + 1}: {team_names}, score: {team_info.get('score', 0)}")
-
-                row = self.table.rowCount()
-                self.table.insertRow(row)
-                self.table.setItem(row, 0, QTableWidgetItem(", ".join(team_names)))
-                self.table.setItem(row, 1, QTableWidgetItem(str(team_info.get("score", 0))))
-                self.table.setItem(row, 2, QTableWidgetItem(str(len(team_names))))
-                self.table.setItem(row, 3, QTableWidgetItem(f"{self.spin_time_limit.value()}s"))
-
-            if not result:
-                print("Solver returned empty result!")
+        if self.worker is not None:
+            return
+
+        # Lấy dữ liệu từ GUI
+        params = {
+            "max_team": self.spin_max_size.value(),
+            "time_limit": self.spin_time_limit.value(),
+            "forced": self.get_items(self.list_forced["list"]),
+            "banned": self.get_items(self.list_banned["list"]),
+            "emblems": {
+                t: spin.value()
+                for t, spin in self.emblem_spinboxes.items()
+                if spin.value() > 0
+            },
+        }
 
-        except Exception as e:
-            print("ERROR in run_solver_real:", e)
+        print("=== GUI INPUT ===")
+        for key, value in params.items():
+            print(f"{key}:", value)
+
+        self.current_emblems = params["emblems"]
+        self.table.setRowCount(0)
+        self.progress_bar.setValue(0)
+        self.status_label.setText("Đang tìm...")
+        self.btn_run.setEnabled(False)
+        self.btn_cancel.setEnabled(True)
+
+        self.worker = SolverWorker(params)
+        self.worker.improved.connect(self.show_result)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.done.connect(self.on_done)
+        self.worker.failed.connect(self.on_failed)
+        self.worker.finished.connect(self.on_worker_finished)
+        self.worker.start()
+
+    def cancel_solver(self):
+        if self.worker is not None:
+            self.worker.cancel.set()
+            self.btn_cancel.setEnabled(False)
+            self.status_label.setText("Đang dừng...")
+
+    def on_progress(self, nodes, elapsed):
+        time_limit = self.spin_time_limit.value()
+        self.progress_bar.setValue(min(1000, int(1000 * elapsed / time_limit)))
+        self.status_label.setText(f"{elapsed:.1f}s - {nodes:,} nodes")
+
+    def on_done(self, result):
+        self.show_result(result.best)
+        if result.completed:
+            status = "Xong (đã duyệt hết)"
+            self.progress_bar.setValue(1000)
+        elif result.cancelled:
+            status = "Đã dừng"
+        else:
+            status = "Hết thời gian"
+            if result.gap is not None:
+                status += f" - có thể thiếu {result.gap} điểm"
+        self.status_label.setText(f"{status} - {result.nodes:,} nodes")
+
+        print("=== SOLVER RESULT ===")
+        for idx, team_info in enumerate(result.best):
+            names = [c["name"] for c in team_info["team"]]
+            print(f"Team {idx + 1}: {names}, score: {team_info['score']}")
+        if not result.best:
+            print("Solver returned empty result!")
+
+    def on_failed(self, message):
+        print("ERROR in run_solver_real:", message)
+        self.status_label.setText("Lỗi: " + message)
+
+    def on_worker_finished(self):
+        self.worker = None
+        self.btn_run.setEnabled(True)
+        self.btn_cancel.setEnabled(False)
+
+    def show_result(self, best):
+        self.table.setRowCount(0)
+        for team_info in best:
+            team = team_info.get("team", [])
+            team_names = [c["name"] for c in team]
+
+            row = self.table.rowCount()
+            self.table.insertRow(row)
+            self.table.setItem(row, 0, QTableWidgetItem(", ".join(team_names)))
+            self.table.setItem(row, 1, QTableWidgetItem(
+                self.active_traits(team, self.current_emblems)
+            ))
+            self.table.setItem(row, 2, QTableWidgetItem(str(team_info.get("score", 0))))
+            self.table.setItem(row, 3, QTableWidgetItem(str(len(team_names))))
+
+    def closeEvent(self, event):
+        # đóng cửa sổ khi đang chạy: dừng worker trước để thread không bị kill
+        if self.worker is not None:
+            self.worker.cancel.set()
+            self.worker.wait()
+        super().closeEvent(event)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,114 @@
+"""
+Vét cạn dùng chung cho các test so kết quả solver: pool con ngẫu nhiên
+14–16 tướng, duyệt mọi board trên pool đã compile nhưng chưa rút gọn
+(build_pool), nên so được cả reduce_pool / reduce_front_pool lẫn search.
+"""
+import itertools
+import random
+
+from backend.solver import bronze, engine, ryze
+from backend.solver.catalog import Catalog, get_catalog
+
+
+# ===== CONFIG =====
+SEEDS = range(10)
+TIME_LIMIT = 60.0
+
+
+# ===== CASES =====
+def random_case(seed):
+    """
+    (solver, catalog con, max_team, forced, emblems) lặp lại được theo seed,
+    bốc lại tới khi có ít nhất 1 board đủ max_team tướng hợp lệ (đủ role)
+    """
+    rng = random.Random(seed)
+    full = get_catalog()
+    while True:
+        solver = rng.choice([ryze, bronze])
+        champions = rng.sample(full.champions, rng.randint(14, 16))
+        catalog = Catalog(
+            version=f"test-{seed}",
+            champions=champions,
+            traits=full.traits,
+            raw_traits=full.raw_traits,
+        )
+        forced = [c.name for c in rng.sample(champions, rng.randint(0, 2))]
+        emblems = {t: rng.randint(1, 2) for t in rng.sample(sorted(full.traits), 2)}
+        max_team = rng.randint(4, 6)
+        pool = engine.build_pool(solver.RULES, forced, [], emblems, catalog)
+        if next(boards(pool, max_team, full_only=True), None) is not None:
+            return solver, catalog, max_team, forced, emblems
+
+
+def solve_case(case, **kwargs):
+    """
+    (SearchResult của run(), pool chưa rút gọn, max_team) của random_case(case),
+    kwargs chuyển cho run() (kể cả seed của mode anneal)
+    """
+    solver, catalog, max_team, forced, emblems = random_case(case)
+    result = solver.run(
+        max_team=max_team,
+        time_limit=TIME_LIMIT,
+        forced=forced,
+        banned=[],
+        emblems=emblems,
+        catalog=catalog,
+        **kwargs,
+    )
+    pool = engine.build_pool(solver.RULES, forced, [], emblems, catalog)
+    return result, pool, max_team
+
+
+# ===== BRUTE FORCE =====
+def boards(pool, max_team, full_only=False):
+    """
+    Mọi board hợp lệ (đủ role) của pool: (score, total_cost, counts, chosen),
+    full_only => chỉ các board đủ max_team tướng
+    """
+    slots = max(0, min(max_team - len(pool.forced), len(pool.remain)))
+    sizes = [slots] if full_only else range(slots + 1)
+    for size in sizes:
+        for chosen in itertools.combinations(range(len(pool.remain)), size):
+            counts = list(pool.base_counts)
+            score = pool.base_score
+            for j in chosen:
+                for t in pool.champ_traits[j]:
+                    counts[t] += 1
+                    if counts[t] == pool.need[t]:
+                        score += pool.weight[t]
+            tanks = pool.base_tank + sum(pool.tank[j] for j in chosen)
+            carries = pool.base_carry + sum(pool.carry[j] for j in chosen)
+            if tanks >= pool.min_tank and carries >= pool.min_carry:
+                total_cost = pool.base_cost + sum(pool.cost[j] for j in chosen)
+                yield score, total_cost, counts, chosen
+
+
+def brute_top_k(pool, max_team):
+    """(score, total_cost) của top-K: score giảm dần, cùng score thì cost cao trước"""
+    values = sorted(
+        ((score, total_cost) for score, total_cost, _, _ in boards(pool, max_team)),
+        reverse=True,
+    )
+    return values[:engine.TOP_K]
+
+
+def brute_front(pool, max_team, tiers_of):
+    """Các vector (score, total_cost, tiers) không bị trội của board đủ max_team"""
+    points = set()
+    for score, total_cost, counts, _ in boards(pool, max_team, full_only=True):
+        tiers = sum(
+            pool.weight[t] * sum(1 for th in tiers_of[t] if th <= counts[t])
+            for t in range(len(pool.need))
+        )
+        points.add((score, total_cost, tiers))
+    return {
+        p for p in points
+        if not any(
+            q != p and q[0] >= p[0] and q[1] <= p[1] and q[2] >= p[2]
+            for q in points
+        )
+    }
+
+
+def top_k_values(result):
+    return [(entry["score"], entry["total_cost"]) for entry in result.best]
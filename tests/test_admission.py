@@ -0,0 +1,101 @@
+import math
+from concurrent.futures import Future
+
+import pytest
+
+from backend.app.admission import AdmissionController, Rejected
+
+
+def controller(**kwargs):
+    options = dict(budget=120, max_client_jobs=2, max_time_limit=60, max_workers=2)
+    options.update(kwargs)
+    return AdmissionController(**options)
+
+
+# ===== TIME LIMIT =====
+@pytest.mark.parametrize("time_limit", [math.nan, 0, -30])
+def test_rejects_non_positive_or_nan_time_limit(time_limit):
+    admission = controller()
+    with pytest.raises(ValueError):
+        admission.admit("a", time_limit)
+    assert admission.tickets == {}
+    assert admission.committed() == 0
+
+
+def test_nan_does_not_unlock_the_budget():
+    admission = controller(max_client_jobs=100)
+    with pytest.raises(ValueError):
+        admission.admit("a", math.nan)
+    admission.admit("a", 60)
+    admission.admit("a", 60)
+    with pytest.raises(Rejected) as e:
+        admission.admit("a", 60)
+    assert e.value.reason == "busy"
+    assert admission.committed() == 120
+
+
+def test_infinite_time_limit_is_clamped():
+    ticket = controller().admit("a", math.inf)
+    assert ticket.time_limit == 60
+
+
+# ===== BUDGET =====
+def test_grants_shrink_under_load():
+    admission = controller(max_client_jobs=10)
+    first = admission.admit("a", 60)
+    second = admission.admit("b", 60)
+    assert first.time_limit == 60
+    assert second.time_limit == 60          # min(còn lại 60, 120 / 2)
+    with pytest.raises(Rejected):
+        admission.admit("c", 60)
+    admission.release(first)
+    third = admission.admit("c", 60, workers=2)
+    assert third.time_limit == 30           # share 120 / 2 chia cho 2 worker
+    grant = third.grant(60, 2)
+    assert grant["degraded"] and grant["time_limit"] == 30
+
+
+def test_per_client_limit():
+    admission = controller(budget=1000)
+    admission.admit("a", 5)
+    admission.admit("a", 5)
+    with pytest.raises(Rejected) as e:
+        admission.admit("a", 5)
+    assert e.value.reason == "client"
+    assert e.value.retry_after >= 1
+    admission.admit("b", 5)
+
+
+def test_release_after_waits_for_every_future():
+    admission = controller()
+    ticket = admission.admit("a", 10, jobs=2)
+    futures = [Future(), Future()]
+    admission.release_after(ticket, futures)
+    futures[0].set_result(None)
+    assert ticket.id in admission.tickets
+    futures[1].set_result(None)
+    assert admission.tickets == {}
+
+
+def test_release_after_without_jobs_releases_now():
+    admission = controller()
+    ticket = admission.admit("a", 10)
+    admission.release_after(ticket, [])
+    assert admission.tickets == {}
+
+
+# ===== REQUEST MODEL =====
+@pytest.mark.parametrize("body", ['{"time_limit": NaN}', '{"time_limit": -1}', '{"time_limit": Infinity}'])
+def test_api_rejects_bad_time_limit(body):
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from backend.app.api import admission, app
+
+    client = TestClient(app)
+    before = admission.committed()
+    res = client.post(
+        "/solve/ryze", content=body, headers={"Content-Type": "application/json"}
+    )
+    assert res.status_code == 422
+    assert admission.committed() == before
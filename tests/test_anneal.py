@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+
+from backend.solver import engine
+from backend.solver.anneal import anneal, parallel_anneal
+from tests.helpers import SEEDS, TIME_LIMIT, boards, random_case, solve_case, top_k_values
+
+
+NODE_LIMIT = 20000
+
+
+def case_pool(seed):
+    solver, catalog, max_team, forced, emblems = random_case(seed)
+    return engine.build_pool(solver.RULES, forced, [], emblems, catalog), max_team
+
+
+def full_boards(pool, max_team):
+    return sorted(
+        ((score, total_cost) for score, total_cost, _, _ in boards(pool, max_team, full_only=True)),
+        reverse=True,
+    )
+
+
+def values(result):
+    return [(-entry[0], -entry[1]) for entry in result.entries]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_cold_chain_finds_the_best_full_board(seed):
+    # không warm start: pool nhỏ, 1 lượt là đủ để gặp board tốt nhất
+    pool, max_team = case_pool(seed)
+    result = anneal(pool, max_team, TIME_LIMIT, engine.TOP_K, seed=seed, node_limit=NODE_LIMIT)
+    expected = full_boards(pool, max_team)
+    found = values(result)
+    assert result.stop_reason == "nodes" and not result.completed
+    assert found[0] == expected[0]
+    # chỉ trả về board thật, đủ slot, không trùng
+    assert set(found) <= set(expected)
+    assert len({entry[2] for entry in result.entries}) == len(result.entries)
+
+
+@pytest.mark.parametrize("case", SEEDS)
+def test_same_seed_same_result(case):
+    first, _, _ = solve_case(case, mode="anneal", seed=7, node_limit=2000)
+    second, _, _ = solve_case(case, mode="anneal", seed=7, node_limit=2000)
+    assert first.entries == second.entries
+    assert top_k_values(first) == top_k_values(second)
+
+
+def test_single_board_is_completed():
+    pool, max_team = case_pool(0)
+    result = anneal(pool, len(pool.forced), TIME_LIMIT, engine.TOP_K, seed=0)
+    assert result.completed and result.nodes == 1
+    result = anneal(pool, len(pool.forced) + len(pool.remain), TIME_LIMIT, engine.TOP_K, seed=0)
+    assert result.completed
+    assert [entry[2] for entry in result.entries] in ([], [tuple(range(len(pool.remain)))])
+
+
+def test_cancel_stops_the_chain():
+    pool, max_team = case_pool(0)
+    cancel = threading.Event()
+    cancel.set()
+    result = anneal(pool, max_team, TIME_LIMIT, engine.TOP_K, seed=0, cancel=cancel)
+    assert result.stop_reason == "cancelled"
+
+
+def test_parallel_chains_split_node_limit_and_merge():
+    pool, max_team = case_pool(0)
+    result = parallel_anneal(
+        pool, max_team, TIME_LIMIT, engine.TOP_K, workers=2, seed=0, node_limit=NODE_LIMIT
+    )
+    assert result.nodes == NODE_LIMIT
+    assert result.stop_reason == "nodes"
+    assert values(result)[0] == full_boards(pool, max_team)[0]
@@ -0,0 +1,79 @@
+import pytest
+
+from backend.solver.batch import incumbent_teams, plan_waves, variant_key
+
+
+def team(*names):
+    return {"team": [{"name": name} for name in names]}
+
+
+def test_waves_follow_total_emblems():
+    emblems = [{"A": 2}, {}, {"A": 1}, {"B": 1}, {"A": 0}, {"A": 1, "B": 1}]
+    assert plan_waves(emblems) == [[1, 4], [2, 3], [0, 5]]
+
+
+def test_incumbents_are_unique_name_sets():
+    results = [[team("b", "a"), team("c")], [team("a", "b"), team("d", "c")]]
+    assert incumbent_teams(results) == [["a", "b"], ["c"], ["c", "d"]]
+
+
+def test_variant_key_ignores_order_duplicates_and_zero_emblems():
+    base = {"max_team": 8, "forced": ["a", "b"], "banned": [], "emblems": {"A": 1}}
+    same = {"max_team": 8, "forced": ["b", "a", "a"], "banned": [], "emblems": {"A": 1, "B": 0}}
+    assert variant_key(base) == variant_key(same)
+    assert variant_key(base) != variant_key(dict(base, emblems={"A": 2}))
+    assert variant_key(base) != variant_key(dict(base, max_team=9))
+
+
+# ===== API =====
+@pytest.fixture
+def client():
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from backend.app.api import app
+
+    return TestClient(app)
+
+
+def test_batch_answers_in_request_order(client):
+    small = {"max_team": 4, "time_limit": 30, "forced": ["Ryze"]}
+    variants = [
+        dict(small, emblems={"Yordle": 1}),
+        small,
+        dict(small, forced=["Ryze", "Ryze"]),     # trùng variant thứ 2
+        dict(small, max_team=5),
+    ]
+    res = client.post("/solve/batch", json={"variants": variants})
+    assert res.status_code == 200
+    results = res.json()["results"]
+    assert len(results) == len(variants)
+    assert results[1] == results[2]
+    for variant, result in zip(variants, results):
+        assert result["stats"]["completed"]
+        for entry in result["best"]:
+            names = [c["name"] for c in entry["team"]]
+            assert "Ryze" in names and len(names) <= variant["max_team"]
+
+    # cùng variant solve riêng lẻ => cùng top-K
+    alone = client.post("/solve/ryze", json=variants[3]).json()
+    assert alone["best"] == results[3]["best"]
+
+
+def test_batch_size_is_limited(client):
+    from backend.app.api import MAX_BATCH
+
+    res = client.post("/solve/batch", json={"variants": [{}] * (MAX_BATCH + 1)})
+    assert res.status_code == 400
+
+
+def test_bad_checkpoint_rejects_the_whole_batch(client):
+    from backend.app.api import admission
+
+    before = admission.committed()
+    res = client.post(
+        "/solve/batch",
+        json={"variants": [{"max_team": 4}, {"max_team": 5, "checkpoint": "garbage"}]},
+    )
+    assert res.status_code == 400
+    assert admission.committed() == before
@@ -0,0 +1,62 @@
+import threading
+
+import pytest
+
+from backend.solver import ryze
+from backend.solver.registry import DEFAULT_BANNED, DEFAULT_FORCED
+from tests.helpers import SEEDS, boards, brute_top_k, solve_case, top_k_values
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_beam_returns_real_boards_no_better_than_optimum(seed):
+    result, pool, max_team = solve_case(seed, mode="beam", beam_width=4)
+    possible = {(score, total_cost) for score, total_cost, _, _ in boards(pool, max_team)}
+    values = top_k_values(result)
+    # beam có thể không gặp board đủ role nào, nhưng không bao giờ bịa ra board
+    assert not result.completed
+    assert set(values) <= possible
+    assert values[:1] <= brute_top_k(pool, max_team)[:1]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_warm_start_seeds_an_exact_search(seed):
+    # warm start chỉ seed top-k, kết quả DFS vẫn phải đúng như không seed
+    result, pool, max_team = solve_case(seed, incumbents=[["Ryze", "Ahri"]])
+    assert top_k_values(result) == brute_top_k(pool, max_team)
+
+
+def run_beam(**kwargs):
+    return ryze.run(
+        max_team=14,
+        forced=DEFAULT_FORCED,
+        banned=DEFAULT_BANNED,
+        emblems={},
+        mode="beam",
+        beam_width=256,
+        **kwargs,
+    )
+
+
+def test_beam_stops_at_time_limit():
+    result = run_beam(time_limit=0)
+    assert result.stop_reason == "time"
+    assert result.elapsed < 1
+
+
+def test_beam_stops_when_cancelled():
+    cancel = threading.Event()
+    cancel.set()
+    result = run_beam(time_limit=60, cancel=cancel)
+    assert result.cancelled
+
+
+def test_api_caps_beam_width():
+    pytest.importorskip("fastapi")
+    from backend.app.api import SolveRequest
+    from backend.solver.beam import MAX_BEAM_WIDTH
+
+    with pytest.raises(ValueError):
+        SolveRequest(mode="beam", beam_width=MAX_BEAM_WIDTH + 1)
+    with pytest.raises(ValueError):
+        SolveRequest(mode="beam", beam_width=0)
+    assert SolveRequest(mode="beam", beam_width=MAX_BEAM_WIDTH).beam_width == MAX_BEAM_WIDTH
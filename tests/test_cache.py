@@ -0,0 +1,73 @@
+import pytest
+
+from backend.app.cache import ResultCache, canonical_key
+
+
+# ===== CANONICAL KEY =====
+def test_key_ignores_order_duplicates_and_zero_emblems():
+    a = canonical_key("ryze", "v1", 8, ["Ahri", "Ryze"], ["Zoe", "Leona"], {"Yordle": 1, "Ionia": 0})
+    b = canonical_key("ryze", "v1", 8, ["Ryze", "Ahri", "Ahri"], ["Leona", "Zoe"], {"Yordle": 1})
+    assert a == b
+
+
+def test_key_separates_what_changes_the_result():
+    base = canonical_key("ryze", "v1", 8, [], [], {})
+    assert base != canonical_key("bronze", "v1", 8, [], [], {})
+    assert base != canonical_key("ryze", "v2", 8, [], [], {})
+    assert base != canonical_key("ryze", "v1", 7, [], [], {})
+    assert base != canonical_key("ryze", "v1", 8, [], [], {}, options={"diversity": 2})
+    assert base != canonical_key("ryze", "v1", 8, [], [], {}, time_limit=5)
+
+
+# ===== RESULT CACHE =====
+def test_lru_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2, path=None)
+    cache.put("a", {"n": 1}, "v")
+    cache.put("b", {"n": 2}, "v")
+    cache.get("a")
+    cache.put("c", {"n": 3}, "v")
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1}
+    assert cache.get("c") == {"n": 3}
+
+
+def test_persisted_results_survive_restart_until_the_data_changes(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResultCache(path=path)
+    cache.put("done", {"best": []}, "v1", persist=True)
+    cache.put("timed", {"best": []}, "v1")
+
+    restarted = ResultCache(path=path)
+    assert restarted.get("done") == {"best": []}
+    assert restarted.get("timed") is None
+
+    restarted.put("other", {"best": []}, "v2", persist=True)
+    assert ResultCache(path=path).get("done") is None
+
+
+# ===== API KEYS =====
+@pytest.fixture
+def keys():
+    pytest.importorskip("fastapi")
+    from backend.app.api import SolveRequest, cache_keys
+
+    return lambda **kw: cache_keys("ryze", SolveRequest(**kw))[1:]
+
+
+def test_completed_key_ignores_limits_timed_key_does_not(keys):
+    full, timed = keys(time_limit=5)
+    full2, timed2 = keys(time_limit=10, workers=2)
+    assert full == full2
+    assert timed != timed2
+
+
+def test_anneal_key_depends_on_seed_and_workers(keys):
+    full, _ = keys(mode="anneal", seed=1)
+    assert full != keys(mode="anneal", seed=2)[0]
+    assert full != keys(mode="anneal", seed=1, workers=2)[0]
+    assert full != keys(mode="exact")[0]
+
+
+def test_vector_shares_completed_results_with_exact(keys):
+    assert keys(mode="vector")[0] == keys(mode="exact")[0]
+    assert keys(mode="vector")[1] != keys(mode="exact")[1]
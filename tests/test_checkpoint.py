@@ -0,0 +1,116 @@
+import base64
+import json
+import zlib
+
+import pytest
+
+from backend.solver import engine
+from backend.solver.checkpoint import MAX_TOKEN_CHARS, Checkpoint, InvalidCheckpoint
+from tests.helpers import SEEDS, TIME_LIMIT, brute_top_k, random_case, top_k_values
+
+
+NODE_LIMIT = 200
+
+
+def run_case(seed, **kwargs):
+    solver, catalog, max_team, forced, emblems = random_case(seed)
+    result = solver.run(
+        max_team=max_team,
+        time_limit=TIME_LIMIT,
+        forced=forced,
+        banned=[],
+        emblems=emblems,
+        catalog=catalog,
+        **kwargs,
+    )
+    return result, (solver, catalog, max_team, forced, emblems)
+
+
+def encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(zlib.compress(raw)).decode("ascii")
+
+
+def fingerprint_of(token: str) -> str:
+    padded = token + "=" * (-len(token) % 4)
+    return json.loads(zlib.decompress(base64.urlsafe_b64decode(padded)))["fp"]
+
+
+# ===== RESUME =====
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("mode", ["exact", "vector"])
+def test_resumed_runs_match_brute_force(seed, mode):
+    # cắt mỗi lần NODE_LIMIT node rồi duyệt tiếp tới hết cây
+    result, case = run_case(seed, node_limit=NODE_LIMIT, mode=mode)
+    while not result.completed:
+        token = result.stats()["checkpoint"]
+        assert token is not None
+        resumed_nodes = result.resumed_nodes + result.nodes
+        result, _ = run_case(seed, node_limit=NODE_LIMIT, mode=mode, checkpoint=token)
+        assert result.resumed_nodes == resumed_nodes
+    assert result.checkpoint is None
+
+    solver, catalog, max_team, forced, emblems = case
+    pool = engine.build_pool(solver.RULES, forced, [], emblems, catalog)
+    assert top_k_values(result) == brute_top_k(pool, max_team)
+
+
+def test_token_round_trip():
+    checkpoint = Checkpoint(fingerprint="ab", path=[1, 0, 1], teams=[(0, 2)], nodes=7)
+    assert Checkpoint.from_token(checkpoint.token(), "ab") == checkpoint
+
+
+# ===== INVALID TOKEN =====
+def interrupted(seed=0):
+    result, case = run_case(seed, node_limit=1)
+    assert not result.completed
+    return result.stats()["checkpoint"], case
+
+
+def test_token_of_another_request_is_rejected():
+    token, (solver, catalog, max_team, forced, emblems) = interrupted()
+    with pytest.raises(InvalidCheckpoint):
+        solver.run(max_team - 1, TIME_LIMIT, forced, [], emblems, catalog=catalog, checkpoint=token)
+    with pytest.raises(InvalidCheckpoint):
+        solver.run(max_team, TIME_LIMIT, forced, [], emblems, catalog=catalog,
+                   checkpoint=token, mode="beam")
+    solver.check_checkpoint(max_team, forced, [], emblems, token, catalog=catalog)
+    with pytest.raises(InvalidCheckpoint):
+        solver.check_checkpoint(max_team, forced, [], emblems, token, catalog=catalog, diversity=1)
+
+
+@pytest.mark.parametrize("token", [
+    "",
+    "not-base64!",
+    encode(b"not json"),
+    encode(b'{"v": 1}'),
+    encode(b'{"v": 99, "fp": "x", "path": "", "teams": [], "nodes": 0}'),
+    encode(b'{"v": 1, "fp": "x", "path": "2", "teams": [], "nodes": 0}'),
+    "A" * (MAX_TOKEN_CHARS + 1),
+    encode(b" " * (4 * 1024 * 1024)),
+])
+def test_malformed_token_is_rejected(token):
+    with pytest.raises(InvalidCheckpoint):
+        Checkpoint.from_token(token, "x")
+
+
+@pytest.mark.parametrize("team", [(-1,), (10_000,)])
+def test_team_out_of_range_is_rejected(team):
+    token, (solver, catalog, max_team, forced, emblems) = interrupted()
+    pool, _ = engine.prepare_pool(solver.RULES, max_team, forced, [], emblems, catalog)
+    checkpoint = Checkpoint.from_token(token, fingerprint_of(token))
+    checkpoint.teams = [team]
+    with pytest.raises(InvalidCheckpoint):
+        checkpoint.entries(pool, max_team)
+
+
+def test_api_rejects_foreign_checkpoint():
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from backend.app.api import app
+
+    token, _ = interrupted()
+    res = TestClient(app).post(
+        "/solve/ryze", json={"max_team": 6, "time_limit": 5, "checkpoint": token}
+    )
+    assert res.status_code == 400
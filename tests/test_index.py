@@ -0,0 +1,109 @@
+import os
+
+import pytest
+
+from backend.app.cache import canonical_key
+from backend.precompute import __main__ as precompute
+from backend.precompute import index as index_module
+from backend.precompute.index import SolutionIndex, get_index, write_index
+from backend.solver import ryze
+from backend.solver.catalog import get_catalog
+
+
+@pytest.fixture
+def catalog():
+    return get_catalog()
+
+
+@pytest.fixture
+def solutions(catalog):
+    names = [c.name for c in catalog.champions]
+    return {
+        f"key-{i}": [(i, i + 1, names[i % 5:i % 5 + 3]), (i, 2, names[:1])]
+        for i in range(50)
+    }
+
+
+@pytest.fixture
+def fresh_loader(monkeypatch):
+    # get_index giữ index đang mở theo (mtime, size, version) của file
+    monkeypatch.setattr(index_module, "_current", None)
+    monkeypatch.setattr(index_module, "_stamp", None)
+
+
+def test_round_trip(tmp_path, catalog, solutions):
+    path = str(tmp_path / "solutions.idx")
+    write_index(path, catalog, solutions)
+    index = SolutionIndex(path, catalog)
+    try:
+        assert index.count == len(solutions)
+        assert index.version == catalog.version
+        for key, expected in solutions.items():
+            assert index.get(key) == expected
+        assert index.get("missing") is None
+    finally:
+        index.close()
+
+
+def test_hash_collisions_compare_the_key(tmp_path, catalog, solutions, monkeypatch):
+    monkeypatch.setattr(index_module, "key_hash", lambda key: len(key))
+    path = str(tmp_path / "solutions.idx")
+    write_index(path, catalog, solutions)
+    index = SolutionIndex(path, catalog)
+    try:
+        for key, expected in solutions.items():
+            assert index.get(key) == expected
+        assert index.get("key-99") is None
+    finally:
+        index.close()
+
+
+def test_not_an_index(tmp_path, catalog):
+    path = tmp_path / "solutions.idx"
+    path.write_bytes(b"x" * 64)
+    with pytest.raises(ValueError):
+        SolutionIndex(str(path), catalog)
+
+
+def test_loader_checks_version_and_reloads(tmp_path, catalog, solutions, monkeypatch, fresh_loader):
+    path = str(tmp_path / "solutions.idx")
+    monkeypatch.setattr(index_module, "INDEX_FILE", path)
+    assert get_index(catalog) is None
+
+    write_index(path, catalog, solutions)
+    assert get_index(catalog).get("key-1") == solutions["key-1"]
+
+    write_index(path, catalog, {"other": solutions["key-2"]})
+    os.utime(path, ns=(0, 0))
+    index = get_index(catalog)
+    assert index.get("key-1") is None
+    assert index.get("other") == solutions["key-2"]
+
+    old = type(catalog)(
+        version="old", champions=catalog.champions,
+        traits=catalog.traits, raw_traits=catalog.raw_traits,
+    )
+    write_index(path, old, solutions)
+    assert get_index(catalog) is None
+
+
+# ===== PRECOMPUTE + API =====
+def test_built_index_answers_the_api(tmp_path, catalog, monkeypatch, fresh_loader):
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from backend.app.api import app
+
+    path = str(tmp_path / "solutions.idx")
+    assert precompute.main(["--out", path, "--max-team", "3", "--carries", "Ryze", "--mode", "ryze"]) == 0
+    monkeypatch.setattr(index_module, "INDEX_FILE", path)
+
+    key = canonical_key("ryze", catalog.version, 3, ["Ryze"], [], {})
+    assert get_index(catalog).get(key) is not None
+
+    res = TestClient(app).post(
+        "/solve/ryze", json={"max_team": 3, "forced": ["Ryze"], "banned": [], "time_limit": 5}
+    ).json()
+    assert res["stats"]["indexed"]
+    fresh = ryze.run(3, 30, ["Ryze"], [], {}, catalog=catalog)
+    assert res["best"] == fresh.best
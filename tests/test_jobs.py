@@ -0,0 +1,113 @@
+import time
+
+import pytest
+
+from backend.app import jobs
+from backend.app.jobs import JobManager, QueueFull
+from backend.solver import ryze
+from backend.solver.registry import DEFAULT_BANNED, DEFAULT_FORCED
+
+
+SMALL = {"max_team": 4, "time_limit": 30, "forced": ["Ryze"], "banned": [], "emblems": {}}
+# đủ lâu để còn chạy lúc bị hủy
+LONG = {
+    "max_team": 14, "time_limit": 60, "forced": DEFAULT_FORCED,
+    "banned": DEFAULT_BANNED, "emblems": {},
+}
+
+
+@pytest.fixture
+def manager():
+    manager = JobManager(workers=1, queue_size=1)
+    yield manager
+    manager.shutdown()
+
+
+def wait_status(job, statuses, timeout=30):
+    end = time.time() + timeout
+    while job.status not in statuses:
+        assert time.time() < end, job.status
+        time.sleep(0.02)
+    return job.status
+
+
+def test_job_runs_to_the_same_result(manager):
+    job = manager.submit("ryze", SMALL)
+    assert manager.get(job.id) is job
+    job.future.result(timeout=30)
+    snap = job.snapshot()
+    assert snap["status"] == "done" and snap["completed"]
+    assert snap["best"] == ryze.run(**SMALL).best
+    assert snap["stats"]["nodes"] > 0
+    assert manager.pending() == 0
+
+
+def test_cancel_running_job(manager):
+    job = manager.submit("ryze", LONG)
+    wait_status(job, ("running",))
+    start = time.time()
+    assert manager.cancel(job.id)
+    job.future.result(timeout=10)
+    assert time.time() - start < 5
+    snap = job.snapshot()
+    assert snap["status"] == "cancelled"
+    assert snap["stats"]["stop_reason"] == "cancelled"
+    assert not snap["completed"]
+
+
+def test_queue_is_bounded_and_queued_jobs_cancel(manager):
+    running = manager.submit("ryze", LONG)
+    queued = manager.submit("ryze", LONG)
+    with pytest.raises(QueueFull):
+        manager.submit("ryze", SMALL)
+    wait_status(running, ("running",))
+    assert manager.running() == 1 and manager.queued() == 1
+
+    # executor có thể đã chuyển job chờ vào process con: khi đó job
+    # dừng bằng cờ cancel ngay khi bắt đầu chạy
+    assert manager.cancel(queued.id)
+    manager.cancel(running.id)
+    wait_status(running, ("cancelled",))
+    wait_status(queued, ("cancelled",))
+    assert manager.pending() == 0
+    assert not manager.cancel("missing")
+
+
+def test_failed_job_reports_error(manager):
+    job = manager.submit("ryze", dict(SMALL, checkpoint="garbage"))
+    wait_status(job, ("failed",))
+    assert "checkpoint" in job.snapshot()["error"].lower()
+
+
+def test_finished_jobs_expire(manager):
+    job = manager.submit("ryze", SMALL)
+    job.future.result(timeout=30)
+    wait_status(job, ("done",))
+    job.finished = time.time() - jobs.JOB_TTL - 1
+    manager.submit("ryze", SMALL)          # submit dọn job hết hạn
+    assert manager.get(job.id) is None
+
+
+# ===== API =====
+def test_api_job_lifecycle():
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from backend.app.api import app
+
+    client = TestClient(app)
+    body = dict(LONG, solver="ryze", time_limit=30)
+    job = client.post("/jobs", json=body).json()
+    assert job["status"] in ("queued", "running")
+    assert job["granted"]["time_limit"] <= 30
+
+    cancelled = client.delete(f"/jobs/{job['id']}").json()
+    assert cancelled["id"] == job["id"]
+    end = time.time() + 10
+    while client.get(f"/jobs/{job['id']}").json()["status"] not in ("cancelled", "done"):
+        assert time.time() < end
+        time.sleep(0.05)
+    assert client.get(f"/jobs/{job['id']}").json()["status"] == "cancelled"
+
+    assert client.get("/jobs/missing").status_code == 404
+    assert client.delete("/jobs/missing").status_code == 404
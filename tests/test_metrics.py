@@ -0,0 +1,91 @@
+import pytest
+
+from backend.app import metrics
+from backend.app.metrics import Counter, Gauge, Histogram, Registry, observe_search
+from backend.solver.search import SearchResult
+
+
+def samples(text):
+    """{dòng sample (không có giá trị): giá trị} của output Prometheus"""
+    out = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, _, value = line.rpartition(" ")
+            out[name] = float(value)
+    return out
+
+
+def test_counter_labels_and_escaping():
+    registry = Registry()
+    counter = registry.register(Counter("c_total", "help", labels=("mode", "outcome")))
+    counter.inc(mode="exact", outcome="time")
+    counter.inc(2, mode="exact", outcome="time")
+    counter.inc(mode='a"b\\c\nd')
+    text = registry.render()
+    assert "# HELP c_total help\n# TYPE c_total counter\n" in text
+    values = samples(text)
+    assert values['c_total{mode="exact",outcome="time"}'] == 3
+    assert values['c_total{mode="a\\"b\\\\c\\nd",outcome=""}'] == 1
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    histogram = registry.register(Histogram("h", "help", (1, 0.5), labels=("mode",)))
+    for value in (0.2, 0.7, 3):
+        histogram.observe(value, mode="exact")
+    values = samples(registry.render())
+    assert values['h_bucket{mode="exact",le="0.5"}'] == 1
+    assert values['h_bucket{mode="exact",le="1.0"}'] == 2
+    assert values['h_bucket{mode="exact",le="+Inf"}'] == 3
+    assert values['h_count{mode="exact"}'] == 3
+    assert values['h_sum{mode="exact"}'] == pytest.approx(3.9)
+
+
+def test_gauge_reads_at_scrape_time():
+    state = {"value": 1}
+    registry = Registry()
+    registry.register(Gauge("g", "help", lambda: state["value"]))
+    assert samples(registry.render())["g"] == 1
+    state["value"] = 4
+    assert samples(registry.render())["g"] == 4
+
+
+def test_observe_search_outcomes():
+    before = samples(metrics.registry.render())
+    observe_search("test", SearchResult(best=[], completed=True, nodes=100, elapsed=0.5))
+    observe_search("test", SearchResult(best=[], completed=False, nodes=7, stop_reason="time"))
+    after = samples(metrics.registry.render())
+
+    def delta(name):
+        return after.get(name, 0) - before.get(name, 0)
+
+    assert delta('tft_searches_total{mode="test",outcome="completed"}') == 1
+    assert delta('tft_searches_total{mode="test",outcome="time"}') == 1
+    assert delta('tft_search_nodes_total{mode="test"}') == 107
+    # elapsed = 0 thì không có tốc độ
+    assert delta('tft_search_nodes_per_second_count{mode="test"}') == 1
+
+
+def test_api_metrics_after_a_solve():
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from backend.app.api import app
+
+    client = TestClient(app)
+    body = {"max_team": 4, "time_limit": 30, "forced": ["Ryze", "Ahri"], "banned": []}
+    before = samples(client.get("/metrics").text)
+    client.post("/solve/ryze", json=body)
+    client.post("/solve/ryze", json=body)
+    res = client.get("/metrics")
+    assert res.headers["content-type"].startswith("text/plain; version=0.0.4")
+    after = samples(res.text)
+
+    def delta(name):
+        return after.get(name, 0) - before.get(name, 0)
+
+    assert delta('tft_solve_request_seconds_count{mode="ryze"}') == 2
+    assert delta('tft_cache_lookups_total{result="hit"}') >= 1
+    assert delta('tft_searches_total{mode="ryze",outcome="completed"}') <= 1
+    for gauge in ("tft_solves_in_flight", "tft_solve_queue_depth", "tft_cpu_seconds_committed"):
+        assert gauge in after
@@ -0,0 +1,10 @@
+import pytest
+
+from tests.helpers import SEEDS, brute_top_k, solve_case, top_k_values
+
+
+@pytest.mark.parametrize("seed", SEEDS[:3])
+def test_parallel_matches_brute_force(seed):
+    result, pool, max_team = solve_case(seed, workers=2)
+    assert result.completed
+    assert top_k_values(result) == brute_top_k(pool, max_team)
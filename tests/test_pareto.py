@@ -0,0 +1,25 @@
+import pytest
+
+from backend.solver.catalog import get_catalog
+from backend.solver.pareto import ParetoFront, higher_tiers
+from tests.helpers import SEEDS, brute_front, solve_case
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_pareto_front_matches_brute_force(seed):
+    result, pool, max_team = solve_case(seed, mode="pareto")
+    tiers_of = higher_tiers(pool, get_catalog().traits)
+    assert result.completed
+    front = {(e["score"], e["total_cost"], e["tiers"]) for e in result.best}
+    assert len(front) == len(result.best)
+    assert front == brute_front(pool, max_team, tiers_of)
+
+
+def test_front_drops_dominated_points():
+    front = ParetoFront()
+    assert front.add(5, 20, 1, (0,))
+    assert not front.add(5, 20, 1, (1,))      # trùng vector: giữ team đầu
+    assert not front.add(4, 21, 0, (2,))      # bị trội
+    assert front.add(6, 25, 0, (3,))
+    assert front.add(6, 19, 2, (4,))          # trội cả 2 điểm trước
+    assert [p[3] for p in front.entries()] == [(4,)]
@@ -0,0 +1,114 @@
+import pytest
+
+from backend.app.sessions import SESSION_DEPTH, Session, SessionStore
+from backend.solver.engine import TOP_K
+from tests.helpers import SEEDS, TIME_LIMIT, random_case
+
+
+def solve(solver, catalog, params, top_k=TOP_K):
+    result = solver.run(
+        max_team=params["max_team"],
+        time_limit=TIME_LIMIT,
+        forced=params["forced"],
+        banned=params["banned"],
+        emblems=params["emblems"],
+        catalog=catalog,
+        top_k=top_k,
+    )
+    return {"best": result.best, "stats": result.stats()}
+
+
+def session_case(seed):
+    solver, catalog, max_team, forced, emblems = random_case(seed)
+    params = {
+        "max_team": max_team, "forced": forced, "banned": [], "emblems": emblems,
+        "unique_signature": False, "diversity": 0, "mode": "exact",
+    }
+    session = Session(id="s", solver=solver.__name__)
+    session.remember("v", params, solve(solver, catalog, params, SESSION_DEPTH), SESSION_DEPTH)
+    return solver, catalog, params, session
+
+
+def values(response):
+    return [(e["score"], e["total_cost"]) for e in response["best"]]
+
+
+def narrower(params, **change):
+    return dict(params, **{k: params[k] + v for k, v in change.items()})
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_reused_answer_is_the_exact_top_k(seed):
+    solver, catalog, params, session = session_case(seed)
+    names = {c["name"] for e in session.response["best"] for c in e["team"]}
+    reused = 0
+    for name in sorted(names - set(params["forced"])):
+        for new in (narrower(params, banned=[name]), narrower(params, forced=[name])):
+            answer = session.narrowed("v", new)
+            if answer is None:
+                continue
+            reused += 1
+            assert values(answer) == values(solve(solver, catalog, new))
+    assert reused
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_smaller_team_is_exact_or_searched_again(seed):
+    # team nhỏ hơn thường loại gần hết team cũ (đủ người) => search lại
+    solver, catalog, params, session = session_case(seed)
+    new = dict(params, max_team=params["max_team"] - 1)
+    answer = session.narrowed("v", new)
+    if answer is not None:
+        assert values(answer) == values(solve(solver, catalog, new))
+
+
+def test_only_narrowing_changes_are_reused():
+    _, _, params, session = session_case(0)
+    emblem = dict(params, emblems=dict(params["emblems"], Yordle=9))
+    assert session.narrowed("v", emblem) is None
+    assert session.narrowed("v", dict(params, max_team=params["max_team"] + 1)) is None
+    assert session.narrowed("v", dict(params, diversity=2)) is None
+    assert session.narrowed("other-version", narrower(params, banned=["x"])) is None
+
+
+def test_timed_out_result_is_not_reused():
+    _, _, params, session = session_case(0)
+    session.response = dict(
+        session.response, stats=dict(session.response["stats"], completed=False)
+    )
+    assert session.narrowed("v", narrower(params, banned=["x"])) is None
+
+
+def test_store_evicts_least_recently_used():
+    store = SessionStore(max_sessions=2, ttl=60)
+    first = store.create("ryze")
+    second = store.create("ryze")
+    store.get(first.id)
+    second.updated = first.updated - 1
+    store.create("bronze")
+    assert store.get(second.id) is None
+    assert store.get(first.id) is not None
+    assert store.delete(first.id) and not store.delete(first.id)
+
+
+def test_api_session_reuses_after_ban():
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from backend.app.api import app
+
+    client = TestClient(app)
+    session = client.post("/sessions", json={"solver": "ryze"}).json()
+    body = {"max_team": 5, "time_limit": 30, "forced": ["Ryze", "Ahri"]}
+    first = client.post(f"/sessions/{session['id']}/solve", json=body).json()
+    assert first["stats"]["incremental"] in ("cold", "cached")
+    assert len(first["best"]) <= TOP_K
+
+    top = first["best"][0]["team"]
+    extra = next(c["name"] for c in top if c["name"] not in body["forced"])
+    again = client.post(
+        f"/sessions/{session['id']}/solve", json=dict(body, banned=[extra])
+    ).json()
+    assert again["stats"]["incremental"] in ("reused", "seeded")
+    assert all(extra not in [c["name"] for c in e["team"]] for e in again["best"])
+    assert client.delete(f"/sessions/{session['id']}").status_code == 200
@@ -0,0 +1,144 @@
+import gzip
+import json
+import os
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from backend.app.static import (  # noqa: E402
+    IMMUTABLE,
+    MIN_COMPRESS,
+    REVALIDATE,
+    AssetStore,
+    Representation,
+    choose_encoding,
+    etag_matches,
+)
+
+
+# ===== NEGOTIATION =====
+@pytest.mark.parametrize("accept, expected", [
+    ("", None),
+    ("gzip", "gzip"),
+    ("gzip, deflate, br", "br"),
+    ("br;q=0, gzip", "gzip"),
+    ("*", "br"),
+    ("*, br;q=0", "gzip"),
+    ("gzip;q=bad", None),
+    ("identity", None),
+])
+def test_choose_encoding(accept, expected):
+    assert choose_encoding(accept, {"br": b"", "gzip": b""}) == expected
+
+
+def test_choose_encoding_only_offers_what_exists():
+    assert choose_encoding("br, gzip", {"gzip": b""}) == "gzip"
+    assert choose_encoding("br, gzip", {}) is None
+
+
+@pytest.mark.parametrize("header, matches", [
+    ('"abc"', True),
+    ('W/"abc-gzip"', True),
+    ('"x", "abc-br"', True),
+    ("*", True),
+    ('"abcd"', False),
+    ('"abc-deflate"', False),
+])
+def test_etag_matches_any_encoding(header, matches):
+    assert etag_matches(header, "abc") is matches
+
+
+def test_small_bodies_are_not_compressed():
+    assert Representation.build(b"x" * (MIN_COMPRESS - 1), "text/plain", "t", 0).encoded == {}
+    rep = Representation.build(b"x" * MIN_COMPRESS, "text/plain", "t", 0)
+    assert gzip.decompress(rep.encoded["gzip"]) == rep.body
+
+
+# ===== ASSETS =====
+@pytest.fixture
+def frontend(tmp_path):
+    (tmp_path / "index.html").write_text(
+        '<link href="style.css"><script src="app.js"></script><img src="logo.png">'
+    )
+    (tmp_path / "app.js").write_text("console.log(1)")
+    (tmp_path / "style.css").write_text("body {}")
+    return tmp_path
+
+
+def test_index_links_assets_by_content_hash(frontend):
+    store = AssetStore(str(frontend))
+    app_js = store.get("app.js")
+    html = store.get("index.html").body.decode()
+    assert f'src="app.js?v={app_js.tag}"' in html
+    assert f'href="style.css?v={store.get("style.css").tag}"' in html
+    assert 'src="logo.png"' in html
+
+    # asset đổi => index.html đổi theo
+    (frontend / "app.js").write_text("console.log(2)")
+    st = os.stat(frontend / "app.js")
+    os.utime(frontend / "app.js", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert store.get("app.js").tag != app_js.tag
+    assert store.get("index.html").body.decode() != html
+
+
+@pytest.mark.parametrize("name", ["../index.html", "..", "missing.js", ".hidden", "a/b.js"])
+def test_only_files_inside_the_frontend_dir(frontend, name):
+    assert AssetStore(str(frontend)).get(name) is None
+
+
+# ===== API =====
+@pytest.fixture
+def client():
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from backend.app.api import app
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", ["/data/champions", "/data/traits", "/config/defaults"])
+def test_data_revalidates_with_etag(client, path):
+    first = client.get(path, headers={"Accept-Encoding": "gzip"})
+    plain = client.get(path, headers={"Accept-Encoding": "identity"})
+    assert first.status_code == 200
+    assert first.headers.get("Content-Encoding") == (
+        "gzip" if len(plain.content) >= MIN_COMPRESS else None
+    )
+    assert first.headers["Cache-Control"] == REVALIDATE
+    assert first.headers["Vary"] == "Accept-Encoding"
+    assert "Content-Encoding" not in plain.headers
+    assert first.json() == json.loads(plain.content)
+
+    etag = first.headers["ETag"]
+    again = client.get(path, headers={"If-None-Match": etag, "Accept-Encoding": "identity"})
+    assert again.status_code == 304 and again.content == b""
+
+    since = client.get(path, headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert since.status_code == 304
+    # If-None-Match thắng If-Modified-Since
+    stale = client.get(path, headers={
+        "If-None-Match": '"other"', "If-Modified-Since": first.headers["Last-Modified"],
+    })
+    assert stale.status_code == 200
+
+
+def test_fingerprinted_assets_are_immutable(client):
+    html = client.get("/ui/").text
+    tag = html.split('src="app.js?v=')[1].split('"')[0]
+    assert client.get(f"/ui/app.js?v={tag}").headers["Cache-Control"] == IMMUTABLE
+    assert client.get("/ui/app.js").headers["Cache-Control"] == REVALIDATE
+    assert client.get("/ui/app.js?v=old").headers["Cache-Control"] == REVALIDATE
+    assert client.get("/ui/missing.js").status_code == 404
+
+
+def test_brotli_when_installed(client):
+    brotli = pytest.importorskip("brotli")
+    res = client.get("/data/champions", headers={"Accept-Encoding": "br"})
+    assert res.headers["Content-Encoding"] == "br"
+    assert res.headers["ETag"].endswith('-br"')
+    plain = client.get("/data/champions", headers={"Accept-Encoding": "identity"})
+    # httpx tự giải nén br nếu có brotli, không thì còn nguyên body nén
+    body = res.content if res.content == plain.content else brotli.decompress(res.content)
+    assert body == plain.content
@@ -0,0 +1,91 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend.app import api  # noqa: E402
+from backend.app.cache import result_cache  # noqa: E402
+from backend.app.jobs import job_manager  # noqa: E402
+from backend.solver.registry import DEFAULT_BANNED, DEFAULT_FORCED  # noqa: E402
+
+
+SMALL = {"max_team": 5, "time_limit": 30, "forced": ["Ryze"], "banned": []}
+
+
+@pytest.fixture
+def client():
+    result_cache.clear()
+    yield TestClient(api.app)
+    result_cache.clear()
+
+
+def lines(res):
+    return [json.loads(line) for line in res.text.splitlines()]
+
+
+def test_stream_ends_with_the_solve_result(client):
+    res = client.post("/solve/ryze/stream", json=SMALL)
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    messages = lines(res)
+    *progress, last = messages
+    assert all(m["type"] == "progress" for m in progress)
+    assert last["type"] == "result"
+    assert last["status"] == "done" and last["completed"]
+    assert last["granted"]["time_limit"] <= SMALL["time_limit"]
+    assert last["error"] is None
+
+    # đã vào cache: /solve trả cùng top-K, stream chỉ còn 1 dòng result
+    assert client.post("/solve/ryze", json=SMALL).json()["best"] == last["best"]
+    replay = lines(client.post("/solve/ryze/stream", json=SMALL))
+    assert [m["type"] for m in replay] == ["result"]
+    assert replay[0]["best"] == last["best"]
+
+
+def test_progress_lines_carry_serialized_teams(client):
+    body = {"max_team": 9, "time_limit": 1, "forced": DEFAULT_FORCED, "banned": DEFAULT_BANNED}
+    messages = lines(client.post("/solve/bronze/stream", json=body))
+    assert len(messages) > 1
+    for message in messages:
+        for entry in message["best"]:
+            assert {"score", "total_cost", "team_size", "team"} <= set(entry)
+            assert all("name" in c for c in entry["team"])
+    assert messages[-1]["type"] == "result"
+
+
+def test_invalid_request_is_an_http_error(client):
+    res = client.post("/solve/ryze/stream", json={"max_team": "many"})
+    assert res.status_code == 422
+    assert "detail" in res.json()
+
+
+def test_closing_the_stream_cancels_the_job(monkeypatch):
+    # client ngắt kết nối => StreamingResponse đóng generator
+    monkeypatch.setattr(api, "STREAM_POLL", 0.01)
+    body = api.SolveRequest(
+        max_team=14, time_limit=60, forced=DEFAULT_FORCED, banned=DEFAULT_BANNED
+    )
+    job = api.submit_job("ryze", body)
+
+    async def first_line_then_close():
+        stream = api.watch_job("ryze", job)
+        try:
+            message = json.loads(await stream.__anext__())
+            assert message["type"] == "progress"
+        finally:
+            await stream.aclose()
+
+    asyncio.run(asyncio.wait_for(first_line_then_close(), 30))
+    job.future.result(timeout=10)
+    assert job.snapshot()["status"] == "cancelled"
+    assert job_manager.get(job.id) is job
+    # ticket admission được trả lại khi job dừng
+    end = time.time() + 5
+    while api.admission.committed() and time.time() < end:
+        time.sleep(0.02)
+    assert api.admission.committed() == 0
@@ -0,0 +1,37 @@
+import pytest
+
+from backend.solver.transposition import TranspositionTable
+from tests.helpers import SEEDS, brute_top_k, solve_case, top_k_values
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_tt_matches_brute_force(seed):
+    result, pool, max_team = solve_case(seed, tt_memory_mb=4)
+    assert result.completed
+    assert result.tt["size"] > 0
+    assert top_k_values(result) == brute_top_k(pool, max_team)
+
+
+def test_parallel_tt_matches_brute_force():
+    result, pool, max_team = solve_case(0, workers=2, tt_memory_mb=1)
+    assert result.completed
+    assert result.tt["size"] > 0
+    assert top_k_values(result) == brute_top_k(pool, max_team)
+
+
+def test_tt_off_by_default():
+    result, _, _ = solve_case(0)
+    assert result.tt["size"] == 0
+
+
+def test_table_keeps_tighter_bound_and_bigger_subtree():
+    tt = TranspositionTable(memory_mb=1)
+    tt.put(7, 5, work=100)
+    tt.put(7, 3, work=10)              # cùng key: giữ cận chặt hơn
+    assert tt.get(7) == 3
+    other = 7 + tt.size                # cùng slot, key khác
+    tt.put(other, 1, work=50)          # cây con nhỏ hơn: không đè
+    assert tt.get(other) is None
+    tt.put(other, 1, work=500)
+    assert tt.get(other) == 1 and tt.get(7) is None
+    assert tt.stats()["evictions"] == 1
@@ -0,0 +1,22 @@
+import pytest
+
+from backend.solver import engine
+from backend.solver.vector import np
+from tests.helpers import SEEDS, brute_top_k, random_case, solve_case, top_k_values
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_vector_matches_brute_force(seed):
+    # không có numpy thì vector chạy như exact, vẫn phải đúng
+    result, pool, max_team = solve_case(seed, mode="vector")
+    assert result.completed
+    assert top_k_values(result) == brute_top_k(pool, max_team)
+
+
+@pytest.mark.skipif(np is None, reason="numpy not installed")
+def test_vector_builds_tail_blocks():
+    solver, catalog, max_team, forced, emblems = random_case(0)
+    _, tails = engine.prepare_pool(
+        solver.RULES, max_team, forced, [], emblems, catalog, mode="vector"
+    )
+    assert tails is not None